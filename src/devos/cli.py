@@ -1,73 +1,166 @@
 """Main CLI entry point for DevOS."""
 
+import importlib
 import click
-from pathlib import Path
-
-from devos.commands.init import init
-from devos.commands.track import start, stop, status, list as track_list
-from devos.commands.env import set as env_set, get as env_get, list as env_list, delete as env_delete, generate_example, export
-from devos.commands.report import weekly, summary, projects
-from devos.commands.config import show as config_show, set as config_set, reset as config_reset, init as config_init
-from devos.commands.interactive import interactive
-from devos.commands.quick import now, done, status as quick_status, today, projects as quick_projects, recent, setup
-from devos.commands.completion import completion, shells, setup_completion
-from devos.commands.test import test as test_cmd, coverage, discover, generate as test_generate
-from devos.commands.ai import review, explain, refactor, test, example, debug, chat, suggest, generate
-from devos.commands.ai_config import ai_config
-from devos.commands.groq import groq, groq_review, groq_explain, groq_chat, groq_generate, groq_status
-from devos.commands.groq_enhanced import groq_analyze as ai_analyze, groq_security_scan as ai_security_scan, groq_architecture_map as ai_architecture_map, groq_enhance as ai_enhance, groq_project_summary as ai_project_summary
-from devos.commands.ai_chat import ai_interactive_chat
-from devos.commands.quick_ai import quick_ai
-from devos.commands.project import add as project_add, list as project_list, status as project_status, tasks, issues, notes
-from devos.core.config import Config
-from devos.core.database import Database
+from typing import Any, Callable, Dict, List, Optional
+
 from devos.core.exceptions import handle_error
-from devos.core.ai_config import initialize_ai_providers
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Click group that imports subcommand modules only when invoked.
+    
+    Subcommands are declared as a static ``name -> 'module:attribute'`` map so
+    that listing or running one command never imports the others (and the
+    heavy AI/crypto dependencies they pull in).
+    """
+    
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+    
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """List eagerly registered and lazy subcommands."""
+        commands = set(super().list_commands(ctx))
+        commands.update(self.lazy_subcommands.keys())
+        return sorted(commands)
+    
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Resolve a subcommand, importing its module on first use."""
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            self.commands[cmd_name] = self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+    
+    def _load_command(self, cmd_name: str) -> click.Command:
+        """Import the module backing a lazy subcommand."""
+        module_name, attr_name = self.lazy_subcommands[cmd_name].rsplit(':', 1)
+        module = importlib.import_module(module_name)
+        command = getattr(module, attr_name)
+        
+        if not isinstance(command, click.Command):
+            raise ValueError(f"Lazy command '{cmd_name}' did not resolve to a click command")
+        
+        return command
+
+
+class LazyContext(dict):
+    """Command context object whose services are built on first access.
+    
+    Commands keep using ``ctx.obj['config']``, ``ctx.obj['db']`` and
+    ``ctx.obj['ai_registry']``; each service is constructed the first time
+    its key is read, so commands that never touch the database or the AI
+    providers don't pay for initializing them.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._factories: Dict[str, Callable[[], Any]] = {
+            'config': self._create_config,
+            'db': self._create_database,
+            'ai_registry': self._create_ai_registry,
+        }
+    
+    def __missing__(self, key: str) -> Any:
+        factory = self._factories.get(key)
+        if factory is None:
+            raise KeyError(key)
+        
+        try:
+            value = factory()
+        except click.exceptions.Exit:
+            # A dependency (e.g. config for db) already reported its failure
+            raise
+        except Exception as e:
+            if super().get('verbose'):
+                click.echo(f"Error initializing DevOS: {e}", err=True)
+            handle_error(e)
+            click.get_current_context().exit(1)
+        
+        self[key] = value
+        return value
+    
+    def _create_config(self):
+        """Create the user configuration."""
+        from devos.core.config import Config
+        return Config()
+    
+    def _create_database(self):
+        """Open the database using the shared configuration."""
+        from devos.core.database import Database
+        return Database(self['config'])
+    
+    def _create_ai_registry(self):
+        """Register configured AI providers and return the registry."""
+        from devos.core.ai_config import ensure_ai_providers
+        return ensure_ai_providers()
+
+
+@click.group(cls=LazyGroup, lazy_subcommands={
+    # Project setup (with aliases)
+    'init': 'devos.commands.init:init',
+    'create': 'devos.commands.init:init',
+    'new': 'devos.commands.init:init',
+    
+    # Interactive mode
+    'interactive': 'devos.commands.interactive:interactive',
+    'i': 'devos.commands.interactive:interactive',
+    'wizard': 'devos.commands.interactive:interactive',
+    
+    # Quick commands
+    'now': 'devos.commands.quick:now',
+    'done': 'devos.commands.quick:done',
+    'status': 'devos.commands.quick:status',
+    'today': 'devos.commands.quick:today',
+    'projects': 'devos.commands.quick:projects',
+    'recent': 'devos.commands.quick:recent',
+    'setup': 'devos.commands.quick:setup',
+    
+    # Search
+    'search': 'devos.commands.search:search',
+    
+    # Completion commands
+    'completion': 'devos.commands.completion:completion',
+    'shells': 'devos.commands.completion:shells',
+    'setup-completion': 'devos.commands.completion:setup_completion',
+    
+    # Groq commands (fast AI)
+    'groq': 'devos.commands.groq:groq',
+    'ai-fast': 'devos.commands.groq:groq',
+    'groq-chat': 'devos.commands.groq:groq_chat',
+    
+    # Ultra-fast AI command
+    'quick-ai': 'devos.commands.quick_ai:quick_ai',
+    'ai-quick': 'devos.commands.quick_ai:quick_ai',
+    
+    # Interactive AI chat
+    'ai-interactive-chat': 'devos.commands.ai_chat:ai_interactive_chat',
+    
+    # AI config commands
+    'ai-config': 'devos.commands.ai_config:ai_config',
+})
 @click.version_option()
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 @click.pass_context
 def main(ctx, verbose: bool):
     """DevOS - One command-line to manage your entire dev life."""
-    # Ensure context object exists
-    ctx.ensure_object(dict)
+    # Ensure context object exists; config, database and AI providers
+    # are resolved lazily by the commands that need them
+    ctx.ensure_object(LazyContext)
     ctx.obj['verbose'] = verbose
-    
-    # Initialize config and database for all commands
-    try:
-        ctx.obj['config'] = Config()
-        ctx.obj['db'] = Database()
-        
-        # Initialize AI providers
-        initialize_ai_providers()
-        
-    except Exception as e:
-        if verbose:
-            click.echo(f"Error initializing DevOS: {e}", err=True)
-        handle_error(e)
-        ctx.exit(1)
-
-
-# Register all commands following the pattern: devos <domain> <action>
-main.add_command(init, name='init')
 
-# Add common aliases
-main.add_command(init, name='create')
-main.add_command(init, name='new')
 
-# Add interactive mode
-main.add_command(interactive, name='interactive')
-main.add_command(interactive, name='i')
-main.add_command(interactive, name='wizard')
+# Register command groups following the pattern: devos <domain> <action>.
+# Subcommands are resolved lazily so only the invoked module gets imported.
 
 # Track commands
-track_group = click.Group('track')
-track_group.add_command(start, name='start')
-track_group.add_command(stop, name='stop')
-track_group.add_command(status, name='status')
-track_group.add_command(track_list, name='list')
+track_group = LazyGroup('track', lazy_subcommands={
+    'start': 'devos.commands.track:start',
+    'stop': 'devos.commands.track:stop',
+    'status': 'devos.commands.track:status',
+    'list': 'devos.commands.track:list',
+    'export': 'devos.commands.track:export',
+    'import': 'devos.commands.track:import_sessions',
+})
 main.add_command(track_group, name='track')
 
 # Add track aliases
@@ -75,13 +168,16 @@ main.add_command(track_group, name='t')
 main.add_command(track_group, name='time')
 
 # Env commands
-env_group = click.Group('env')
-env_group.add_command(env_set, name='set')
-env_group.add_command(env_get, name='get')
-env_group.add_command(env_list, name='list')
-env_group.add_command(env_delete, name='delete')
-env_group.add_command(generate_example, name='generate-example')
-env_group.add_command(export, name='export')
+env_group = LazyGroup('env', lazy_subcommands={
+    'set': 'devos.commands.env:set',
+    'get': 'devos.commands.env:get',
+    'list': 'devos.commands.env:list',
+    'delete': 'devos.commands.env:delete',
+    'generate-example': 'devos.commands.env:generate_example',
+    'export': 'devos.commands.env:export',
+    'run': 'devos.commands.env:run',
+    'import': 'devos.commands.env:import_env',
+})
 main.add_command(env_group, name='env')
 
 # Add env aliases
@@ -89,10 +185,12 @@ main.add_command(env_group, name='e')
 main.add_command(env_group, name='environment')
 
 # Report commands
-report_group = click.Group('report')
-report_group.add_command(weekly, name='weekly')
-report_group.add_command(summary, name='summary')
-report_group.add_command(projects, name='projects')
+report_group = LazyGroup('report', lazy_subcommands={
+    'weekly': 'devos.commands.report:weekly',
+    'summary': 'devos.commands.report:summary',
+    'projects': 'devos.commands.report:projects',
+    'rebuild-rollups': 'devos.commands.report:rebuild_rollups',
+})
 main.add_command(report_group, name='report')
 
 # Add report aliases
@@ -100,13 +198,14 @@ main.add_command(report_group, name='r')
 main.add_command(report_group, name='stats')
 
 # Project management commands
-project_group = click.Group('project')
-project_group.add_command(project_add, name='add')
-project_group.add_command(project_list, name='list')
-project_group.add_command(project_status, name='status')
-project_group.add_command(tasks, name='tasks')
-project_group.add_command(issues, name='issues')
-project_group.add_command(notes, name='notes')
+project_group = LazyGroup('project', lazy_subcommands={
+    'add': 'devos.commands.project:add',
+    'list': 'devos.commands.project:list',
+    'status': 'devos.commands.project:status',
+    'tasks': 'devos.commands.project:tasks',
+    'issues': 'devos.commands.project:issues',
+    'notes': 'devos.commands.project:notes',
+})
 main.add_command(project_group, name='project')
 
 # Add project aliases
@@ -114,74 +213,64 @@ main.add_command(project_group, name='proj')
 main.add_command(project_group, name='pm')
 
 # Config commands
-config_group = click.Group('config')
-config_group.add_command(config_show, name='show')
-config_group.add_command(config_set, name='set')
-config_group.add_command(config_reset, name='reset')
-config_group.add_command(config_init, name='init')
+config_group = LazyGroup('config', lazy_subcommands={
+    'show': 'devos.commands.config:show',
+    'set': 'devos.commands.config:set',
+    'reset': 'devos.commands.config:reset',
+    'init': 'devos.commands.config:init',
+})
 main.add_command(config_group, name='config')
 
 # Add config aliases
 main.add_command(config_group, name='c')
 main.add_command(config_group, name='settings')
 
-# Quick commands
-main.add_command(now, name='now')
-main.add_command(done, name='done')
-main.add_command(quick_status, name='status')
-main.add_command(today, name='today')
-main.add_command(quick_projects, name='projects')
-main.add_command(recent, name='recent')
-main.add_command(setup, name='setup')
-
-# Completion commands
-main.add_command(completion, name='completion')
-main.add_command(shells, name='shells')
-main.add_command(setup_completion, name='setup-completion')
-
 # Test commands
-test_group = click.Group('test')
-test_group.add_command(test_cmd, name='run')
-test_group.add_command(coverage, name='coverage')
-test_group.add_command(discover, name='discover')
-test_group.add_command(test_generate, name='generate')
+test_group = LazyGroup('test', lazy_subcommands={
+    'run': 'devos.commands.test:test',
+    'coverage': 'devos.commands.test:coverage',
+    'discover': 'devos.commands.test:discover',
+    'generate': 'devos.commands.test:generate',
+})
 main.add_command(test_group, name='test')
 
-# Groq commands (fast AI)
-main.add_command(groq, name='groq')
-main.add_command(groq, name='ai-fast')
-
-# Ultra-fast AI command
-main.add_command(quick_ai, name='quick-ai')
-main.add_command(quick_ai, name='ai-quick')
-
-# Interactive AI chat
-main.add_command(ai_interactive_chat, name='ai-interactive-chat')
-
-# AI config commands
-main.add_command(ai_config, name='ai-config')
-
 # AI commands
-ai_group = click.Group('ai')
-ai_group.add_command(review, name='review')
-ai_group.add_command(explain, name='explain')
-ai_group.add_command(refactor, name='refactor')
-ai_group.add_command(test, name='test')
-ai_group.add_command(example, name='example')
-ai_group.add_command(debug, name='debug')
-ai_group.add_command(chat, name='chat')
-ai_group.add_command(suggest, name='suggest')
-ai_group.add_command(generate, name='generate')
-
-# Enhanced AI commands as subcommands
-ai_group.add_command(ai_analyze, name='analyze')
-ai_group.add_command(ai_security_scan, name='security-scan')
-ai_group.add_command(ai_architecture_map, name='architecture-map')
-ai_group.add_command(ai_enhance, name='enhance')
-ai_group.add_command(ai_project_summary, name='project-summary')
-
+ai_group = LazyGroup('ai', lazy_subcommands={
+    'review': 'devos.commands.ai:review',
+    'explain': 'devos.commands.ai:explain',
+    'refactor': 'devos.commands.ai:refactor',
+    'test': 'devos.commands.ai:test',
+    'example': 'devos.commands.ai:example',
+    'debug': 'devos.commands.ai:debug',
+    'chat': 'devos.commands.ai:chat',
+    'suggest': 'devos.commands.ai:suggest',
+    'generate': 'devos.commands.ai:generate',
+    
+    # Enhanced AI commands as subcommands
+    'analyze': 'devos.commands.groq_enhanced:groq_analyze',
+    'security-scan': 'devos.commands.groq_enhanced:groq_security_scan',
+    'architecture-map': 'devos.commands.groq_enhanced:groq_architecture_map',
+    'enhance': 'devos.commands.groq_enhanced:groq_enhance',
+    'project-summary': 'devos.commands.groq_enhanced:groq_project_summary',
+})
 main.add_command(ai_group, name='ai')
 
+# Background daemon commands
+daemon_group = LazyGroup('daemon', help='Manage the warm background daemon.', lazy_subcommands={
+    'start': 'devos.commands.daemon:start',
+    'stop': 'devos.commands.daemon:stop',
+    'status': 'devos.commands.daemon:status',
+})
+main.add_command(daemon_group, name='daemon')
+
+# Database maintenance commands
+db_group = LazyGroup('db', help='Maintain the DevOS database.', lazy_subcommands={
+    'archive': 'devos.commands.db:archive',
+    'compact': 'devos.commands.db:compact',
+    'info': 'devos.commands.db:info',
+})
+main.add_command(db_group, name='db')
+
 
 if __name__ == '__main__':
     main()
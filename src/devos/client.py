@@ -0,0 +1,23 @@
+"""Thin ``devos`` entry point that prefers a running daemon.
+
+Only the standard library is imported before we know whether a daemon can
+handle the command; otherwise the full CLI is loaded and run in-process.
+"""
+
+import sys
+
+
+def main() -> None:
+    """Forward the command to the daemon, or run it in-process."""
+    from devos.core.daemon import forward_to_daemon
+    
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    
+    from devos.cli import main as cli_main
+    cli_main()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,14 +3,13 @@
 import click
 import subprocess
 import json
-import asyncio
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
-from devos.core.progress import show_success, show_info, show_warning, show_operation_status, ProgressBar
+from devos.core.progress import show_success, show_info, show_warning, show_operation_status, ProgressBar, echo_stream
 from devos.core.ai import (
-    get_ai_service, AIServiceError, UserPreferences, RequestType,
-    ProjectContext, SessionContext
+    get_ai_service, run_ai_command, AIServiceError, UserPreferences,
+    RequestType, ProjectContext, SessionContext
 )
 
 
@@ -84,7 +83,7 @@ def review(ctx, path: str, model: str, focus: str, output: Optional[str], provid
             show_warning(f"Review failed: {e}")
     
     # Run async function
-    asyncio.run(_run_review())
+    run_ai_command(_run_review())
 
 
 @click.command()
@@ -147,7 +146,7 @@ def explain(ctx, query: str, context: Optional[str], file: Optional[str], model:
         except Exception as e:
             show_warning(f"Explanation failed: {e}")
     
-    asyncio.run(_run_explain())
+    run_ai_command(_run_explain())
 
 
 @click.command()
@@ -270,7 +269,7 @@ def example(ctx, query: str, language: Optional[str], context: Optional[str], mo
         except Exception as e:
             show_warning(f"Example generation failed: {e}")
     
-    asyncio.run(_run_example())
+    run_ai_command(_run_example())
 
 
 @click.command()
@@ -317,7 +316,7 @@ def debug(ctx, path: str, type: str, model: str, provider: Optional[str]):
         except Exception as e:
             show_warning(f"Debug analysis failed: {e}")
     
-    asyncio.run(_run_debug())
+    run_ai_command(_run_debug())
 
 
 @click.command()
@@ -361,17 +360,15 @@ def chat(ctx, query: str, model: str, save: Optional[str], provider: Optional[st
                     
                     conversation.append({"role": "user", "content": user_input})
                     
-                    response = await ai_service.chat(
+                    response = await echo_stream(ai_service.stream_chat(
                         conversation=conversation,
                         project_path=Path.cwd(),
                         user_preferences=user_prefs,
                         provider_name=provider
-                    )
+                    ), prefix="\nAI: ")
                     
                     conversation.append({"role": "assistant", "content": response.content})
                     
-                    click.echo(f"\nAI: {response.content}")
-                    
                     if response.tokens_used > 0:
                         click.echo(f"[Tokens: {response.tokens_used} | Cost: ${response.cost:.4f}]")
                         
@@ -390,7 +387,7 @@ def chat(ctx, query: str, model: str, save: Optional[str], provider: Optional[st
         except Exception as e:
             show_warning(f"Chat failed: {e}")
     
-    asyncio.run(_run_chat())
+    run_ai_command(_run_chat())
 
 
 # New AI commands for enhanced functionality
@@ -454,7 +451,7 @@ def suggest(ctx, query: str, context: Optional[str], file: Optional[str], model:
         except Exception as e:
             show_warning(f"Suggestion generation failed: {e}")
     
-    asyncio.run(_run_suggest())
+    run_ai_command(_run_suggest())
 
 
 @click.command()
@@ -506,7 +503,7 @@ def generate(ctx, query: str, language: Optional[str], framework: Optional[str],
         except Exception as e:
             show_warning(f"Code generation failed: {e}")
     
-    asyncio.run(_run_generate())
+    run_ai_command(_run_generate())
     """Review a single file with AI."""
     
     content = file_path.read_text()
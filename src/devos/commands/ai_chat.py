@@ -3,16 +3,15 @@ Interactive AI Chat Mode - Conversational AI with Project Context
 Provides an interactive chat interface with AI that understands your project.
 """
 
-import asyncio
 import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import click
 
-from devos.core.progress import show_success, show_info, show_warning
+from devos.core.progress import show_success, show_info, show_warning, echo_stream
 from devos.core.ai_config import get_ai_config_manager, initialize_ai_providers
-from devos.core.ai import get_ai_service, AIServiceError, UserPreferences
+from devos.core.ai import get_ai_service, run_ai_command, AIServiceError, UserPreferences
 from devos.core.ai.enhanced_context import EnhancedContextBuilder
 
 
@@ -92,8 +91,10 @@ class AIChatSession:
                 
                 full_prompt = f"{context_prompt}\n\nChat History:\n{self._format_chat_history()}\n\nCurrent Question: {user_input}"
                 
-                response = await ai_service.chat(
-                    message=full_prompt,
+                # Stream the response as it arrives
+                response = await echo_stream(ai_service.stream_chat(
+                    conversation=[{"role": "user", "content": full_prompt}],
+                    project_path=self.project_path,
                     user_preferences=UserPreferences(
                         coding_style="conversational",
                         preferred_patterns=[],
@@ -102,15 +103,12 @@ class AIChatSession:
                         max_tokens=1000
                     ),
                     provider_name="groq"
-                )
-                
-                # Display response
-                click.echo(f"\n🤖 AI: {response}")
+                ), prefix="\n🤖 AI: ")
                 
                 # Add to history
                 self.chat_history.append({
                     'role': 'assistant',
-                    'content': response,
+                    'content': response.content,
                     'timestamp': datetime.now()
                 })
                 
@@ -280,4 +278,4 @@ def ai_interactive_chat(context: Optional[str], history: bool, save: Optional[st
             except Exception as e:
                 show_warning(f"Failed to save chat: {e}")
     
-    asyncio.run(run_chat())
+    run_ai_command(run_chat())
@@ -1,13 +1,12 @@
 """AI configuration commands."""
 
 import click
-import asyncio
 from pathlib import Path
 from typing import Optional
 
 from devos.core.progress import show_success, show_info, show_warning, show_operation_status
 from devos.core.ai_config import get_ai_config_manager, initialize_ai_providers
-from devos.core.ai import get_ai_service, AIServiceError
+from devos.core.ai import get_ai_service, run_ai_command, AIServiceError
 
 
 @click.group()
@@ -124,7 +123,7 @@ def test_connection(provider: Optional[str]):
         except Exception as e:
             show_warning(f"Connection test failed: {e}")
     
-    asyncio.run(_test_connection())
+    run_ai_command(_test_connection())
 
 
 @ai_config.command()
@@ -142,7 +141,7 @@ def clear_cache():
         except Exception as e:
             show_warning(f"Failed to clear cache: {e}")
     
-    asyncio.run(_clear_cache())
+    run_ai_command(_clear_cache())
 
 
 @ai_config.command()
@@ -181,4 +180,4 @@ def usage_stats():
         except Exception as e:
             show_warning(f"Failed to get usage stats: {e}")
     
-    asyncio.run(_show_stats())
+    run_ai_command(_show_stats())
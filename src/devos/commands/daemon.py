@@ -0,0 +1,101 @@
+"""Background daemon commands."""
+
+import click
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Tuple
+
+from devos.core.daemon import (
+    DaemonServer, daemon_supported, is_daemon_running, read_daemon_pid,
+    get_socket_path, get_log_path
+)
+from devos.core.progress import show_success, show_info, show_warning
+
+
+@click.command()
+@click.option('--foreground', is_flag=True, help='Run the daemon in the current process')
+@click.option('--warm', multiple=True, type=click.Path(exists=True, file_okay=False), help='Project directory to pre-analyze (repeatable)')
+@click.pass_context
+def start(ctx, foreground: bool, warm: Tuple[str, ...]):
+    """Start the DevOS background daemon."""
+    
+    if not daemon_supported():
+        show_warning("The daemon is not supported on this platform")
+        return
+    
+    if is_daemon_running():
+        show_info("DevOS daemon is already running", f"PID: {read_daemon_pid()}")
+        return
+    
+    if foreground:
+        import logging
+        logging.basicConfig(level=logging.INFO if ctx.obj.get('verbose') else logging.WARNING)
+        
+        show_info("Starting DevOS daemon", f"Listening on {get_socket_path()}")
+        DaemonServer(warm_paths=warm).serve_forever()
+        return
+    
+    # Re-launch ourselves detached from the terminal
+    command = [sys.executable, '-m', 'devos.cli', 'daemon', 'start', '--foreground']
+    for path in warm:
+        command.extend(['--warm', os.path.abspath(path)])
+    
+    log_path = get_log_path()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'a') as log_file:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            start_new_session=True,
+            close_fds=True
+        )
+    
+    # Wait for the daemon to start accepting connections
+    for _ in range(100):
+        if is_daemon_running():
+            show_success("DevOS daemon started", f"PID: {read_daemon_pid()}")
+            return
+        time.sleep(0.1)
+    
+    show_warning("DevOS daemon did not start", f"Check the log at {log_path}")
+
+
+@click.command()
+def stop():
+    """Stop the DevOS background daemon."""
+    
+    pid = read_daemon_pid()
+    if not pid or not is_daemon_running():
+        show_info("DevOS daemon is not running")
+        return
+    
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError as e:
+        show_warning(f"Failed to stop daemon: {e}")
+        return
+    
+    for _ in range(50):
+        if not is_daemon_running():
+            show_success("DevOS daemon stopped")
+            return
+        time.sleep(0.1)
+    
+    show_warning("DevOS daemon is still shutting down", f"PID: {pid}")
+
+
+@click.command()
+def status():
+    """Show DevOS daemon status."""
+    
+    if is_daemon_running():
+        show_success("DevOS daemon is running", f"PID: {read_daemon_pid()}")
+        click.echo(f"  Socket: {get_socket_path()}")
+        click.echo(f"  Log: {get_log_path()}")
+    else:
+        show_info("DevOS daemon is not running", "Start it with 'devos daemon start'")
@@ -0,0 +1,73 @@
+"""Database maintenance commands."""
+
+import click
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from devos.core.progress import show_success, show_info
+
+
+@click.command()
+@click.option('--older-than', 'older_than', type=int, help='Archive sessions older than this many days (default: tracking.archive_after_days)')
+@click.option('--dry-run', is_flag=True, help='Only show how many sessions would be archived')
+@click.pass_context
+def archive(ctx, older_than: Optional[int], dry_run: bool):
+    """Move old finished sessions into the archive database."""
+    
+    config = ctx.obj['config']
+    db = ctx.obj['db']
+    
+    days = older_than if older_than is not None else config.archive_after_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    
+    if dry_run:
+        count = db.count_archivable_sessions(cutoff)
+        show_info(f"{count} sessions started before {cutoff.strftime('%Y-%m-%d')} would be archived")
+        return
+    
+    moved = db.archive_sessions(cutoff)
+    
+    if moved:
+        show_success(f"Archived {moved} sessions started before {cutoff.strftime('%Y-%m-%d')}",
+                     f"Archive: {db.archive_path}")
+    else:
+        show_info(f"No sessions older than {days} days to archive")
+
+
+@click.command()
+@click.pass_context
+def compact(ctx):
+    """Reclaim free space and refresh query statistics (VACUUM/ANALYZE)."""
+    
+    db = ctx.obj['db']
+    
+    size_before, size_after = db.compact()
+    
+    show_success(
+        "Database compacted",
+        f"{_format_size(size_before)} -> {_format_size(size_after)}"
+    )
+
+
+@click.command()
+@click.pass_context
+def info(ctx):
+    """Show database location, size and session counts."""
+    
+    db = ctx.obj['db']
+    
+    counts = db.count_sessions()
+    
+    click.echo(f"Database:  {db.db_path}")
+    click.echo(f"Archive:   {db.archive_path if db.archive_path.exists() else 'none'}")
+    click.echo(f"Size:      {_format_size(db.get_storage_size())}")
+    click.echo(f"Sessions:  {counts['main']} current, {counts['archive']} archived")
+
+
+def _format_size(size: float) -> str:
+    """Format a byte count for display."""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -2,12 +2,18 @@
 
 import click
 import os
+import subprocess
 import sys
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from devos.core.database import Database
 from devos.core.crypto import Crypto
+from devos.core.daemon import in_daemon_worker
+from devos.core.env_cache import load_env_snapshot, save_env_snapshot
+from devos.core.env_file import parse_env_file
+from devos.core.exceptions import EnvFileError
 
 
 @click.command()
@@ -35,7 +41,7 @@ def set(ctx, key: str, project: Optional[str], global_: bool, value: str):
     encrypted_value = crypto.encrypt(value)
     
     # Store in database
-    env_id = f"env_{int(datetime.now().timestamp())}"
+    env_id = f"env_{uuid.uuid4().hex}"
     db.set_env_var(env_id, project_id, key, encrypted_value)
     
     scope = "global" if global_ else f"project {project}"
@@ -110,22 +116,19 @@ def list(ctx, project: Optional[str], global_: bool, show_values: bool):
         click.echo(f"No environment variables found for {scope}.")
         return
     
-    crypto = Crypto(config.config_dir)
-    
     click.echo(f"Environment variables ({'global' if global_ else f'project {project}'}):")
     click.echo("-" * 40)
     
-    for env_var in env_vars:
-        key = env_var['key']
+    if show_values:
+        # Decrypt every value in one batch
+        crypto = Crypto(config.config_dir)
+        values = crypto.decrypt_many([env_var['encrypted_value'] for env_var in env_vars])
         
-        if show_values:
-            try:
-                value = crypto.decrypt(env_var['encrypted_value'])
-                click.echo(f"{key} = {value}")
-            except Exception:
-                click.echo(f"{key} = [DECRYPT ERROR]")
-        else:
-            click.echo(key)
+        for env_var, value in zip(env_vars, values):
+            click.echo(f"{env_var['key']} = {value if value is not None else '[DECRYPT ERROR]'}")
+    else:
+        for env_var in env_vars:
+            click.echo(env_var['key'])
 
 
 @click.command()
@@ -262,27 +265,142 @@ def export(ctx, shell: str, project: Optional[str]):
         click.echo("No environment variables found.")
         return
     
+    # Decrypt every value in one batch
     crypto = Crypto(config.config_dir)
+    keys = sorted(all_vars.keys())
+    values = crypto.decrypt_many([all_vars[key]['encrypted_value'] for key in keys])
     
     # Export in shell format
-    click.echo(f"# Environment variables for {shell}")
-    click.echo("# Generated by DevOS")
-    click.echo("# Run with: eval \"$(devos env export {shell})\"")
-    click.echo("")
+    lines = [
+        f"# Environment variables for {shell}",
+        "# Generated by DevOS",
+        f"# Run with: eval \"$(devos env export {shell})\"",
+        "",
+    ]
+    
+    for key, value in zip(keys, values):
+        if value is None:
+            lines.append(f"# Error decrypting {key}")
+        elif shell == 'bash' or shell == 'zsh':
+            lines.append(f"export {key}=\"{value}\"")
+        elif shell == 'fish':
+            lines.append(f"set -gx {key} \"{value}\"")
+        elif shell == 'powershell':
+            lines.append(f"$env:{key} = \"{value}\"")
+    
+    click.echo("\n".join(lines))
+
+
+@click.command(name='import')
+@click.argument('env_file', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option('--project', '-p', help='Project name or path')
+@click.option('--global', 'global_', is_flag=True, help='Import as global environment variables')
+@click.option('--dry-run', is_flag=True, help='Only report what would change')
+@click.pass_context
+def import_env(ctx, env_file: str, project: Optional[str], global_: bool, dry_run: bool):
+    """Import variables from a .env file."""
     
-    for key in sorted(all_vars.keys()):
+    config = ctx.obj['config']
+    db = ctx.obj['db']
+    
+    # Determine project scope
+    project_id = None
+    if not global_:
+        project_id = _find_project(db, project)
+        if not project_id:
+            click.echo("No project found. Use --global to import global variables.", err=True)
+            return
+    
+    with click.open_file(env_file, 'r', encoding='utf-8') as f:
         try:
-            value = crypto.decrypt(all_vars[key]['encrypted_value'])
-            
-            if shell == 'bash' or shell == 'zsh':
-                click.echo(f"export {key}=\"{value}\"")
-            elif shell == 'fish':
-                click.echo(f"set -gx {key} \"{value}\"")
-            elif shell == 'powershell':
-                click.echo(f"$env:{key} = \"{value}\"")
-                
-        except Exception:
-            click.echo(f"# Error decrypting {key}")
+            values = parse_env_file(f.read(), source=env_file)
+        except EnvFileError as e:
+            click.echo(f"Error: {e.message}", err=True)
+            ctx.exit(1)
+    
+    if not values:
+        click.echo("No variables found.")
+        return
+    
+    # Compare against what is stored in this scope, decrypting it in one batch
+    crypto = Crypto(config.config_dir)
+    existing = db.get_scoped_env_vars(project_id)
+    current = dict(zip(existing, crypto.decrypt_many([*existing.values()])))
+    
+    added = [key for key in values if key not in current]
+    changed = [key for key in values if key in current and current[key] != values[key]]
+    unchanged = len(values) - len(added) - len(changed)
+    
+    if not dry_run and (added or changed):
+        keys = added + changed
+        encrypted = crypto.encrypt_many([values[key] for key in keys])
+        db.set_env_vars(project_id, dict(zip(keys, encrypted)))
+    
+    scope = "global" if global_ else f"project {project or Path.cwd().name}"
+    prefix = "Would import" if dry_run else "✓ Imported"
+    click.echo(f"{prefix} {len(values)} variables for {scope}: "
+               f"{len(added)} added, {len(changed)} changed, {unchanged} unchanged")
+
+
+@click.command(context_settings={'ignore_unknown_options': True, 'allow_interspersed_args': False})
+@click.option('--project', '-p', help='Project name or path')
+@click.option('--global', 'global_', is_flag=True, help='Only use global environment variables')
+@click.option('--no-cache', is_flag=True, help='Skip the cached environment snapshot')
+@click.argument('command', nargs=-1, required=True, type=click.UNPROCESSED)
+@click.pass_context
+def run(ctx, project: Optional[str], global_: bool, no_cache: bool, command: Tuple[str, ...]):
+    """Run COMMAND with the stored environment variables set.
+    
+    Global variables are merged with the project's (project values win).
+    Example: devos env run -- npm start
+    """
+    
+    config = ctx.obj['config']
+    db = ctx.obj['db']
+    
+    # Determine project scope; outside a project only globals apply
+    project_id = None
+    if not global_:
+        project_id = _find_project(db, project)
+        if project and not project_id:
+            click.echo(f"Project '{project}' not found.", err=True)
+            ctx.exit(1)
+    
+    crypto = Crypto(config.config_dir)
+    
+    env_vars = None if no_cache else load_env_snapshot(crypto, project_id)
+    if env_vars is None:
+        # Resolve and decrypt the whole set once, then cache it encrypted
+        encrypted = db.resolve_env_vars(project_id)
+        values = crypto.decrypt_many([*encrypted.values()])
+        
+        failed = [key for key, value in zip(encrypted, values) if value is None]
+        if failed:
+            click.echo(f"Error decrypting: {', '.join(failed)}", err=True)
+            ctx.exit(1)
+        
+        env_vars = dict(zip(encrypted, values))
+        save_env_snapshot(crypto, project_id, env_vars)
+    
+    env = dict(os.environ)
+    env.update(env_vars)
+    
+    if os.name == 'posix' and not in_daemon_worker():
+        # Replace this process; the command inherits stdio and signals directly
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execvpe(command[0], command, env)
+        except OSError as e:
+            click.echo(f"Cannot run '{command[0]}': {e.strerror}", err=True)
+            ctx.exit(127)
+    
+    try:
+        result = subprocess.run(command, env=env)
+    except OSError as e:
+        click.echo(f"Cannot run '{command[0]}': {e.strerror}", err=True)
+        ctx.exit(127)
+    ctx.exit(result.returncode)
 
 
 def _find_project(db: Database, project_identifier: Optional[str]) -> Optional[str]:
@@ -306,7 +424,3 @@ def _find_project(db: Database, project_identifier: Optional[str]) -> Optional[s
             return proj['id']
     
     return None
-
-
-# Import datetime for env_id generation
-from datetime import datetime
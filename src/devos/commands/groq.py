@@ -1,13 +1,12 @@
 """CLI-friendly Groq AI commands."""
 
 import click
-import asyncio
 from pathlib import Path
 from typing import Optional
 
-from devos.core.progress import show_success, show_info, show_warning, show_operation_status
+from devos.core.progress import show_success, show_info, show_warning, show_operation_status, echo_stream
 from devos.core.ai_config import get_ai_config_manager, initialize_ai_providers
-from devos.core.ai import get_ai_service, AIServiceError, UserPreferences
+from devos.core.ai import get_ai_service, run_ai_command, AIServiceError, UserPreferences
 from devos.core.ai.enhanced_context import EnhancedContextBuilder
 
 
@@ -60,7 +59,10 @@ def groq(prompt: str, model: str, temp: float, max_tokens: int, file: Optional[s
                     file_content = file_path.read_text()
                     full_prompt += f"\n\nFile: {file}\n```\n{file_content}\n```"
             
-            response = await ai_service.generate_code(
+            click.echo("🚀 Groq Response:")
+            click.echo("=" * 50)
+            
+            response = await echo_stream(ai_service.stream_generate_code(
                 query=full_prompt,
                 project_path=Path.cwd(),
                 user_preferences=UserPreferences(
@@ -71,13 +73,9 @@ def groq(prompt: str, model: str, temp: float, max_tokens: int, file: Optional[s
                     max_tokens=max_tokens
                 ),
                 provider_name="groq"
-            )
+            ))
             
-            click.echo("🚀 Groq Response:")
-            click.echo("=" * 50)
-            click.echo(response.content)
-            
-            if response.tokens_used > 0:
+            if response and response.tokens_used > 0:
                 click.echo(f"\n⚡ Tokens: {response.tokens_used} | Cost: ${response.cost:.6f}")
                 click.echo(f"🦊 Model: {model} | Speed: Fast!")
                 
@@ -86,7 +84,7 @@ def groq(prompt: str, model: str, temp: float, max_tokens: int, file: Optional[s
         except Exception as e:
             show_warning(f"Command failed: {e}")
     
-    asyncio.run(_run_groq())
+    run_ai_command(_run_groq())
 
 
 def _build_project_context_prompt(enhanced_context, user_prompt: str) -> str:
@@ -189,7 +187,7 @@ def groq_review(file_path: str, model: str, focus: str):
         except Exception as e:
             show_warning(f"Review failed: {e}")
     
-    asyncio.run(_run_review())
+    run_ai_command(_run_review())
 
 
 @click.command()
@@ -237,7 +235,7 @@ def groq_explain(file_path: str, model: str, query: str):
         except Exception as e:
             show_warning(f"Explanation failed: {e}")
     
-    asyncio.run(_run_explain())
+    run_ai_command(_run_explain())
 
 
 @click.command()
@@ -272,7 +270,7 @@ def groq_chat(model: str, temp: float):
                     
                     conversation.append({"role": "user", "content": user_input})
                     
-                    response = await ai_service.chat(
+                    response = await echo_stream(ai_service.stream_chat(
                         conversation=conversation,
                         project_path=Path.cwd(),
                         user_preferences=UserPreferences(
@@ -283,12 +281,10 @@ def groq_chat(model: str, temp: float):
                             max_tokens=1000
                         ),
                         provider_name="groq"
-                    )
+                    ), prefix="\n🤖 Groq: ")
                     
                     conversation.append({"role": "assistant", "content": response.content})
                     
-                    click.echo(f"\n🤖 Groq: {response.content}")
-                    
                     if response.tokens_used > 0:
                         click.echo(f"⚡ Tokens: {response.tokens_used} | Cost: ${response.cost:.6f}")
                         
@@ -303,7 +299,7 @@ def groq_chat(model: str, temp: float):
         except Exception as e:
             show_warning(f"Chat failed: {e}")
     
-    asyncio.run(_run_chat())
+    run_ai_command(_run_chat())
 
 
 @click.command()
@@ -353,7 +349,7 @@ def groq_generate(prompt: str, language: Optional[str], model: str):
         except Exception as e:
             show_warning(f"Generation failed: {e}")
     
-    asyncio.run(_run_generate())
+    run_ai_command(_run_generate())
 
 
 @click.command()
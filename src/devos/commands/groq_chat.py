@@ -3,7 +3,6 @@ Interactive AI Chat Mode - Conversational AI with Project Context
 Provides an interactive chat interface with deep project understanding.
 """
 
-import asyncio
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -14,7 +13,7 @@ from datetime import datetime
 
 from devos.core.progress import show_success, show_info, show_warning, show_operation_status
 from devos.core.ai_config import get_ai_config_manager, initialize_ai_providers
-from devos.core.ai import get_ai_service, AIServiceError, UserPreferences
+from devos.core.ai import get_ai_service, run_ai_command, AIServiceError, UserPreferences
 from devos.core.ai.enhanced_context import EnhancedContextBuilder
 
 
@@ -219,4 +218,4 @@ def groq_chat(model: str, temp: float, max_tokens: int, context: bool):
         except Exception as e:
             show_warning(f"Chat session failed: {e}")
     
-    asyncio.run(run_chat())
+    run_ai_command(run_chat())
@@ -3,7 +3,6 @@ Enhanced AI Commands - Project-Wide Intelligence
 Commands that leverage deep project understanding for intelligent assistance.
 """
 
-import asyncio
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -12,7 +11,7 @@ import click
 
 from devos.core.progress import show_success, show_info, show_warning, show_operation_status
 from devos.core.ai_config import get_ai_config_manager, initialize_ai_providers
-from devos.core.ai import get_ai_service, AIServiceError, UserPreferences
+from devos.core.ai import get_ai_service, run_ai_command, AIServiceError, UserPreferences
 from devos.core.ai.enhanced_context import EnhancedContextBuilder
 from devos.core.export.markdown import MarkdownExporter
 
@@ -149,7 +148,7 @@ def groq_analyze(query: str, model: str, temp: float, max_tokens: int, scope: st
         except Exception as e:
             show_warning(f"Analysis failed: {e}")
     
-    asyncio.run(_run_analyze())
+    run_ai_command(_run_analyze())
 
 
 @click.command()
@@ -337,7 +336,7 @@ Focus on practical, actionable advice."""
         except Exception as e:
             show_warning(f"Scan failed: {e}")
     
-    asyncio.run(_run_security_scan())
+    run_ai_command(_run_security_scan())
 
 
 @click.command()
@@ -490,7 +489,7 @@ Please provide:
         except Exception as e:
             show_warning(f"Architecture mapping failed: {e}")
     
-    asyncio.run(_run_architecture_map())
+    run_ai_command(_run_architecture_map())
 
 
 @click.command()
@@ -597,7 +596,7 @@ Focus on practical, implementable improvements."""
         except Exception as e:
             show_warning(f"Enhancement failed: {e}")
     
-    asyncio.run(_run_enhance())
+    run_ai_command(_run_enhance())
 
 
 @click.command()
@@ -749,7 +748,7 @@ Keep it concise and actionable."""
         except Exception as e:
             show_warning(f"Summary generation failed: {e}")
     
-    asyncio.run(_run_project_summary())
+    run_ai_command(_run_project_summary())
 
 
 def _build_analysis_prompt(query: str, enhanced_context, scope: str, focus: str) -> str:
@@ -1,9 +1,10 @@
 """Project management commands."""
 
 import click
+import itertools
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime
 
 from devos.core.database import Database
@@ -53,24 +54,38 @@ def add(ctx, name: str, type: str, description: Optional[str], tags: Optional[st
 @click.command()
 @click.option('--type', help='Filter by project type')
 @click.option('--status', type=click.Choice(['active', 'completed', 'archived']), help='Filter by status')
-@click.option('--format', type=click.Choice(['table', 'json']), default='table', help='Output format')
+@click.option('--limit', '-l', default=0, help='Number of projects to show (0 for all)')
+@click.option('--after', help='Continue after this project ID (next page)')
+@click.option('--before', type=click.DateTime(), help='Only projects created before this local time')
+@click.option('--format', type=click.Choice(['table', 'json', 'jsonl']), default='table', help='Output format')
 @click.pass_context
-def list(ctx, type: Optional[str], status: Optional[str], format: str):
+def list(ctx, type: Optional[str], status: Optional[str], limit: int, after: Optional[str],
+         before: Optional[datetime], format: str):
     """List all projects."""
     
     db = ctx.obj['db']
     
     try:
-        projects = db.get_projects(type_filter=type, status_filter=status)
+        projects = db.iter_projects(
+            type_filter=type, status_filter=status, after=after,
+            before=before.astimezone() if before else None, limit=limit or None
+        )
         
-        if not projects:
+        first = next(projects, None)
+        if first is None:
             show_info("No projects found")
             return
+        projects = itertools.chain([first], projects)
         
-        if format == 'json':
-            click.echo(json.dumps(projects, indent=2, default=str))
+        if format == 'jsonl':
+            for project in projects:
+                click.echo(json.dumps(project, default=str))
+        elif format == 'json':
+            click.echo(json.dumps([*projects], indent=2, default=str))
         else:
-            _display_projects_table(projects)
+            shown, last_id = _display_projects_table(projects)
+            if limit and shown == limit:
+                click.echo(f"\nNext page: devos project list --after {last_id}")
             
     except Exception as e:
         show_operation_status(f"Failed to list projects: {e}", False)
@@ -228,25 +243,31 @@ def notes(ctx, project_name: str, add: Optional[str], list_notes: bool, delete:
         show_operation_status(f"Failed to manage notes: {e}", False)
 
 
-def _display_projects_table(projects: List[Dict[str, Any]]) -> None:
-    """Display projects in table format."""
+def _display_projects_table(projects: Iterable[Dict[str, Any]]) -> Tuple[int, Optional[str]]:
+    """Display projects in table format; returns the row count and last project ID."""
     
     click.echo("\n📋 Projects")
     click.echo("-" * 80)
     click.echo(f"{'Name':<20} {'Type':<10} {'Status':<10} {'Tasks':<8} {'Issues':<8} {'Created':<12}")
     click.echo("-" * 80)
     
+    shown = 0
+    last_id = None
     for project in projects:
         name = project['name'][:18] + '..' if len(project['name']) > 20 else project['name']
         type_str = project['type'][:8] + '..' if len(project['type']) > 10 else project['type']
         status = project['status'][:8] + '..' if len(project['status']) > 10 else project['status']
         
-        task_count = len(project.get('tasks', []))
-        issue_count = len(project.get('issues', []))
+        task_count = project.get('task_count', 0)
+        issue_count = project.get('issue_count', 0)
         
         created = project['created_at'][:10] if project.get('created_at') else 'Unknown'
         
         click.echo(f"{name:<20} {type_str:<10} {status:<10} {task_count:<8} {issue_count:<8} {created:<12}")
+        shown += 1
+        last_id = project['id']
+    
+    return shown, last_id
 
 
 def _display_project_status(project: Dict[str, Any]) -> None:
@@ -100,16 +100,7 @@ def today(ctx):
     from datetime import datetime, timezone
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
     
-    sessions = db.execute_query(
-        """
-        SELECT s.*, p.name as project_name 
-        FROM sessions s 
-        JOIN projects p ON s.project_id = p.id 
-        WHERE s.start_time >= ? 
-        ORDER BY s.start_time DESC
-        """,
-        (today_start.isoformat(),)
-    )
+    sessions = db.list_sessions_between(today_start)
     
     if not sessions:
         show_info("No sessions today")
@@ -123,7 +114,7 @@ def today(ctx):
     click.echo("-" * 30)
     
     for session in sessions:
-        project_name = session['project_name']
+        project_name = session['project_name'] or 'Unknown'
         start_time = datetime.fromisoformat(session['start_time'])
         
         if session['end_time']:
@@ -1,13 +1,12 @@
 """Quick AI commands - Fast responses without deep analysis."""
 
 import click
-import asyncio
 from pathlib import Path
 from typing import Optional
 
-from devos.core.progress import show_success, show_info, show_warning, show_operation_status
+from devos.core.progress import show_success, show_info, show_warning, show_operation_status, echo_stream
 from devos.core.ai_config import get_ai_config_manager, initialize_ai_providers
-from devos.core.ai import get_ai_service, AIServiceError, UserPreferences
+from devos.core.ai import get_ai_service, run_ai_command, AIServiceError, UserPreferences
 
 
 @click.command()
@@ -39,7 +38,10 @@ def quick_ai(prompt: str, model: str, temp: float, max_tokens: int, file: Option
                 file_content = file_path.read_text()
                 full_prompt += f"\n\nFile: {file}\n```\n{file_content}\n```"
             
-            response = await ai_service.generate_code(
+            click.echo("⚡ Quick AI Response:")
+            click.echo("=" * 50)
+            
+            response = await echo_stream(ai_service.stream_generate_code(
                 query=full_prompt,
                 project_path=Path.cwd(),
                 user_preferences=UserPreferences(
@@ -50,13 +52,9 @@ def quick_ai(prompt: str, model: str, temp: float, max_tokens: int, file: Option
                     max_tokens=max_tokens
                 ),
                 provider_name="groq"
-            )
-            
-            click.echo("⚡ Quick AI Response:")
-            click.echo("=" * 50)
-            click.echo(response.content)
+            ))
             
-            if response.tokens_used > 0:
+            if response and response.tokens_used > 0:
                 click.echo(f"\n⚡ Tokens: {response.tokens_used} | Cost: ${response.cost:.6f}")
                 click.echo(f"🦊 Model: {model} | Ultra Fast!")
                 
@@ -65,4 +63,4 @@ def quick_ai(prompt: str, model: str, temp: float, max_tokens: int, file: Option
         except Exception as e:
             show_warning(f"Command failed: {e}")
     
-    asyncio.run(_run_quick_ai())
+    run_ai_command(_run_quick_ai())
@@ -4,14 +4,14 @@ import click
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 
 from devos.core.database import Database
 
 
 @click.command()
 @click.option('--project', '-p', help='Filter by project name or path')
-@click.option('--format', '-f', type=click.Choice(['table', 'json', 'markdown']), default='table', help='Output format')
+@click.option('--format', '-f', type=click.Choice(['table', 'json', 'jsonl', 'markdown']), default='table', help='Output format')
 @click.option('--output', '-o', help='Output file path')
 @click.pass_context
 def weekly(ctx, project: Optional[str], format: str, output: Optional[str]):
@@ -34,27 +34,23 @@ def weekly(ctx, project: Optional[str], format: str, output: Optional[str]):
     
     # Calculate week range
     week_start = _get_week_start(config.week_start).replace(tzinfo=datetime.now().astimezone().tzinfo)
-    week_end = week_start + timedelta(days=6, hours=23, minutes=59, seconds=59)
+    week_end = week_start + timedelta(days=7)
     
-    # Get sessions for the week
-    sessions = db.list_sessions(project_id, limit=1000)
-    week_sessions = []
+    # Read the week's per-day totals from the daily rollups
+    daily_totals = db.get_rollup_totals(week_start.date(), week_end.date(), group_by='day', project_id=project_id)
     
-    for session in sessions:
-        session_date = datetime.fromisoformat(session['start_time'])
-        if week_start <= session_date <= week_end:
-            week_sessions.append(session)
-    
-    if not week_sessions:
+    if not daily_totals:
         click.echo("No sessions found for this week.")
         return
     
     # Generate report
-    report_data = _generate_weekly_report(week_sessions, week_start, project_name)
+    report_data = _generate_weekly_report(daily_totals, week_start, project_name)
     
     # Output report
     if format == 'json':
         _output_json_report(report_data, output)
+    elif format == 'jsonl':
+        _output_jsonl_report(report_data['daily_breakdown'], output)
     elif format == 'markdown':
         _output_markdown_report(report_data, output, 'weekly')
     else:
@@ -64,10 +60,11 @@ def weekly(ctx, project: Optional[str], format: str, output: Optional[str]):
 @click.command()
 @click.option('--project', '-p', help='Filter by project name or path')
 @click.option('--days', '-d', default=30, help='Number of days to include')
-@click.option('--format', '-f', type=click.Choice(['table', 'json', 'markdown']), default='table', help='Output format')
+@click.option('--by', 'group_by', type=click.Choice(['project', 'weekday']), default='project', help='Break totals down by project or by day of the week')
+@click.option('--format', '-f', type=click.Choice(['table', 'json', 'jsonl', 'markdown']), default='table', help='Output format')
 @click.option('--output', '-o', help='Output file path')
 @click.pass_context
-def summary(ctx, project: Optional[str], days: int, format: str, output: Optional[str]):
+def summary(ctx, project: Optional[str], days: int, group_by: str, format: str, output: Optional[str]):
     """Generate summary report for a time period."""
     
     config = ctx.obj['config']
@@ -89,25 +86,23 @@ def summary(ctx, project: Optional[str], days: int, format: str, output: Optiona
     end_date = datetime.now().astimezone()
     start_date = end_date - timedelta(days=days)
     
-    # Get sessions for the period
-    sessions = db.list_sessions(project_id, limit=1000)
-    period_sessions = []
-    
-    for session in sessions:
-        session_date = datetime.fromisoformat(session['start_time'])
-        if start_date <= session_date <= end_date:
-            period_sessions.append(session)
+    # Read the period's per-project or per-weekday totals from the daily rollups
+    totals = db.get_rollup_totals(
+        start_date.date(), end_date.date() + timedelta(days=1), group_by=group_by, project_id=project_id
+    )
     
-    if not period_sessions:
+    if not totals:
         click.echo(f"No sessions found in the last {days} days.")
         return
     
     # Generate report
-    report_data = _generate_summary_report(period_sessions, start_date, end_date, project_name)
+    report_data = _generate_summary_report(totals, start_date, end_date, project_name, group_by)
     
     # Output report
     if format == 'json':
         _output_json_report(report_data, output)
+    elif format == 'jsonl':
+        _output_jsonl_report(report_data[f'{group_by}_breakdown'], output)
     elif format == 'markdown':
         _output_markdown_report(report_data, output, 'summary')
     else:
@@ -116,7 +111,7 @@ def summary(ctx, project: Optional[str], days: int, format: str, output: Optiona
 
 @click.command()
 @click.option('--project', '-p', help='Filter by project name or path')
-@click.option('--format', '-f', type=click.Choice(['table', 'json', 'markdown']), default='table', help='Output format')
+@click.option('--format', '-f', type=click.Choice(['table', 'json', 'jsonl', 'markdown']), default='table', help='Output format')
 @click.option('--output', '-o', help='Output file path')
 @click.pass_context
 def projects(ctx, project: Optional[str], format: str, output: Optional[str]):
@@ -124,25 +119,38 @@ def projects(ctx, project: Optional[str], format: str, output: Optional[str]):
     
     db = ctx.obj['db']
     
-    # Get all projects
-    projects = db.list_projects()
+    # Get all projects with their session totals in one pass
+    projects = db.get_project_activity()
     
     if not projects:
         click.echo("No projects found.")
         return
     
     # Generate report data
-    report_data = _generate_projects_report(projects, db)
+    report_data = _generate_projects_report(projects)
     
     # Output report
     if format == 'json':
         _output_json_report(report_data, output)
+    elif format == 'jsonl':
+        _output_jsonl_report(report_data['projects'], output)
     elif format == 'markdown':
         _output_markdown_report(report_data, output, 'projects')
     else:
         _output_table_report(report_data, output, 'projects')
 
 
+@click.command()
+@click.pass_context
+def rebuild_rollups(ctx):
+    """Rebuild the daily totals used by reports from raw sessions."""
+    
+    db = ctx.obj['db']
+    
+    rows = db.rebuild_daily_rollups()
+    click.echo(f"✓ Rebuilt daily rollups ({rows} project-days)")
+
+
 def _get_week_start(week_start_day: str) -> datetime:
     """Get the start of the current week."""
     today = datetime.now().date()
@@ -168,47 +176,22 @@ def _get_week_start(week_start_day: str) -> datetime:
     return datetime.combine(week_start_date, datetime.min.time()).replace(tzinfo=datetime.now().astimezone().tzinfo)
 
 
-def _generate_weekly_report(sessions: List[Dict], week_start: datetime, project_name: Optional[str]) -> Dict[str, Any]:
-    """Generate weekly report data."""
-    
-    # Group sessions by day
-    daily_stats = {}
-    total_seconds = 0
-    
-    for session in sessions:
-        session_date = datetime.fromisoformat(session['start_time']).date()
-        day_key = session_date.strftime('%Y-%m-%d')
-        
-        if day_key not in daily_stats:
-            daily_stats[day_key] = {
-                'date': session_date,
-                'sessions': 0,
-                'seconds': 0,
-                'project_names': set()
-            }
-        
-        daily_stats[day_key]['sessions'] += 1
-        
-        if session['duration']:
-            daily_stats[day_key]['seconds'] += session['duration']
-            total_seconds += session['duration']
-        
-        daily_stats[day_key]['project_names'].add(session.get('project_name', 'Unknown'))
+def _generate_weekly_report(daily_totals: List[Dict], week_start: datetime, project_name: Optional[str]) -> Dict[str, Any]:
+    """Generate weekly report data from per-day totals."""
     
     # Calculate totals
-    total_sessions = len(sessions)
-    total_hours = total_seconds / 3600
+    total_sessions = sum(day['sessions'] for day in daily_totals)
+    total_hours = sum(day['seconds'] for day in daily_totals) / 3600
     
     # Format daily stats
     daily_data = []
-    for day_key in sorted(daily_stats.keys()):
-        stats = daily_stats[day_key]
-        hours = stats['seconds'] / 3600
+    for day in daily_totals:
+        day_date = datetime.strptime(day['day'], '%Y-%m-%d').date()
         daily_data.append({
-            'date': stats['date'].strftime('%Y-%m-%d (%A)'),
-            'sessions': stats['sessions'],
-            'hours': round(hours, 2),
-            'projects': len(stats['project_names'])
+            'date': day_date.strftime('%Y-%m-%d (%A)'),
+            'sessions': day['sessions'],
+            'hours': round(day['seconds'] / 3600, 2),
+            'projects': day['projects']
         })
     
     return {
@@ -222,41 +205,34 @@ def _generate_weekly_report(sessions: List[Dict], week_start: datetime, project_
     }
 
 
-def _generate_summary_report(sessions: List[Dict], start_date: datetime, end_date: datetime, project_name: Optional[str]) -> Dict[str, Any]:
-    """Generate summary report data."""
+# Weekday numbers returned by Database.get_rollup_totals(group_by='weekday')
+WEEKDAY_NAMES = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+
+def _generate_summary_report(totals: List[Dict], start_date: datetime, end_date: datetime,
+                             project_name: Optional[str], group_by: str = 'project') -> Dict[str, Any]:
+    """Generate summary report data from per-project or per-weekday totals."""
     
     # Calculate totals
-    total_sessions = len(sessions)
-    total_seconds = sum(s.get('duration', 0) for s in sessions if s['duration'])
+    total_sessions = sum(row['sessions'] for row in totals)
+    total_seconds = sum(row['seconds'] for row in totals)
     total_hours = total_seconds / 3600
     
-    # Group by project
-    project_stats = {}
-    for session in sessions:
-        project_name_key = session.get('project_name', 'Unknown')
-        if project_name_key not in project_stats:
-            project_stats[project_name_key] = {
-                'sessions': 0,
-                'seconds': 0
-            }
-        
-        project_stats[project_name_key]['sessions'] += 1
-        if session['duration']:
-            project_stats[project_name_key]['seconds'] += session['duration']
-    
-    # Format project breakdown
-    project_breakdown = []
-    for proj_name, stats in project_stats.items():
-        hours = stats['seconds'] / 3600
-        project_breakdown.append({
-            'project': proj_name,
-            'sessions': stats['sessions'],
+    # Format breakdown
+    breakdown = []
+    for row in totals:
+        hours = row['seconds'] / 3600
+        label = row['project_name'] if group_by == 'project' else WEEKDAY_NAMES[row['weekday']]
+        breakdown.append({
+            group_by: label,
+            'sessions': row['sessions'],
             'hours': round(hours, 2),
-            'percentage': round((stats['seconds'] / total_seconds * 100) if total_seconds > 0 else 0, 1)
+            'percentage': round((row['seconds'] / total_seconds * 100) if total_seconds > 0 else 0, 1)
         })
     
-    # Sort by hours
-    project_breakdown.sort(key=lambda x: x['hours'], reverse=True)
+    # Projects by hours; weekdays stay in calendar order
+    if group_by == 'project':
+        breakdown.sort(key=lambda x: x['hours'], reverse=True)
     
     return {
         'type': 'summary',
@@ -264,39 +240,26 @@ def _generate_summary_report(sessions: List[Dict], start_date: datetime, end_dat
         'project': project_name,
         'total_sessions': total_sessions,
         'total_hours': round(total_hours, 2),
-        'project_breakdown': project_breakdown,
+        f'{group_by}_breakdown': breakdown,
         'generated_at': datetime.now().isoformat()
     }
 
 
-def _generate_projects_report(projects: List[Dict], db: Database) -> Dict[str, Any]:
-    """Generate projects report data."""
+def _generate_projects_report(projects: List[Dict]) -> Dict[str, Any]:
+    """Generate projects report data from per-project activity rows."""
     
     project_data = []
     
     for project in projects:
-        # Get sessions for this project
-        sessions = db.list_sessions(project['id'], limit=1000)
-        
-        # Calculate stats
-        total_sessions = len(sessions)
-        total_seconds = sum(s.get('duration', 0) for s in sessions if s['duration'])
-        total_hours = total_seconds / 3600
-        
-        # Get last activity
-        last_activity = None
-        if sessions:
-            last_session = max(sessions, key=lambda x: x['start_time'])
-            last_activity = last_session['start_time']
-        
         project_data.append({
             'name': project['name'],
             'language': project['language'],
             'path': project['path'],
             'created_at': project['created_at'],
-            'total_sessions': total_sessions,
-            'total_hours': round(total_hours, 2),
-            'last_activity': last_activity
+            'total_sessions': project['total_sessions'],
+            'total_hours': round(project['total_seconds'] / 3600, 2),
+            'first_activity': project['first_activity'],
+            'last_activity': project['last_activity']
         })
     
     # Sort by total hours
@@ -336,12 +299,13 @@ def _output_table_report(report_data: Dict[str, Any], output: Optional[str], rep
         lines.append(f"Total Sessions: {report_data['total_sessions']}")
         lines.append(f"Total Hours: {report_data['total_hours']}")
         lines.append("")
-        lines.append("Project Breakdown:")
+        group_by = 'weekday' if 'weekday_breakdown' in report_data else 'project'
+        lines.append(f"{group_by.title()} Breakdown:")
         lines.append("-" * 60)
-        lines.append(f"{'Project':<20} {'Sessions':<10} {'Hours':<10} {'Percentage':<10}")
+        lines.append(f"{group_by.title():<20} {'Sessions':<10} {'Hours':<10} {'Percentage':<10}")
         
-        for proj in report_data['project_breakdown']:
-            lines.append(f"{proj['project']:<20} {proj['sessions']:<10} {proj['hours']:<10} {proj['percentage']}%")
+        for row in report_data[f'{group_by}_breakdown']:
+            lines.append(f"{row[group_by]:<20} {row['sessions']:<10} {row['hours']:<10} {row['percentage']}%")
     
     elif report_type == 'projects':
         lines.append(f"Projects Report ({report_data['total_projects']} projects)")
@@ -379,6 +343,19 @@ def _output_json_report(report_data: Dict[str, Any], output: Optional[str]):
         click.echo(content)
 
 
+def _output_jsonl_report(rows: Iterable[Dict[str, Any]], output: Optional[str]):
+    """Output report rows as JSON Lines, one row at a time."""
+    
+    if output:
+        with open(output, 'w') as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + '\n')
+        click.echo(f"Report saved to {output}")
+    else:
+        for row in rows:
+            click.echo(json.dumps(row, default=str))
+
+
 def _output_markdown_report(report_data: Dict[str, Any], output: Optional[str], report_type: str):
     """Output report in Markdown format."""
     
@@ -408,13 +385,14 @@ def _output_markdown_report(report_data: Dict[str, Any], output: Optional[str],
         lines.append(f"**Total Sessions:** {report_data['total_sessions']}")
         lines.append(f"**Total Hours:** {report_data['total_hours']}")
         lines.append("")
-        lines.append("## Project Breakdown")
+        group_by = 'weekday' if 'weekday_breakdown' in report_data else 'project'
+        lines.append(f"## {group_by.title()} Breakdown")
         lines.append("")
-        lines.append("| Project | Sessions | Hours | Percentage |")
-        lines.append("|---------|----------|-------|------------|")
+        lines.append(f"| {group_by.title()} | Sessions | Hours | Percentage |")
+        lines.append(f"|{'-' * (len(group_by) + 2)}|----------|-------|------------|")
         
-        for proj in report_data['project_breakdown']:
-            lines.append(f"| {proj['project']} | {proj['sessions']} | {proj['hours']} | {proj['percentage']}% |")
+        for row in report_data[f'{group_by}_breakdown']:
+            lines.append(f"| {row[group_by]} | {row['sessions']} | {row['hours']} | {row['percentage']}% |")
     
     elif report_type == 'projects':
         lines.append(f"# Projects Report")
@@ -0,0 +1,121 @@
+"""Full-text search across project tasks, issues, notes and session notes."""
+
+import click
+import json
+from pathlib import Path
+from typing import Optional, Tuple
+
+from devos.core.database import Database, SEARCH_KINDS
+from devos.core.exceptions import DatabaseError
+from devos.core.progress import show_success, show_info, show_warning
+
+# Markers passed to snippet() and replaced with terminal styling
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+KIND_ICONS = {'task': '📝', 'issue': '🐛', 'note': '🗒️', 'session': '⏱️'}
+
+
+@click.command()
+@click.argument('query', nargs=-1)
+@click.option('--project', '-p', help='Only search this project (name or path)')
+@click.option('--type', 'kinds', multiple=True, type=click.Choice(sorted(SEARCH_KINDS)),
+              help='Only search these item types (repeatable)')
+@click.option('--limit', '-n', default=20, show_default=True, help='Maximum number of results')
+@click.option('--raw', is_flag=True, help='Pass QUERY through as FTS5 syntax (AND/OR/NOT, "phrases", prefix*)')
+@click.option('--format', type=click.Choice(['table', 'json']), default='table', help='Output format')
+@click.option('--rebuild', is_flag=True, help='Rebuild the search index before searching')
+@click.pass_context
+def search(ctx, query: Tuple[str, ...], project: Optional[str], kinds: Tuple[str, ...], limit: int,
+           raw: bool, format: str, rebuild: bool):
+    """Search notes, tasks, issues and session notes."""
+    
+    db = ctx.obj['db']
+    
+    if rebuild:
+        rows = db.rebuild_search_index()
+        show_success(f"Rebuilt search index ({rows} entries)")
+    
+    if not query:
+        if not rebuild:
+            raise click.UsageError("Missing search query.")
+        return
+    
+    project_id = None
+    if project:
+        project_id = _find_project(db, project)
+        if not project_id:
+            show_warning(f"Project '{project}' not found")
+            return
+    
+    match = ' '.join(query) if raw else _to_match_query(query)
+    try:
+        results = db.search(
+            match, project_id=project_id, kinds=list(kinds) or None, limit=limit,
+            highlight=(HIGHLIGHT_START, HIGHLIGHT_END)
+        )
+    except DatabaseError as e:
+        show_warning(f"Invalid search query: {e.message}")
+        ctx.exit(1)
+    
+    if not results:
+        show_info(f"No results for '{' '.join(query)}'")
+        return
+    
+    if format == 'json':
+        for result in results:
+            result['snippet'] = _strip_highlight(result['snippet'])
+        click.echo(json.dumps(results, indent=2, default=str))
+        return
+    
+    click.echo(f"\n🔎 {len(results)} result{'s' if len(results) != 1 else ''} for '{' '.join(query)}'")
+    click.echo("-" * 60)
+    
+    for result in results:
+        icon = KIND_ICONS.get(result['kind'], '•')
+        created = (result['created_at'] or '')[:10]
+        click.echo(f"{icon} {result['kind']:<8} {result['project_name']:<20} {created}")
+        click.echo(f"   {_style_highlight(result['snippet'])}")
+
+
+def _to_match_query(terms: Tuple[str, ...]) -> str:
+    """Quote each search term so FTS5 operators in user input are taken literally."""
+    words = [word for term in terms for word in term.split()]
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def _style_highlight(snippet: str) -> str:
+    """Render snippet highlight markers as bold terminal text."""
+    parts = []
+    rest = snippet
+    
+    while HIGHLIGHT_START in rest:
+        before, _, rest = rest.partition(HIGHLIGHT_START)
+        hit, _, rest = rest.partition(HIGHLIGHT_END)
+        parts.append(before)
+        parts.append(click.style(hit, fg='yellow', bold=True))
+    
+    parts.append(rest)
+    return ''.join(parts)
+
+
+def _strip_highlight(snippet: str) -> str:
+    """Remove snippet highlight markers."""
+    return snippet.replace(HIGHLIGHT_START, '').replace(HIGHLIGHT_END, '')
+
+
+def _find_project(db: Database, project_identifier: str) -> Optional[str]:
+    """Find project by name or path."""
+    # Try to find by path first
+    path = Path(project_identifier).resolve()
+    project = db.get_project_by_path(str(path))
+    if project:
+        return project['id']
+    
+    # Try to find by name
+    projects = db.list_projects()
+    for proj in projects:
+        if proj['name'] == project_identifier:
+            return proj['id']
+    
+    return None
@@ -1,12 +1,16 @@
 """Work session tracking command."""
 
 import click
+import csv
+import itertools
+import json
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
 
 from devos.core.database import Database
+from devos.core.exceptions import DatabaseError
 
 
 @click.command()
@@ -172,10 +176,12 @@ def status(ctx, project: Optional[str], limit: int):
 
 @click.command()
 @click.option('--project', '-p', help='Filter by project name or path')
-@click.option('--limit', '-l', default=50, help='Number of sessions to show')
-@click.option('--format', '-f', type=click.Choice(['table', 'json']), default='table', help='Output format')
+@click.option('--limit', '-l', default=50, help='Number of sessions to show (0 for all)')
+@click.option('--after', help='Continue after this session ID (next page)')
+@click.option('--before', type=click.DateTime(), help='Only sessions started before this local time')
+@click.option('--format', '-f', type=click.Choice(['table', 'json', 'jsonl']), default='table', help='Output format')
 @click.pass_context
-def list(ctx, project: Optional[str], limit: int, format: str):
+def list(ctx, project: Optional[str], limit: int, after: Optional[str], before: Optional[datetime], format: str):
     """List tracking sessions."""
     
     db = ctx.obj['db']
@@ -188,23 +194,37 @@ def list(ctx, project: Optional[str], limit: int, format: str):
             click.echo(f"Project '{project}' not found.", err=True)
             return
     
-    # Get sessions
-    sessions = db.list_sessions(project_id=project_id, limit=limit)
+    # Stream sessions page by page from the database
+    try:
+        sessions = db.iter_sessions(
+            project_id=project_id, after=after,
+            before=before.astimezone() if before else None, limit=limit or None
+        )
+    except DatabaseError as e:
+        click.echo(e.message, err=True)
+        ctx.exit(1)
     
-    if not sessions:
+    first = next(sessions, None)
+    if first is None:
         click.echo("No sessions found.")
         return
+    sessions = itertools.chain([first], sessions)
     
-    if format == 'json':
-        import json
-        click.echo(json.dumps(sessions, indent=2, default=str))
+    if format == 'jsonl':
+        # One JSON object per line, written as rows arrive
+        for session in sessions:
+            click.echo(json.dumps(session, default=str))
+    elif format == 'json':
+        click.echo(json.dumps([*sessions], indent=2, default=str))
     else:
         # Table format
         click.echo(f"{'Project':<20} {'Start':<17} {'Duration':<10} {'Status':<8}")
         click.echo("-" * 60)
         
+        shown = 0
+        last_id = None
         for session in sessions:
-            project_name = session.get('project_name', 'Unknown')[:18]
+            project_name = (session.get('project_name') or 'Unknown')[:18]
             start_time = datetime.fromisoformat(session['start_time'])
             start_str = start_time.strftime('%m/%d %H:%M')
             
@@ -224,6 +244,133 @@ def list(ctx, project: Optional[str], limit: int, format: str):
                 status = "Active"
             
             click.echo(f"{project_name:<20} {start_str:<17} {duration_str:<10} {status:<8}")
+            shown += 1
+            last_id = session['id']
+        
+        if limit and shown == limit:
+            click.echo(f"\nNext page: devos track list --after {last_id}")
+
+
+# Session fields written by export and read back by import
+EXPORT_FIELDS = ['id', 'project_id', 'project_name', 'start_time', 'end_time', 'duration', 'notes']
+
+
+@click.command()
+@click.argument('output', type=click.Path(dir_okay=False, allow_dash=True), default='-')
+@click.option('--project', '-p', help='Only export this project (name or path)')
+@click.option('--format', '-f', 'fmt', type=click.Choice(['ndjson', 'csv']), help='Output format (default: from file extension, else ndjson)')
+@click.pass_context
+def export(ctx, output: str, project: Optional[str], fmt: Optional[str]):
+    """Export sessions to an NDJSON or CSV file (default: stdout)."""
+    
+    db = ctx.obj['db']
+    
+    project_id = None
+    if project:
+        project_id = _find_project(db, project)
+        if not project_id:
+            click.echo(f"Project '{project}' not found.", err=True)
+            return
+    
+    fmt = fmt or _format_from_path(output)
+    count = 0
+    
+    with click.open_file(output, 'w', encoding='utf-8') as f:
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+        
+        for session in db.iter_sessions(project_id=project_id):
+            if fmt == 'csv':
+                writer.writerow(session)
+            else:
+                f.write(json.dumps({field: session.get(field) for field in EXPORT_FIELDS}) + '\n')
+            count += 1
+    
+    if output != '-':
+        click.echo(f"✓ Exported {count} sessions to {output}")
+
+
+@click.command(name='import')
+@click.argument('input_file', type=click.Path(dir_okay=False, allow_dash=True, exists=True))
+@click.option('--project', '-p', help='Assign every imported session to this project (name or path)')
+@click.option('--format', '-f', 'fmt', type=click.Choice(['ndjson', 'csv']), help='Input format (default: from file extension, else ndjson)')
+@click.pass_context
+def import_sessions(ctx, input_file: str, project: Optional[str], fmt: Optional[str]):
+    """Import sessions from an NDJSON or CSV file, skipping known session IDs.
+    
+    Sessions are matched to local projects by project_id, then by
+    project_name; use --project to put them all under one project.
+    """
+    
+    db = ctx.obj['db']
+    
+    project_id = None
+    if project:
+        project_id = _find_project(db, project)
+        if not project_id:
+            click.echo(f"Project '{project}' not found.", err=True)
+            return
+    
+    # Map exported project ids and names onto this database's projects
+    local_projects = db.list_projects()
+    known_ids = {proj['id'] for proj in local_projects}
+    ids_by_name = {proj['name']: proj['id'] for proj in local_projects}
+    
+    fmt = fmt or _format_from_path(input_file)
+    
+    with click.open_file(input_file, 'r', encoding='utf-8') as f:
+        records = csv.DictReader(f) if fmt == 'csv' else _read_ndjson(f)
+        sessions = _import_sessions_from(records, project_id, known_ids, ids_by_name)
+        try:
+            imported, skipped = db.import_sessions(sessions)
+        except DatabaseError as e:
+            raise click.ClickException(e.message)
+    
+    click.echo(f"✓ Imported {imported} sessions ({skipped} already present)")
+
+
+def _format_from_path(path: str) -> str:
+    """Pick the import/export format from a file extension."""
+    return 'csv' if path.lower().endswith('.csv') else 'ndjson'
+
+
+def _read_ndjson(f) -> Iterator[Dict[str, Any]]:
+    """Yield one record per non-blank line of an NDJSON stream."""
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise click.ClickException(f"Line {line_no}: invalid JSON ({e.msg})")
+
+
+def _import_sessions_from(records: Iterable[Dict[str, Any]], project_id: Optional[str],
+                          known_ids: Set[str], ids_by_name: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    """Validate imported records and resolve their local project ids."""
+    for record_no, record in enumerate(records, 1):
+        if not record.get('id') or not record.get('start_time'):
+            raise click.ClickException(f"Record {record_no}: 'id' and 'start_time' are required")
+        
+        try:
+            datetime.fromisoformat(record['start_time'])
+            if record.get('end_time'):
+                datetime.fromisoformat(record['end_time'])
+            if record.get('duration') not in (None, ''):
+                int(record['duration'])
+        except (TypeError, ValueError) as e:
+            raise click.ClickException(f"Record {record_no}: {e}")
+        
+        if project_id:
+            record['project_id'] = project_id
+        elif record.get('project_id') not in known_ids and record.get('project_name') in ids_by_name:
+            record['project_id'] = ids_by_name[record['project_name']]
+        
+        if record.get('project_id') not in known_ids:
+            raise click.ClickException(f"Record {record_no}: no known project_id or project_name")
+        
+        yield record
 
 
 def _find_project(db: Database, project_identifier: Optional[str]) -> Optional[str]:
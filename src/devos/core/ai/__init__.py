@@ -2,13 +2,13 @@
 
 from .provider import (
     AIProvider, AIRequest, AIResponse, CodeSuggestion, 
-    AnalysisResult, RequestType, UserPreferences,
+    AnalysisResult, RequestType, UserPreferences, StreamDelta,
     ProjectContext, SessionContext, ai_registry,
     AIServiceError, RateLimitError, ProviderError
 )
 from .openai_provider import OpenAIProvider
 from .groq_provider import GroqProvider
-from .service import AIService, AIServiceConfig, get_ai_service, initialize_ai_service
+from .service import AIService, AIServiceConfig, get_ai_service, initialize_ai_service, run_ai_command
 from .context import ContextBuilder
 from .cache import AICache
 
@@ -30,6 +30,7 @@ __all__ = [
     "AIResponse", 
     "CodeSuggestion",
     "AnalysisResult",
+    "StreamDelta",
     "RequestType",
     "UserPreferences",
     "ProjectContext",
@@ -42,5 +43,6 @@ __all__ = [
     
     # Service functions
     "get_ai_service",
-    "initialize_ai_service"
+    "initialize_ai_service",
+    "run_ai_command"
 ]
@@ -1,138 +1,296 @@
 """AI caching system for DevOS."""
 
-import asyncio
 import json
 import hashlib
 import logging
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
-from .provider import AIRequest, AIResponse
+from .provider import AIRequest, AIResponse, AnalysisResult, CodeSuggestion, RequestType
+from .fingerprint import context_fingerprint, project_identity
 
 
 logger = logging.getLogger(__name__)
 
+CACHE_DB_NAME = "cache.db"
+
+# Run an expiry sweep every this many writes
+SWEEP_INTERVAL = 500
+
+# Bump when the entries table changes; older cache files are recreated
+SCHEMA_VERSION = 3
+
+# Connections inherited across fork(); kept referenced so they are never
+# closed (and their WAL checkpointed) from the child process.
+_inherited_connections: List[sqlite3.Connection] = []
+
+# response holds a typed payload (see encode_result) as JSON compressed with
+# the named codec; size is the stored (compressed) length and raw_size the
+# JSON length. expires_at/stale_until are NULL for entries that never expire
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    cache_key TEXT PRIMARY KEY,
+    response BLOB NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    stale_until REAL,
+    last_accessed REAL NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 1
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_last_accessed ON entries(last_accessed);
+CREATE INDEX IF NOT EXISTS idx_entries_stale_until ON entries(stale_until);
+"""
+
+
+@dataclass(frozen=True)
+class PayloadCodec:
+    """A named pair of functions compressing cache payloads."""
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+PAYLOAD_CODECS: Dict[str, PayloadCodec] = {}
+
+
+def register_codec(codec: PayloadCodec) -> None:
+    """Make a codec available to ``AICache(codec=...)``.
+    
+    The codec name is stored with every entry, so a codec must stay
+    registered while entries written with it remain in the cache.
+    """
+    PAYLOAD_CODECS[codec.name] = codec
+
+
+register_codec(PayloadCodec("none", bytes, bytes))
+register_codec(PayloadCodec("zlib", lambda data: zlib.compress(data, 6), zlib.decompress))
+
+DEFAULT_CODEC = "zlib"
+
+
+@dataclass
+class CachePolicy:
+    """How long entries of one request type stay usable.
+    
+    Entries are fresh for ``ttl`` (``None`` means forever), then may be
+    served stale for ``stale_for`` while a refresh runs, then are dropped.
+    """
+    ttl: Optional[timedelta]
+    stale_for: timedelta = timedelta(0)
+
+
+DEFAULT_POLICY = CachePolicy(ttl=timedelta(hours=24), stale_for=timedelta(hours=12))
+
+# Answers keyed on a code fingerprint stay valid while the code does;
+# chat turns go stale quickly
+DEFAULT_CACHE_POLICIES: Dict[RequestType, CachePolicy] = {
+    RequestType.EXPLAIN: CachePolicy(ttl=None),
+    RequestType.ANALYZE: CachePolicy(ttl=timedelta(days=7), stale_for=timedelta(days=1)),
+    RequestType.REVIEW: CachePolicy(ttl=timedelta(days=7), stale_for=timedelta(days=1)),
+    RequestType.REFACTOR: DEFAULT_POLICY,
+    RequestType.SUGGEST: DEFAULT_POLICY,
+    RequestType.GENERATE: DEFAULT_POLICY,
+    RequestType.DEBUG: DEFAULT_POLICY,
+    RequestType.CHAT: CachePolicy(ttl=timedelta(hours=1)),
+}
+
+
+# Result types the cache can store, by the name recorded in each payload
+CACHEABLE_TYPES = {cls.__name__: cls for cls in (AIResponse, AnalysisResult, CodeSuggestion)}
+
+CachedResult = Union[AIResponse, AnalysisResult, List[CodeSuggestion]]
+
+
+def encode_result(result: CachedResult) -> Dict[str, Any]:
+    """Convert a service result into a JSON-ready payload tagged with its type."""
+    if isinstance(result, list):
+        return {"type": "list", "items": [encode_result(item) for item in result]}
+    
+    type_name = type(result).__name__
+    if CACHEABLE_TYPES.get(type_name) is not type(result):
+        raise TypeError(f"Cannot cache results of type {type_name}")
+    return {"type": type_name, "data": asdict(result)}
+
+
+def decode_result(payload: Dict[str, Any]) -> CachedResult:
+    """Rebuild a service result from a payload made by ``encode_result``."""
+    if payload["type"] == "list":
+        return [decode_result(item) for item in payload["items"]]
+    return CACHEABLE_TYPES[payload["type"]](**payload["data"])
+
+
+def build_cache_policies(ttls: Optional[Dict[str, Optional[int]]] = None,
+                         stale_seconds: Optional[int] = None) -> Dict[RequestType, CachePolicy]:
+    """Build cache policies from per-request-type TTLs in seconds.
+    
+    ``ttls`` maps request type values (``"chat"``, ``"explain"``...) to a
+    TTL in seconds, or ``None`` for never; unlisted types keep their
+    defaults. ``stale_seconds`` overrides every stale window.
+    """
+    policies = dict(DEFAULT_CACHE_POLICIES)
+    
+    for name, seconds in (ttls or {}).items():
+        try:
+            request_type = RequestType(name)
+        except ValueError:
+            logger.warning(f"Ignoring cache TTL for unknown request type: {name}")
+            continue
+        ttl = timedelta(seconds=seconds) if seconds is not None else None
+        policies[request_type] = CachePolicy(ttl=ttl, stale_for=policies[request_type].stale_for)
+    
+    if stale_seconds is not None:
+        policies = {
+            request_type: CachePolicy(ttl=policy.ttl, stale_for=timedelta(seconds=stale_seconds))
+            for request_type, policy in policies.items()
+        }
+    
+    return policies
+
 
 class AICache:
-    """AI response caching system."""
+    """AI response caching system.
     
-    def __init__(self, cache_dir: Optional[Path] = None, max_size_mb: int = 100):
+    Responses are stored in a single SQLite file with indexes on
+    ``last_accessed`` (LRU eviction) and ``stale_until`` (expiry sweeps),
+    fronted by a small in-memory LRU of recently used entries. Expiry
+    follows a ``CachePolicy`` per request type.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_size_mb: int = 100,
+                 max_memory_entries: int = 256,
+                 policies: Optional[Dict[RequestType, CachePolicy]] = None,
+                 codec: str = DEFAULT_CODEC):
+        if codec not in PAYLOAD_CODECS:
+            raise ValueError(f"Unknown cache codec '{codec}' (available: {', '.join(PAYLOAD_CODECS)})")
+        
         self.cache_dir = cache_dir or Path.home() / ".devos" / "cache" / "ai"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / CACHE_DB_NAME
         self.max_size_mb = max_size_mb
-        self._memory_cache: Dict[str, CacheEntry] = {}
-        self._cache_index: Dict[str, CacheIndex] = {}
+        self.max_memory_entries = max_memory_entries
+        self.policies = {**DEFAULT_CACHE_POLICIES, **(policies or {})}
+        self.codec = PAYLOAD_CODECS[codec]
+        self._memory_cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_sweep = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
         
-        # Load existing cache index
-        asyncio.create_task(self._load_cache_index())
+        self._pid = os.getpid()
+        self._connection = self._connect()
+        self._remove_legacy_files()
+        self._total_size = self._read_total_size()
+        self.sweep_expired()
     
-    async def get(self, request: AIRequest) -> Optional[AIResponse]:
-        """Get cached response for request."""
-        cache_key = self._generate_cache_key(request)
-        
-        # Check memory cache first
-        if cache_key in self._memory_cache:
-            entry = self._memory_cache[cache_key]
-            if not self._is_expired(entry):
-                logger.debug(f"Cache hit (memory): {cache_key}")
-                # Mark response as cached
-                cached_response = entry.response
-                cached_response.cached = True
-                return cached_response
-            else:
-                # Remove expired entry
-                del self._memory_cache[cache_key]
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """This process's cache connection.
         
-        # Check disk cache
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            try:
-                data = json.loads(cache_file.read_text())
-                entry = CacheEntry.from_dict(data)
-                
-                if not self._is_expired(entry):
-                    # Load into memory cache
-                    self._memory_cache[cache_key] = entry
-                    logger.debug(f"Cache hit (disk): {cache_key}")
-                    # Mark response as cached
-                    cached_response = entry.response
-                    cached_response.cached = True
-                    return cached_response
-                else:
-                    # Remove expired file
-                    cache_file.unlink()
-                    
-            except Exception as e:
-                logger.warning(f"Failed to load cache entry {cache_key}: {e}")
-                try:
-                    cache_file.unlink()
-                except:
-                    pass
+        After a fork (e.g. in the daemon) the connection inherited from the
+        parent is abandoned without closing it and a new one is opened.
+        """
+        if self._pid != os.getpid():
+            _inherited_connections.append(self._connection)
+            self._pid = os.getpid()
+            self._connection = self._connect()
+            self._total_size = self._read_total_size()
+        return self._connection
+    
+    async def get(self, request: AIRequest) -> Optional[CachedResult]:
+        """Get a fresh cached response for request."""
+        entry = self._lookup(request, allow_stale=False)
+        return entry.response if entry else None
+    
+    async def get_entry(self, request: AIRequest) -> Optional['CacheEntry']:
+        """Get the cached entry for request, fresh or stale.
         
-        return None
+        Callers serving stale entries (``entry.is_fresh()`` false) should
+        refresh them.
+        """
+        return self._lookup(request, allow_stale=True)
     
-    async def set(self, request: AIRequest, response: AIResponse) -> None:
-        """Cache response for request."""
+    async def set(self, request: AIRequest, response: CachedResult, ttl: Optional[timedelta] = None) -> None:
+        """Cache response for request.
+        
+        ``response`` may be an ``AIResponse``, an ``AnalysisResult`` or a list
+        of ``CodeSuggestion``.
+        ``ttl`` overrides the freshness period from the request type's policy.
+        """
         cache_key = self._generate_cache_key(request)
+        now = datetime.now()
+        policy = self.policies.get(request.request_type, DEFAULT_POLICY)
+        ttl = ttl if ttl is not None else policy.ttl
+        expires_at = now + ttl if ttl is not None else None
         
         # Create cache entry
         entry = CacheEntry(
             request_hash=cache_key,
             response=response,
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(hours=24),
+            created_at=now,
+            expires_at=expires_at,
+            stale_until=expires_at + policy.stale_for if expires_at is not None else None,
             access_count=1,
-            last_accessed=datetime.now()
+            last_accessed=now
         )
         
-        # Store in memory cache
-        self._memory_cache[cache_key] = entry
-        
-        # Store on disk
-        await self._save_to_disk(cache_key, entry)
-        
-        # Update cache index
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        self._cache_index[cache_key] = CacheIndex(
-            cache_key=cache_key,
-            file_size=cache_file.stat().st_size if cache_file.exists() else 0,
-            created_at=entry.created_at,
-            last_accessed=entry.last_accessed,
-            access_count=1
-        )
+        try:
+            payload = json.dumps(encode_result(response), default=str).encode()
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Failed to serialize cache entry {cache_key}: {e}")
+            return
         
-        # Check cache size limit
-        await self._enforce_size_limit()
+        with self._lock:
+            self._store(entry, payload)
+            self._remember(entry)
+            
+            self._writes_since_sweep += 1
+            if self._writes_since_sweep >= SWEEP_INTERVAL:
+                self._sweep_expired()
+            
+            # Check cache size limit
+            self._enforce_size_limit()
         
         logger.debug(f"Cached response: {cache_key}")
     
     async def clear(self) -> None:
         """Clear all cache entries."""
-        # Clear memory cache
-        self._memory_cache.clear()
-        
-        # Clear disk cache
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                cache_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to delete cache file {cache_file}: {e}")
-        
-        # Clear index
-        self._cache_index.clear()
+        with self._lock:
+            self._memory_cache.clear()
+            with self._conn:
+                self._conn.execute("DELETE FROM entries")
+            self._total_size = 0
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         
         logger.info("AI cache cleared")
     
+    def sweep_expired(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        with self._lock:
+            return self._sweep_expired()
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total_entries = len(self._cache_index)
-        memory_entries = len(self._memory_cache)
-        total_size = sum(index.file_size for index in self._cache_index.values())
+        with self._lock:
+            total_entries, total_accesses, raw_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(access_count), 0), COALESCE(SUM(raw_size), 0) FROM entries"
+            ).fetchone()
+            memory_entries = len(self._memory_cache)
+            total_size = self._total_size
         
-        # Calculate hit rate (simplified)
-        total_accesses = sum(index.access_count for index in self._cache_index.values())
+        served = self._hits + self._stale_hits
+        lookups = served + self._misses
         
         return {
             "total_entries": total_entries,
@@ -140,121 +298,298 @@ class AICache:
             "disk_entries": total_entries - memory_entries,
             "total_size_bytes": total_size,
             "total_size_mb": total_size / (1024 * 1024),
+            "uncompressed_size_bytes": raw_size,
+            "compression_ratio": raw_size / total_size if total_size else 1.0,
+            "codec": self.codec.name,
+            "file_size_bytes": sum(
+                path.stat().st_size
+                for path in self.cache_dir.glob(f"{CACHE_DB_NAME}*")
+            ),
             "max_size_mb": self.max_size_mb,
             "total_accesses": total_accesses,
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "hit_rate": served / lookups if lookups else 0.0,
             "cache_dir": str(self.cache_dir)
         }
     
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            if self._pid == os.getpid():
+                self._connection.close()
+    
     def _generate_cache_key(self, request: AIRequest) -> str:
         """Generate cache key for request."""
-        # Create a normalized representation of the request
-        request_data = {
-            "query": request.query.strip().lower(),
-            "request_type": request.request_type.value,
-            "project_path": str(request.context.project_path),
-            "language": request.context.language,
-            "framework": request.context.framework,
-            "model": request.user_preferences.ai_model,
-            "temperature": request.user_preferences.temperature
-        }
-        
-        # Create hash
-        request_str = json.dumps(request_data, sort_keys=True)
-        return hashlib.sha256(request_str.encode()).hexdigest()[:16]
+        return request_cache_key(request)
     
-    def _is_expired(self, entry: 'CacheEntry') -> bool:
-        """Check if cache entry is expired."""
-        return datetime.now() > entry.expires_at
+    def _lookup(self, request: AIRequest, allow_stale: bool) -> Optional['CacheEntry']:
+        """Find a usable entry, updating its access stats on a hit."""
+        cache_key = self._generate_cache_key(request)
+        now = datetime.now()
+        
+        with self._lock:
+            # Check memory cache first
+            entry = self._memory_cache.get(cache_key)
+            if entry is not None:
+                self._memory_cache.move_to_end(cache_key)
+                source = "memory"
+            else:
+                entry = self._load_entry(cache_key)
+                source = "disk"
+            
+            if entry is None:
+                self._misses += 1
+                return None
+            
+            if entry.is_dead(now):
+                self._delete_keys([cache_key])
+                self._misses += 1
+                return None
+            
+            fresh = entry.is_fresh(now)
+            if not fresh and not allow_stale:
+                self._misses += 1
+                return None
+            
+            entry.access_count += 1
+            entry.last_accessed = now
+            self._conn.execute(
+                "UPDATE entries SET access_count = access_count + 1, last_accessed = ? WHERE cache_key = ?",
+                (now.timestamp(), cache_key)
+            )
+            self._remember(entry)
+            if fresh:
+                self._hits += 1
+            else:
+                self._stale_hits += 1
+        
+        logger.debug(f"Cache hit ({source}{'' if fresh else ', stale'}): {cache_key}")
+        # Mark response as cached
+        if isinstance(entry.response, AIResponse):
+            entry.response.cached = True
+        return entry
     
-    async def _save_to_disk(self, cache_key: str, entry: 'CacheEntry') -> None:
-        """Save cache entry to disk."""
-        try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            data = entry.to_dict()
-            cache_file.write_text(json.dumps(data, indent=2, default=str))
-        except Exception as e:
-            logger.warning(f"Failed to save cache entry {cache_key}: {e}")
+    def _read_total_size(self) -> int:
+        """Sum the stored size of every entry."""
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
     
-    async def _load_cache_index(self) -> None:
-        """Load cache index from disk."""
-        index_file = self.cache_dir / "index.json"
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database, creating the schema if needed."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Keep the WAL from staying at its high-water mark after checkpoints
+        conn.execute("PRAGMA journal_size_limit = 4194304")
         
-        if index_file.exists():
+        # Cached data is disposable, so an old layout is simply dropped
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
+        conn.executescript(_SCHEMA)
+        return conn
+    
+    def _remove_legacy_files(self) -> None:
+        """Remove per-entry JSON files left by the old file-based cache."""
+        for cache_file in self.cache_dir.glob("*.json"):
             try:
-                data = json.loads(index_file.read_text())
-                for cache_key, index_data in data.items():
-                    self._cache_index[cache_key] = CacheIndex.from_dict(index_data)
-                logger.info(f"Loaded {len(self._cache_index)} cache index entries")
-            except Exception as e:
-                logger.warning(f"Failed to load cache index: {e}")
-    
-    async def _save_cache_index(self) -> None:
-        """Save cache index to disk."""
+                cache_file.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to delete legacy cache file {cache_file}: {e}")
+    
+    def _load_entry(self, cache_key: str) -> Optional['CacheEntry']:
+        """Load an entry from the database."""
+        row = self._conn.execute(
+            "SELECT response, codec, created_at, expires_at, stale_until, last_accessed, access_count "
+            "FROM entries WHERE cache_key = ?",
+            (cache_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
         try:
-            index_file = self.cache_dir / "index.json"
-            data = {key: index.to_dict() for key, index in self._cache_index.items()}
-            index_file.write_text(json.dumps(data, indent=2, default=str))
+            payload = PAYLOAD_CODECS[row[1]].decompress(row[0])
+            response = decode_result(json.loads(payload))
         except Exception as e:
-            logger.warning(f"Failed to save cache index: {e}")
+            logger.warning(f"Failed to load cache entry {cache_key}: {e}")
+            self._delete_keys([cache_key])
+            return None
+        
+        return CacheEntry(
+            request_hash=cache_key,
+            response=response,
+            created_at=datetime.fromtimestamp(row[2]),
+            expires_at=_from_timestamp(row[3]),
+            stale_until=_from_timestamp(row[4]),
+            access_count=row[6],
+            last_accessed=datetime.fromtimestamp(row[5])
+        )
+    
+    def _store(self, entry: 'CacheEntry', payload: bytes) -> None:
+        """Compress and insert or replace an entry, keeping the running size total.
+        
+        Payloads that do not shrink are stored uncompressed.
+        """
+        codec = self.codec
+        data = codec.compress(payload)
+        if len(data) >= len(payload):
+            codec, data = PAYLOAD_CODECS["none"], payload
+        size = len(data)
+        
+        with self._conn:
+            old = self._conn.execute(
+                "SELECT size FROM entries WHERE cache_key = ?", (entry.request_hash,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(cache_key, response, codec, size, raw_size, created_at, expires_at, stale_until, "
+                "last_accessed, access_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.request_hash, data, codec.name, size, len(payload), entry.created_at.timestamp(),
+                 _to_timestamp(entry.expires_at), _to_timestamp(entry.stale_until),
+                 entry.last_accessed.timestamp(), entry.access_count)
+            )
+        self._total_size += size - (old[0] if old else 0)
+    
+    def _remember(self, entry: 'CacheEntry') -> None:
+        """Put an entry in the bounded memory tier."""
+        self._memory_cache[entry.request_hash] = entry
+        self._memory_cache.move_to_end(entry.request_hash)
+        while len(self._memory_cache) > self.max_memory_entries:
+            self._memory_cache.popitem(last=False)
     
-    async def _enforce_size_limit(self) -> None:
-        """Enforce cache size limit by removing old entries."""
-        total_size = sum(index.file_size for index in self._cache_index.values())
+    def _delete_keys(self, cache_keys: List[str]) -> int:
+        """Delete entries by key; returns the number of bytes freed."""
+        for cache_key in cache_keys:
+            self._memory_cache.pop(cache_key, None)
+        
+        freed = 0
+        with self._conn:
+            for cache_key in cache_keys:
+                row = self._conn.execute(
+                    "SELECT size FROM entries WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row:
+                    self._conn.execute("DELETE FROM entries WHERE cache_key = ?", (cache_key,))
+                    freed += row[0]
+        self._total_size -= freed
+        return freed
+    
+    def _sweep_expired(self) -> int:
+        """Delete entries past their stale window using the stale_until index."""
+        self._writes_since_sweep = 0
+        now = datetime.now()
+        with self._conn:
+            freed, removed = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries WHERE stale_until < ?",
+                (now.timestamp(),)
+            ).fetchone()
+            if not removed:
+                return 0
+            self._conn.execute("DELETE FROM entries WHERE stale_until < ?", (now.timestamp(),))
+        
+        self._total_size -= freed
+        expired = [key for key, entry in self._memory_cache.items() if entry.is_dead(now)]
+        for cache_key in expired:
+            del self._memory_cache[cache_key]
+        
+        logger.info(f"Removed {removed} expired cache entries")
+        return removed
+    
+    def _enforce_size_limit(self) -> None:
+        """Enforce cache size limit by evicting least recently used entries."""
         max_size_bytes = self.max_size_mb * 1024 * 1024
         
-        if total_size <= max_size_bytes:
+        if self._total_size <= max_size_bytes:
             return
         
-        # Sort entries by last accessed time (LRU)
-        sorted_entries = sorted(
-            self._cache_index.items(),
-            key=lambda x: x[1].last_accessed
+        # Walk the last_accessed index oldest-first until 20% headroom is freed
+        target = max_size_bytes * 0.8
+        cursor = self._conn.execute(
+            "SELECT cache_key, size FROM entries ORDER BY last_accessed"
         )
-        
-        # Remove oldest entries until under limit
-        removed = 0
-        for cache_key, index in sorted_entries:
-            if total_size <= max_size_bytes * 0.8:  # Leave 20% headroom
+        victims = []
+        remaining = self._total_size
+        for cache_key, size in cursor:
+            if remaining <= target:
                 break
-            
-            # Remove from memory cache
-            if cache_key in self._memory_cache:
-                del self._memory_cache[cache_key]
-            
-            # Remove from disk
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            try:
-                cache_file.unlink()
-                total_size -= index.file_size
-                removed += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete cache file {cache_file}: {e}")
-            
-            # Remove from index
-            del self._cache_index[cache_key]
+            victims.append(cache_key)
+            remaining -= size
+        cursor.close()
         
-        if removed > 0:
-            logger.info(f"Removed {removed} old cache entries to enforce size limit")
-            await self._save_cache_index()
+        if victims:
+            self._delete_keys(victims)
+            logger.info(f"Removed {len(victims)} old cache entries to enforce size limit")
+
+
+def request_cache_key(request: AIRequest) -> str:
+    """Generate the cache key for a request."""
+    # Create a normalized representation of the request, keyed on the
+    # repository (not where it is checked out) and on content fingerprints
+    request_data = {
+        "query": request.query.strip().lower(),
+        "request_type": request.request_type.value,
+        "provider": request.metadata.get("provider"),
+        "project": project_identity(request.context.project_path),
+        "code": request.metadata.get("code_fingerprint"),
+        "worktree": request.metadata.get("worktree_fingerprint"),
+        "conversation": request.metadata.get("conversation_fingerprint"),
+        "context": context_fingerprint(request),
+        "language": request.context.language,
+        "framework": request.context.framework,
+        "model": request.user_preferences.ai_model,
+        "temperature": request.user_preferences.temperature
+    }
+    
+    # Create hash
+    request_str = json.dumps(request_data, sort_keys=True)
+    return hashlib.sha256(request_str.encode()).hexdigest()[:32]
+
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert an optional datetime to an epoch timestamp."""
+    return value.timestamp() if value is not None else None
+
+
+def _from_timestamp(value: Optional[float]) -> Optional[datetime]:
+    """Convert an optional epoch timestamp to a datetime."""
+    return datetime.fromtimestamp(value) if value is not None else None
 
 
 @dataclass
 class CacheEntry:
-    """Cache entry containing request and response."""
+    """Cache entry containing request and response (or structured result).
+    
+    ``expires_at`` ends freshness and ``stale_until`` ends usability;
+    ``None`` means never.
+    """
     request_hash: str
-    response: AIResponse
+    response: CachedResult
     created_at: datetime
-    expires_at: datetime
+    expires_at: Optional[datetime]
     access_count: int
     last_accessed: datetime
+    stale_until: Optional[datetime] = None
+    
+    def is_fresh(self, now: Optional[datetime] = None) -> bool:
+        """Check if the entry can be served without a refresh."""
+        return self.expires_at is None or (now or datetime.now()) <= self.expires_at
+    
+    def is_dead(self, now: Optional[datetime] = None) -> bool:
+        """Check if the entry is past its stale window."""
+        stale_until = self.stale_until or self.expires_at
+        return stale_until is not None and (now or datetime.now()) > stale_until
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
             "request_hash": self.request_hash,
-            "response": asdict(self.response),
+            "response": encode_result(self.response),
             "created_at": self.created_at.isoformat(),
-            "expires_at": self.expires_at.isoformat(),
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "stale_until": self.stale_until.isoformat() if self.stale_until else None,
             "access_count": self.access_count,
             "last_accessed": self.last_accessed.isoformat()
         }
@@ -262,45 +597,14 @@ class CacheEntry:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CacheEntry':
         """Create from dictionary."""
-        response_data = data["response"]
-        response = AIResponse(**response_data)
+        response = decode_result(data["response"])
         
         return cls(
             request_hash=data["request_hash"],
             response=response,
             created_at=datetime.fromisoformat(data["created_at"]),
-            expires_at=datetime.fromisoformat(data["expires_at"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]) if data.get("expires_at") else None,
             access_count=data["access_count"],
-            last_accessed=datetime.fromisoformat(data["last_accessed"])
-        )
-
-
-@dataclass
-class CacheIndex:
-    """Cache index entry for metadata."""
-    cache_key: str
-    file_size: int
-    created_at: datetime
-    last_accessed: datetime
-    access_count: int
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "cache_key": self.cache_key,
-            "file_size": self.file_size,
-            "created_at": self.created_at.isoformat(),
-            "last_accessed": self.last_accessed.isoformat(),
-            "access_count": self.access_count
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'CacheIndex':
-        """Create from dictionary."""
-        return cls(
-            cache_key=data["cache_key"],
-            file_size=data["file_size"],
-            created_at=datetime.fromisoformat(data["created_at"]),
             last_accessed=datetime.fromisoformat(data["last_accessed"]),
-            access_count=data["access_count"]
+            stale_until=datetime.fromisoformat(data["stale_until"]) if data.get("stale_until") else None
         )
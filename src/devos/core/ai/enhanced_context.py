@@ -15,10 +15,16 @@ import re
 from collections import defaultdict, Counter
 
 from devos.core.ai.context import ContextBuilder, ProjectContext
+from devos.core.ai.fingerprint import MANIFEST_FILES
 from devos.core.ai.provider import AIServiceError
 
 logger = logging.getLogger(__name__)
 
+# Enhanced contexts built in this process, keyed by project path. Each entry
+# stores the fingerprint of the source and manifest files it was built from
+# so stale entries are rebuilt.
+_context_memo: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], 'EnhancedProjectContext']] = {}
+
 
 @dataclass
 class FileAnalysis:
@@ -150,13 +156,27 @@ class EnhancedContextBuilder:
     
     async def build_enhanced_context(self, project_path: Path) -> EnhancedProjectContext:
         """Build comprehensive enhanced project context."""
+        # Reuse a context built earlier in this process (e.g. warmed by the
+        # daemon) as long as no source or manifest file was added, removed
+        # or modified
+        project_files = self._collect_project_files(project_path)
+        fingerprint = self._fingerprint_files(
+            project_path, project_files + [project_path / name for name in MANIFEST_FILES]
+        )
+        memo_key = str(project_path.resolve())
+        
+        memoized = _context_memo.get(memo_key)
+        if memoized and memoized[0] == fingerprint:
+            logger.debug(f"Reusing enhanced context for {project_path}")
+            return memoized[1]
+        
         logger.info(f"Building enhanced context for {project_path}")
         
         # Get base context
         base_context = await self.base_builder.build_project_context(project_path)
         
         # Analyze all files
-        file_analysis = await self._analyze_all_files(project_path)
+        file_analysis = await self._analyze_all_files(project_path, project_files)
         
         # Build architecture analysis
         architecture = await self._analyze_architecture(file_analysis, project_path)
@@ -175,7 +195,7 @@ class EnhancedContextBuilder:
             architecture, security_issues, code_smells, performance_issues
         )
         
-        return EnhancedProjectContext(
+        context = EnhancedProjectContext(
             base_context=base_context,
             file_analysis=file_analysis,
             architecture=architecture,
@@ -185,11 +205,12 @@ class EnhancedContextBuilder:
             recommendations=recommendations,
             analysis_timestamp=datetime.now().isoformat()
         )
-    
-    async def _analyze_all_files(self, project_path: Path) -> Dict[str, FileAnalysis]:
-        """Analyze all files in the project."""
-        file_analysis = {}
         
+        _context_memo[memo_key] = (fingerprint, context)
+        return context
+    
+    def _collect_project_files(self, project_path: Path) -> List[Path]:
+        """Collect the source files that take part in the analysis."""
         # Get all relevant files
         file_patterns = ['**/*.py', '**/*.js', '**/*.ts', '**/*.jsx', '**/*.tsx', 
                         '**/*.java', '**/*.cpp', '**/*.c', '**/*.go', '**/*.rs']
@@ -208,6 +229,24 @@ class EnhancedContextBuilder:
             and f.stat().st_size < 1024 * 1024  # < 1MB
         ]
         
+        return filtered_files
+    
+    def _fingerprint_files(self, project_path: Path, files: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+        """Build a cheap stat-based fingerprint of the analyzed files."""
+        entries = []
+        for file_path in files:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            entries.append((str(file_path.relative_to(project_path)), stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+    
+    async def _analyze_all_files(self, project_path: Path, files: Optional[List[Path]] = None) -> Dict[str, FileAnalysis]:
+        """Analyze all files in the project."""
+        file_analysis = {}
+        filtered_files = files if files is not None else self._collect_project_files(project_path)
+        
         logger.info(f"Analyzing {len(filtered_files)} files")
         
         # Analyze files concurrently
@@ -0,0 +1,214 @@
+"""Content fingerprints for AI cache keys.
+
+Keys are built from what the model actually sees (code payloads, manifest
+and session files, or the working tree for requests without a code
+payload) and from a repository identity that does not depend on
+where the checkout lives, so worktrees and CI runners share cache hits.
+Projects outside git are keyed by their absolute path instead.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .provider import AIRequest
+
+
+logger = logging.getLogger(__name__)
+
+# Files whose contents shape the project context sent to providers
+MANIFEST_FILES = (
+    'package.json', 'requirements.txt', 'pyproject.toml',
+    'Cargo.toml', 'go.mod', 'pom.xml'
+)
+
+# Directories skipped when fingerprinting a working tree outside git
+EXCLUDED_DIRS = {
+    '.git', '__pycache__', 'node_modules', '.vscode', '.idea',
+    'build', 'dist', 'target', 'venv', 'env', '.venv'
+}
+
+# File digests keyed by path, reused while (mtime, size) stays the same
+_file_digests: Dict[Path, Tuple[int, int, str]] = {}
+
+
+def fingerprint_content(content: str) -> str:
+    """Hash a code payload."""
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def fingerprint_file(path: Path) -> Optional[str]:
+    """Hash a file's contents, or None if it cannot be read."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    
+    cached = _file_digests.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    
+    try:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+    
+    _file_digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def find_repo_root(path: Path) -> Optional[Path]:
+    """Find the enclosing git checkout (a .git directory or worktree file)."""
+    path = path.resolve()
+    for candidate in (path, *path.parents):
+        if (candidate / '.git').exists():
+            return candidate
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def repo_identity(repo_root: Path) -> str:
+    """Identify a repository by its root commit(s), falling back to its path.
+    
+    Every clone and worktree of a repository shares its root commits, so
+    this is stable across machines and checkout locations. Without them the
+    identity is tied to the checkout's absolute path, since directory names
+    like ``app`` are shared by unrelated projects.
+    """
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(repo_root), 'rev-list', '--max-parents=0', 'HEAD'],
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Could not read root commit for {repo_root}: {e}")
+        return _path_identity(repo_root)
+    
+    roots = sorted(result.stdout.split())
+    if result.returncode != 0 or not roots:
+        return _path_identity(repo_root)
+    return 'git:' + ','.join(roots)
+
+
+def _path_identity(path: Path) -> str:
+    """Identify a directory that has no repository identity by its location."""
+    return 'path:' + path.resolve().as_posix()
+
+
+def project_identity(project_path: Path) -> Dict[str, str]:
+    """Describe a project by repository identity and repo-relative path."""
+    project_path = Path(project_path).resolve()
+    repo_root = find_repo_root(project_path)
+    if repo_root is None:
+        return {"repo": _path_identity(project_path), "path": "."}
+    
+    return {
+        "repo": repo_identity(repo_root),
+        "path": project_path.relative_to(repo_root).as_posix()
+    }
+
+
+def worktree_fingerprint(project_path: Path) -> str:
+    """Hash the state of a project's working tree.
+    
+    In git this is HEAD plus the contents of every changed or untracked
+    file under the project, so clean checkouts of one commit match
+    wherever they live. Outside git it falls back to file sizes and
+    modification times.
+    """
+    project_path = Path(project_path).resolve()
+    repo_root = find_repo_root(project_path)
+    if repo_root is not None:
+        fingerprint = _git_worktree_fingerprint(repo_root, project_path)
+        if fingerprint is not None:
+            return fingerprint
+    return _stat_worktree_fingerprint(project_path)
+
+
+def _git_worktree_fingerprint(repo_root: Path, project_path: Path) -> Optional[str]:
+    """Hash HEAD and the dirty files under project_path, or None if git fails."""
+    try:
+        head = subprocess.run(
+            ['git', '-C', str(repo_root), 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, timeout=5
+        )
+        status = subprocess.run(
+            ['git', '-C', str(project_path), 'status', '--porcelain', '-z',
+             '--untracked-files=all', '--no-renames', '--', '.'],
+            capture_output=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Could not read git status for {project_path}: {e}")
+        return None
+    
+    if head.returncode != 0 or status.returncode != 0:
+        return None
+    
+    digest = hashlib.sha256(f"head\0{head.stdout.strip()}\n".encode())
+    # Entries are "XY path", paths relative to the repository root
+    for entry in sorted(filter(None, status.stdout.split(b'\0'))):
+        path = entry[3:].decode('utf-8', 'surrogateescape')
+        file_digest = fingerprint_file(repo_root / path) or 'missing'
+        digest.update(f"{entry[:2].decode()}\0{path}\0{file_digest}\n".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def _stat_worktree_fingerprint(project_path: Path) -> str:
+    """Hash the relative path, size and mtime of every file under project_path."""
+    entries = []
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        for name in files:
+            path = Path(root) / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append(f"{path.relative_to(project_path).as_posix()}\0{stat.st_mtime_ns}\0{stat.st_size}\n")
+    
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(entry.encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def context_fingerprint(request: AIRequest) -> str:
+    """Hash the context files behind a request.
+    
+    Covers the project's dependency manifests and the session's current and
+    recent files, each named relative to the project so identical checkouts
+    produce identical fingerprints.
+    """
+    project_path = Path(request.context.project_path).resolve()
+    files = [project_path / name for name in MANIFEST_FILES]
+    
+    session = request.session_context
+    if session is not None:
+        if session.current_file:
+            files.append(Path(session.current_file))
+        files.extend(Path(path) for path in session.recent_files)
+    
+    digest = hashlib.sha256()
+    for name, file_digest in _file_digest_pairs(project_path, files):
+        digest.update(f"{name}\0{file_digest}\n".encode())
+    return digest.hexdigest()
+
+
+def _file_digest_pairs(project_path: Path, files: Iterable[Path]) -> Iterable[Tuple[str, str]]:
+    """Yield (relative name, digest) for each readable file, in a stable order."""
+    pairs = {}
+    for path in files:
+        path = path if path.is_absolute() else project_path / path
+        file_digest = fingerprint_file(path)
+        if file_digest is None:
+            continue
+        try:
+            name = path.resolve().relative_to(project_path).as_posix()
+        except ValueError:
+            name = path.name
+        pairs[name] = file_digest
+    return sorted(pairs.items())
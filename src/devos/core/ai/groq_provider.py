@@ -3,7 +3,7 @@
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncGenerator
 from pathlib import Path
 
 try:
@@ -14,9 +14,10 @@ except ImportError:
 
 from .provider import (
     AIProvider, AIRequest, AIResponse, CodeSuggestion, 
-    AnalysisResult, RequestType, AIServiceError, 
+    AnalysisResult, RequestType, StreamDelta, AIServiceError, 
     AuthenticationError, QuotaExceededError, ProviderError
 )
+from .http_pool import get_sdk_client
 
 
 logger = logging.getLogger(__name__)
@@ -31,7 +32,7 @@ class GroqProvider(AIProvider):
         if not GROQ_AVAILABLE:
             raise AIServiceError("Groq package not installed. Install with: pip install groq")
         
-        self.client = AsyncGroq(api_key=api_key)
+        self._api_key = api_key
         self._usage_stats = {
             "requests": 0,
             "tokens_used": 0,
@@ -39,20 +40,20 @@ class GroqProvider(AIProvider):
             "errors": 0
         }
     
+    @property
+    def client(self) -> "AsyncGroq":
+        """SDK client on the shared connection pool of the running event loop."""
+        return get_sdk_client(AsyncGroq, api_key=self._api_key)
+    
     async def generate_code(self, request: AIRequest) -> AIResponse:
         """Generate code based on request."""
         try:
             if not await self._check_rate_limit():
                 raise AIServiceError("Rate limit exceeded")
             
-            prompt = self._build_code_generation_prompt(request)
-            
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt(request)},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_generation_messages(request),
                 temperature=request.user_preferences.temperature,
                 max_tokens=request.user_preferences.max_tokens
             )
@@ -139,14 +140,9 @@ class GroqProvider(AIProvider):
     async def chat_response(self, conversation: List[Dict[str, str]], request: AIRequest) -> AIResponse:
         """Generate chat response."""
         try:
-            messages = [
-                {"role": "system", "content": self._get_chat_system_prompt(request)}
-            ]
-            messages.extend(conversation)
-            
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=self._build_chat_messages(conversation, request),
                 temperature=request.user_preferences.temperature,
                 max_tokens=request.user_preferences.max_tokens
             )
@@ -241,10 +237,85 @@ class GroqProvider(AIProvider):
             self._handle_error(e)
             raise
     
+    async def stream_generate_code(self, request: AIRequest) -> AsyncGenerator[StreamDelta, None]:
+        """Generate code, streaming tokens as they arrive."""
+        if not await self._check_rate_limit():
+            raise AIServiceError("Rate limit exceeded")
+        
+        async for delta in self._stream_completion(
+            self._build_generation_messages(request),
+            request,
+            confidence=0.8,
+            metadata={"model": self.model, "request_type": "generate"}
+        ):
+            yield delta
+    
+    async def stream_chat_response(
+        self, conversation: List[Dict[str, str]], request: AIRequest
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Generate chat response, streaming tokens as they arrive."""
+        if not await self._check_rate_limit():
+            raise AIServiceError("Rate limit exceeded")
+        
+        async for delta in self._stream_completion(
+            self._build_chat_messages(conversation, request),
+            request,
+            confidence=0.9,
+            metadata={"model": self.model, "conversation_length": len(conversation)}
+        ):
+            yield delta
+    
     async def get_usage_stats(self) -> Dict[str, Any]:
         """Get provider usage statistics."""
         return self._usage_stats.copy()
     
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        request: AIRequest,
+        confidence: float,
+        metadata: Dict[str, Any]
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Stream a chat completion; the last delta carries the assembled response."""
+        parts = []
+        usage = None
+        
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=request.user_preferences.temperature,
+                max_tokens=request.user_preferences.max_tokens,
+                stream=True,
+            )
+            
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text = chunk.choices[0].delta.content
+                    parts.append(text)
+                    yield StreamDelta(content=text)
+                # Groq reports usage on the final chunk, under x_groq on older APIs
+                x_groq = getattr(chunk, "x_groq", None)
+                usage = getattr(chunk, "usage", None) or getattr(x_groq, "usage", None) or usage
+                
+        except Exception as e:
+            self._handle_error(e)
+            raise
+        
+        tokens_used = usage.total_tokens if usage else 0
+        cost = self._calculate_cost(tokens_used)
+        self._update_usage_stats(tokens_used, cost)
+        
+        yield StreamDelta(content="", response=AIResponse(
+            content="".join(parts),
+            confidence=confidence,
+            tokens_used=tokens_used,
+            cost=cost,
+            cached=False,
+            metadata={**metadata, "streamed": True},
+            provider=self.name
+        ))
+    
     def _get_system_prompt(self, request: AIRequest) -> str:
         """Get system prompt based on request context."""
         context_info = []
@@ -287,6 +358,21 @@ Current Project:
 You have access to the project context and can provide specific, actionable advice.
 Be helpful, concise, and focus on practical solutions. Groq's speed allows for quick, iterative development."""
     
+    def _build_generation_messages(self, request: AIRequest) -> List[Dict[str, str]]:
+        """Build the messages for a code generation request."""
+        return [
+            {"role": "system", "content": self._get_system_prompt(request)},
+            {"role": "user", "content": self._build_code_generation_prompt(request)}
+        ]
+    
+    def _build_chat_messages(self, conversation: List[Dict[str, str]], request: AIRequest) -> List[Dict[str, str]]:
+        """Build the messages for a chat request."""
+        messages = [
+            {"role": "system", "content": self._get_chat_system_prompt(request)}
+        ]
+        messages.extend(conversation)
+        return messages
+    
     def _build_code_generation_prompt(self, request: AIRequest) -> str:
         """Build prompt for code generation."""
         prompt = f"""Generate code for the following request:
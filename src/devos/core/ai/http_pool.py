@@ -0,0 +1,110 @@
+"""Shared HTTP connection pools for AI providers.
+
+httpx clients are tied to the event loop their connections were opened on,
+so each running loop gets one pooled client shared by every provider. It
+is closed when the loop shuts down (``asyncio.run`` cancels the pool's
+keeper task on exit), or explicitly with ``close_http_clients()``.
+"""
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HTTPPoolSettings:
+    """Connection pool limits for provider HTTP clients."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+
+
+_settings = HTTPPoolSettings()
+
+
+class _LoopPool:
+    """The shared HTTP client of one event loop and the SDK clients built on it."""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_settings.max_connections,
+                max_keepalive_connections=_settings.max_keepalive_connections,
+                keepalive_expiry=_settings.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(None, connect=_settings.connect_timeout)
+        )
+        self.sdk_clients: Dict[Tuple[Any, ...], Any] = {}
+        self._keeper = loop.create_task(self._close_on_shutdown())
+    
+    async def _close_on_shutdown(self) -> None:
+        """Wait until cancelled at loop shutdown, then close the pool."""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        self.sdk_clients.clear()
+        if not self.http_client.is_closed:
+            await self.http_client.aclose()
+            logger.debug("Closed shared AI HTTP client")
+
+
+_pools: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool]' = weakref.WeakKeyDictionary()
+
+
+def configure_http_pool(**settings: Any) -> None:
+    """Set pool limits for clients created from now on (see ``HTTPPoolSettings``)."""
+    for name, value in settings.items():
+        if not hasattr(_settings, name):
+            raise ValueError(f"Unknown HTTP pool setting: {name}")
+        if value is not None:
+            setattr(_settings, name, value)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the pooled HTTP client of the running event loop."""
+    return _get_pool().http_client
+
+
+def get_sdk_client(client_class: type, **options: Any) -> Any:
+    """Get an SDK client (e.g. ``AsyncGroq``) that uses the shared pool.
+    
+    Clients are reused per event loop for the same class and options.
+    """
+    pool = _get_pool()
+    key = (client_class, *sorted(options.items()))
+    client = pool.sdk_clients.get(key)
+    if client is None:
+        client = client_class(**options, http_client=pool.http_client)
+        pool.sdk_clients[key] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the running loop's pool now instead of at loop shutdown."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.pop(loop, None)
+    if pool is not None:
+        pool._keeper.cancel()
+        await pool.aclose()
+
+
+def _get_pool() -> _LoopPool:
+    """Get or create the pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None or pool.http_client.is_closed:
+        pool = _LoopPool(loop)
+        _pools[loop] = pool
+    return pool
@@ -75,6 +75,17 @@ class AIResponse:
     provider: str
 
 
+@dataclass
+class StreamDelta:
+    """A piece of a streamed response.
+    
+    The last delta of a stream carries the assembled ``response`` (with
+    token usage and cost); earlier deltas only carry ``content``.
+    """
+    content: str
+    response: Optional[AIResponse] = None
+
+
 @dataclass
 class CodeSuggestion:
     """Code suggestion from AI."""
@@ -162,6 +173,29 @@ class AIProvider(ABC):
         """Get provider usage statistics."""
         pass
     
+    async def stream_generate_code(
+        self, 
+        request: AIRequest
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Generate code, yielding the response as it is produced.
+        
+        Providers without streaming support yield the whole response at once.
+        """
+        response = await self.generate_code(request)
+        yield StreamDelta(content=response.content, response=response)
+    
+    async def stream_chat_response(
+        self, 
+        conversation: List[Dict[str, str]], 
+        request: AIRequest
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Generate a chat response, yielding it as it is produced.
+        
+        Providers without streaming support yield the whole response at once.
+        """
+        response = await self.chat_response(conversation, request)
+        yield StreamDelta(content=response.content, response=response)
+    
     async def _check_rate_limit(self) -> bool:
         """Check if request is within rate limits."""
         return await self._rate_limiter.check_limit()
@@ -1,22 +1,29 @@
 """Main AI service integration."""
 
 import asyncio
+import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Union, AsyncGenerator, Awaitable, Callable, TypeVar
+from dataclasses import dataclass, field
 
 from .provider import (
     AIProvider, AIRequest, AIResponse, CodeSuggestion, 
-    AnalysisResult, RequestType, UserPreferences, 
+    AnalysisResult, RequestType, UserPreferences, StreamDelta,
     ai_registry, AIServiceError
 )
 from .context import ContextBuilder, ProjectContext, SessionContext
-from .cache import AICache
+from .cache import AICache, build_cache_policies, request_cache_key
+from .fingerprint import fingerprint_content, worktree_fingerprint
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Seconds run_ai_command() waits for background cache refreshes at exit
+REFRESH_DRAIN_TIMEOUT = 10.0
+
 
 @dataclass
 class AIServiceConfig:
@@ -24,6 +31,13 @@ class AIServiceConfig:
     default_provider: str = "openai"
     default_model: str = "gpt-4"
     cache_enabled: bool = True
+    # Per request type TTLs in seconds (None = never expire), e.g. {"chat": 600}
+    cache_ttls: Dict[str, Optional[int]] = field(default_factory=dict)
+    # Overrides how long expired entries may still be served while refreshing
+    cache_stale_seconds: Optional[int] = None
+    stale_while_revalidate: bool = True
+    # Compression for cached payloads ("zlib", "none" or a registered codec)
+    cache_codec: str = "zlib"
     max_context_size: int = 100000
     rate_limit_per_minute: int = 60
     cost_limit_per_hour: float = 10.0
@@ -35,9 +49,19 @@ class AIService:
     def __init__(self, config: AIServiceConfig):
         self.config = config
         self.context_builder = ContextBuilder()
-        self.cache = AICache() if config.cache_enabled else None
+        self.cache = AICache(
+            policies=build_cache_policies(config.cache_ttls, config.cache_stale_seconds),
+            codec=config.cache_codec
+        ) if config.cache_enabled else None
         self._usage_tracker = UsageTracker()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._refreshes: set = set()
         
+    def close(self) -> None:
+        """Close the response cache."""
+        if self.cache:
+            self.cache.close()
+    
     async def initialize(self) -> None:
         """Initialize the AI service."""
         # Verify at least one provider is registered
@@ -65,25 +89,56 @@ class AIService:
                 provider_name=provider_name
             )
             
-            # Check cache
-            if self.cache:
-                cached_response = await self.cache.get(request)
-                if cached_response:
-                    logger.info("Returning cached response")
-                    return cached_response
-            
             # Get provider and generate response
             provider = ai_registry.get_provider(provider_name or self.config.default_provider)
-            response = await provider.generate_code(request)
             
-            # Cache response
-            if self.cache:
-                await self.cache.set(request, response)
+            async def _generate() -> AIResponse:
+                response = await provider.generate_code(request)
+                
+                # Track usage
+                await self._usage_tracker.track_request(request, response)
+                
+                return response
+            
+            return await self._cached_call(provider.name, request, _generate)
             
-            # Track usage
-            await self._usage_tracker.track_request(request, response)
+        except Exception as e:
+            logger.error(f"Code generation failed: {e}")
+            raise AIServiceError(f"Code generation failed: {e}")
+    
+    async def stream_generate_code(
+        self, 
+        query: str, 
+        project_path: Path,
+        user_preferences: Optional[UserPreferences] = None,
+        provider_name: Optional[str] = None
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Generate code, yielding the response as it streams in.
+        
+        The last delta carries the assembled response, which is cached and
+        usage-tracked like ``generate_code``'s; a cache hit arrives as a
+        single delta.
+        """
+        try:
+            request = await self._build_request(
+                query=query,
+                request_type=RequestType.GENERATE,
+                project_path=project_path,
+                user_preferences=user_preferences,
+                provider_name=provider_name
+            )
+            
+            provider = ai_registry.get_provider(provider_name or self.config.default_provider)
             
-            return response
+            async def _generate() -> AIResponse:
+                response = await provider.generate_code(request)
+                await self._usage_tracker.track_request(request, response)
+                return response
+            
+            async for delta in self._cached_stream(
+                provider.name, request, _generate, lambda: provider.stream_generate_code(request)
+            ):
+                yield delta
             
         except Exception as e:
             logger.error(f"Code generation failed: {e}")
@@ -103,23 +158,28 @@ class AIService:
                 request_type=RequestType.ANALYZE,
                 project_path=project_path,
                 user_preferences=user_preferences,
-                provider_name=provider_name
+                provider_name=provider_name,
+                code=code
             )
             
             provider = ai_registry.get_provider(provider_name or self.config.default_provider)
-            result = await provider.analyze_code(code, request)
-            
-            await self._usage_tracker.track_request(request, AIResponse(
-                content="",
-                confidence=0.8,
-                tokens_used=0,
-                cost=0.0,
-                cached=False,
-                metadata={},
-                provider=provider.name
-            ))
             
-            return result
+            async def _analyze() -> AnalysisResult:
+                result = await provider.analyze_code(code, request)
+                
+                await self._usage_tracker.track_request(request, AIResponse(
+                    content="",
+                    confidence=0.8,
+                    tokens_used=0,
+                    cost=0.0,
+                    cached=False,
+                    metadata={},
+                    provider=provider.name
+                ))
+                
+                return result
+            
+            return await self._cached_call(provider.name, request, _analyze)
             
         except Exception as e:
             logger.error(f"Code analysis failed: {e}")
@@ -143,19 +203,23 @@ class AIService:
             )
             
             provider = ai_registry.get_provider(provider_name or self.config.default_provider)
-            suggestions = await provider.suggest_improvements(request)
             
-            await self._usage_tracker.track_request(request, AIResponse(
-                content="",
-                confidence=0.8,
-                tokens_used=0,
-                cost=0.0,
-                cached=False,
-                metadata={},
-                provider=provider.name
-            ))
+            async def _suggest() -> List[CodeSuggestion]:
+                suggestions = await provider.suggest_improvements(request)
+                
+                await self._usage_tracker.track_request(request, AIResponse(
+                    content="",
+                    confidence=0.8,
+                    tokens_used=0,
+                    cost=0.0,
+                    cached=False,
+                    metadata={},
+                    provider=provider.name
+                ))
+                
+                return suggestions
             
-            return suggestions
+            return await self._cached_call(provider.name, request, _suggest)
             
         except Exception as e:
             logger.error(f"Suggestion generation failed: {e}")
@@ -175,15 +239,56 @@ class AIService:
                 request_type=RequestType.CHAT,
                 project_path=project_path,
                 user_preferences=user_preferences,
-                provider_name=provider_name
+                provider_name=provider_name,
+                conversation=conversation
             )
             
             provider = ai_registry.get_provider(provider_name or self.config.default_provider)
-            response = await provider.chat_response(conversation, request)
             
-            await self._usage_tracker.track_request(request, response)
+            async def _chat() -> AIResponse:
+                response = await provider.chat_response(conversation, request)
+                await self._usage_tracker.track_request(request, response)
+                return response
             
-            return response
+            return await self._cached_call(provider.name, request, _chat)
+            
+        except Exception as e:
+            logger.error(f"Chat response failed: {e}")
+            raise AIServiceError(f"Chat response failed: {e}")
+    
+    async def stream_chat(
+        self, 
+        conversation: List[Dict[str, str]], 
+        project_path: Path,
+        user_preferences: Optional[UserPreferences] = None,
+        provider_name: Optional[str] = None
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Generate a chat response, yielding it as it streams in.
+        
+        The last delta carries the assembled response, which is cached and
+        usage-tracked like ``chat``'s; a cache hit arrives as a single delta.
+        """
+        try:
+            request = await self._build_request(
+                query=conversation[-1]["content"] if conversation else "",
+                request_type=RequestType.CHAT,
+                project_path=project_path,
+                user_preferences=user_preferences,
+                provider_name=provider_name,
+                conversation=conversation
+            )
+            
+            provider = ai_registry.get_provider(provider_name or self.config.default_provider)
+            
+            async def _chat() -> AIResponse:
+                response = await provider.chat_response(conversation, request)
+                await self._usage_tracker.track_request(request, response)
+                return response
+            
+            async for delta in self._cached_stream(
+                provider.name, request, _chat, lambda: provider.stream_chat_response(conversation, request)
+            ):
+                yield delta
             
         except Exception as e:
             logger.error(f"Chat response failed: {e}")
@@ -204,15 +309,18 @@ class AIService:
                 request_type=RequestType.EXPLAIN,
                 project_path=project_path,
                 user_preferences=user_preferences,
-                provider_name=provider_name
+                provider_name=provider_name,
+                code=code
             )
             
             provider = ai_registry.get_provider(provider_name or self.config.default_provider)
-            response = await provider.explain_code(code, query, request)
             
-            await self._usage_tracker.track_request(request, response)
+            async def _explain() -> AIResponse:
+                response = await provider.explain_code(code, query, request)
+                await self._usage_tracker.track_request(request, response)
+                return response
             
-            return response
+            return await self._cached_call(provider.name, request, _explain)
             
         except Exception as e:
             logger.error(f"Code explanation failed: {e}")
@@ -233,15 +341,18 @@ class AIService:
                 request_type=RequestType.DEBUG,
                 project_path=project_path,
                 user_preferences=user_preferences,
-                provider_name=provider_name
+                provider_name=provider_name,
+                code=code
             )
             
             provider = ai_registry.get_provider(provider_name or self.config.default_provider)
-            response = await provider.debug_code(code, error_type, request)
             
-            await self._usage_tracker.track_request(request, response)
+            async def _debug() -> AIResponse:
+                response = await provider.debug_code(code, error_type, request)
+                await self._usage_tracker.track_request(request, response)
+                return response
             
-            return response
+            return await self._cached_call(provider.name, request, _debug)
             
         except Exception as e:
             logger.error(f"Code debugging failed: {e}")
@@ -251,15 +362,171 @@ class AIService:
         """Get usage statistics."""
         return await self._usage_tracker.get_stats()
     
+    async def _cached_call(
+        self,
+        provider_name: str,
+        request: AIRequest,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Serve request from the cache, or run ``call`` and cache its result.
+        
+        With stale-while-revalidate on, an expired entry still inside its
+        stale window is returned at once and refreshed in the background.
+        """
+        fetch = self._caching(request, call)
+        
+        cached = await self._from_cache(provider_name, request, fetch)
+        if cached is not None:
+            return cached
+        
+        return await self._coalesce(provider_name, request, fetch)
+    
+    async def _cached_stream(
+        self,
+        provider_name: str,
+        request: AIRequest,
+        call: Callable[[], Awaitable[AIResponse]],
+        open_stream: Callable[[], AsyncGenerator[StreamDelta, None]]
+    ) -> AsyncGenerator[StreamDelta, None]:
+        """Streaming counterpart of ``_cached_call``.
+        
+        ``call`` is the non-streaming request, used for background refreshes
+        of stale entries. Streams are not coalesced: each caller renders its
+        own tokens.
+        """
+        cached = await self._from_cache(provider_name, request, self._caching(request, call))
+        if cached is not None:
+            yield StreamDelta(content=cached.content, response=cached)
+            return
+        
+        async for delta in open_stream():
+            if delta.response is not None:
+                # Record the assembled response before handing over the last delta
+                if self.cache:
+                    await self.cache.set(request, delta.response)
+                await self._usage_tracker.track_request(request, delta.response)
+            yield delta
+    
+    def _caching(self, request: AIRequest, call: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+        """Wrap ``call`` so its result is stored in the cache."""
+        async def _fetch() -> Any:
+            result = await call()
+            if self.cache:
+                await self.cache.set(request, result)
+            return result
+        
+        return _fetch
+    
+    async def _from_cache(
+        self,
+        provider_name: str,
+        request: AIRequest,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """Look request up in the cache, refreshing stale hits with ``fetch``."""
+        if not self.cache:
+            return None
+        
+        if self.config.stale_while_revalidate:
+            entry = await self.cache.get_entry(request)
+            if entry is not None and not entry.is_fresh():
+                logger.info("Returning stale cached response, refreshing in background")
+                self._refresh_in_background(provider_name, request, fetch)
+                return entry.response
+            cached = entry.response if entry else None
+        else:
+            cached = await self.cache.get(request)
+        
+        if cached is not None:
+            logger.info("Returning cached response")
+        return cached
+    
+    def _refresh_in_background(
+        self,
+        provider_name: str,
+        request: AIRequest,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Re-run a request without blocking the caller.
+        
+        The refresh goes through ``_coalesce``, so repeated stale hits share
+        one provider call.
+        """
+        task = asyncio.get_running_loop().create_task(self._coalesce(provider_name, request, fetch))
+        self._refreshes.add(task)
+        
+        def _finished(done: asyncio.Task) -> None:
+            self._refreshes.discard(done)
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(f"Background cache refresh failed: {done.exception()}")
+        
+        task.add_done_callback(_finished)
+    
+    async def drain_refreshes(self, timeout: float = REFRESH_DRAIN_TIMEOUT) -> None:
+        """Wait up to ``timeout`` seconds for background cache refreshes.
+        
+        Call before the event loop shuts down; refreshes still running after
+        the timeout are cancelled and revalidated on a later stale hit.
+        """
+        if not self._refreshes:
+            return
+        
+        logger.debug(f"Waiting for {len(self._refreshes)} background cache refresh(es)")
+        _, pending = await asyncio.wait(set(self._refreshes), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} background cache refresh(es) after {timeout}s")
+    
+    async def _coalesce(
+        self,
+        provider_name: str,
+        request: AIRequest,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``call`` once for concurrent identical requests (single-flight).
+        
+        Callers with the same provider and cache key await one shared task.
+        Each waits through ``asyncio.shield`` so a cancelled caller does not
+        cancel the provider call for the others.
+        """
+        key = f"{provider_name}:{request_cache_key(request)}"
+        loop = asyncio.get_running_loop()
+        
+        task = self._in_flight.get(key)
+        if task is not None and task.get_loop() is loop:
+            await self._usage_tracker.track_coalesced()
+            logger.debug(f"Joining in-flight request: {key}")
+        else:
+            task = loop.create_task(call())
+            self._in_flight[key] = task
+            
+            def _finished(done: asyncio.Task) -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                # Mark the exception retrieved in case every caller was cancelled
+                if not done.cancelled():
+                    done.exception()
+            
+            task.add_done_callback(_finished)
+        
+        return await asyncio.shield(task)
+    
     async def _build_request(
         self,
         query: str,
         request_type: RequestType,
         project_path: Path,
         user_preferences: Optional[UserPreferences] = None,
-        provider_name: Optional[str] = None
+        provider_name: Optional[str] = None,
+        code: Optional[str] = None,
+        conversation: Optional[List[Dict[str, str]]] = None
     ) -> AIRequest:
-        """Build AI request with context."""
+        """Build AI request with context.
+        
+        ``code`` and ``conversation`` are the payloads sent alongside the
+        query; only their fingerprints are kept on the request, for cache keys.
+        """
         # Build project context
         project_context = await self.context_builder.build_project_context(project_path)
         
@@ -282,16 +549,27 @@ class AIService:
                 max_tokens=2000
             )
         
+        metadata = {
+            "provider": provider_name or self.config.default_provider,
+            "timestamp": asyncio.get_event_loop().time()
+        }
+        if code is not None:
+            metadata["code_fingerprint"] = fingerprint_content(code)
+        else:
+            # Without a code payload the answer depends on the project's files
+            metadata["worktree_fingerprint"] = worktree_fingerprint(project_path)
+        if conversation is not None:
+            metadata["conversation_fingerprint"] = fingerprint_content(
+                json.dumps(conversation, sort_keys=True, default=str)
+            )
+        
         return AIRequest(
             query=query,
             request_type=request_type,
             context=project_context,
             session_context=session_context,
             user_preferences=user_preferences,
-            metadata={
-                "provider": provider_name or self.config.default_provider,
-                "timestamp": asyncio.get_event_loop().time()
-            }
+            metadata=metadata
         )
 
 
@@ -304,6 +582,7 @@ class UsageTracker:
             "tokens_used": 0,
             "total_cost": 0.0,
             "cache_hits": 0,
+            "coalesced": 0,
             "errors": 0,
             "by_provider": {},
             "by_request_type": {}
@@ -337,6 +616,10 @@ class UsageTracker:
             self._stats["by_request_type"][req_type] = 0
         self._stats["by_request_type"][req_type] += 1
     
+    async def track_coalesced(self) -> None:
+        """Track a request served by joining an identical in-flight call."""
+        self._stats["coalesced"] += 1
+    
     async def track_error(self, error: Exception) -> None:
         """Track an error."""
         self._stats["errors"] += 1
@@ -354,15 +637,51 @@ async def get_ai_service() -> AIService:
     """Get the global AI service instance."""
     global _ai_service
     if _ai_service is None:
-        config = AIServiceConfig()
+        from devos.core.ai_config import ensure_ai_providers
+        ensure_ai_providers()
+        
+        config = _service_config_from_settings()
         _ai_service = AIService(config)
         await _ai_service.initialize()
     return _ai_service
 
 
+def _service_config_from_settings() -> AIServiceConfig:
+    """Build the service config, applying cache settings from ai_config.json."""
+    from devos.core.ai_config import get_ai_config_manager
+    
+    settings = get_ai_config_manager().load_config()
+    return AIServiceConfig(
+        cache_enabled=settings.cache_enabled,
+        cache_ttls=settings.cache_ttls,
+        cache_stale_seconds=settings.cache_stale_seconds,
+        stale_while_revalidate=settings.stale_while_revalidate,
+        cache_codec=settings.cache_codec
+    )
+
+
+def run_ai_command(main: Awaitable[T]) -> T:
+    """Run a command's coroutine like ``asyncio.run``.
+    
+    Background cache refreshes started by the global service are given a
+    chance to finish before the loop shuts down and cancels them.
+    """
+    async def _run() -> T:
+        try:
+            return await main
+        finally:
+            if _ai_service is not None:
+                await _ai_service.drain_refreshes()
+    
+    return asyncio.run(_run())
+
+
 async def initialize_ai_service(config: AIServiceConfig) -> AIService:
     """Initialize the global AI service."""
     global _ai_service
+    from devos.core.ai_config import ensure_ai_providers
+    ensure_ai_providers()
+    
     _ai_service = AIService(config)
     await _ai_service.initialize()
     return _ai_service
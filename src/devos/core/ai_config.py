@@ -20,15 +20,24 @@ class AIConfig:
     default_model: str = "gpt-4"
     api_keys: Dict[str, str] = None
     cache_enabled: bool = True
+    cache_ttls: Dict[str, Optional[int]] = None
+    cache_stale_seconds: Optional[int] = None
+    stale_while_revalidate: bool = True
+    cache_codec: str = "zlib"
     max_context_size: int = 100000
     rate_limit_per_minute: int = 60
     cost_limit_per_hour: float = 10.0
     temperature: float = 0.7
     max_tokens: int = 2000
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
     
     def __post_init__(self):
         if self.api_keys is None:
             self.api_keys = {}
+        if self.cache_ttls is None:
+            self.cache_ttls = {}
 
 
 class AIConfigManager:
@@ -132,6 +141,7 @@ class AIConfigManager:
 
 # Global config manager instance
 _ai_config_manager: Optional[AIConfigManager] = None
+_ai_providers_initialized = False
 
 
 def get_ai_config_manager() -> AIConfigManager:
@@ -144,26 +154,44 @@ def get_ai_config_manager() -> AIConfigManager:
 
 def initialize_ai_providers() -> None:
     """Initialize AI providers with available API keys."""
+    global _ai_providers_initialized
     from .ai import ai_registry, OpenAIProvider, GroqProvider
     
+    from .ai.http_pool import configure_http_pool
+    
     config_manager = get_ai_config_manager()
-    providers = config_manager.list_providers()
+    config = config_manager.load_config()
     
-    for provider_name, has_key in providers.items():
-        if has_key:
-            api_key = config_manager.get_api_key(provider_name)
-            if api_key:
-                try:
-                    if provider_name == "openai":
-                        provider = OpenAIProvider(api_key)
-                        ai_registry.register(provider)
-                        logger.info(f"Registered {provider_name} provider")
-                    elif provider_name == "groq":
-                        provider = GroqProvider(api_key)
-                        ai_registry.register(provider)
-                        logger.info(f"Registered {provider_name} provider")
-                except Exception as e:
-                    logger.error(f"Failed to register {provider_name} provider: {e}")
+    configure_http_pool(
+        max_connections=config.http_max_connections,
+        max_keepalive_connections=config.http_max_keepalive_connections,
+        keepalive_expiry=config.http_keepalive_expiry
+    )
+    
+    for provider_name, api_key in config.api_keys.items():
+        if api_key:
+            try:
+                if provider_name == "openai":
+                    provider = OpenAIProvider(api_key)
+                    ai_registry.register(provider)
+                    logger.info(f"Registered {provider_name} provider")
+                elif provider_name == "groq":
+                    provider = GroqProvider(api_key)
+                    ai_registry.register(provider)
+                    logger.info(f"Registered {provider_name} provider")
+            except Exception as e:
+                logger.error(f"Failed to register {provider_name} provider: {e}")
+    
+    _ai_providers_initialized = True
     
     if not ai_registry.list_providers():
         logger.warning("No AI providers configured. Use 'devos ai-config set-api-key' to configure.")
+
+
+def ensure_ai_providers():
+    """Initialize AI providers once per process and return the registry."""
+    from .ai import ai_registry
+    
+    if not _ai_providers_initialized:
+        initialize_ai_providers()
+    return ai_registry
@@ -86,3 +86,8 @@ class Config:
     def week_start(self) -> str:
         """Get week start day for reports."""
         return self.get('reports.week_start', 'monday')
+    
+    @property
+    def archive_after_days(self) -> int:
+        """Get the age in days after which sessions are archived."""
+        return int(self.get('tracking.archive_after_days', 365))
@@ -1,22 +1,29 @@
 """Simple encryption for environment variables."""
 
 import base64
-import hashlib
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cryptography.fernet import Fernet, InvalidToken
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+# Fernet instances per key file, so each key is read once per process
+_fernet_cache: Dict[Path, Fernet] = {}
+_fernet_lock = threading.Lock()
 
 
 class Crypto:
-    """Simple encryption for local secrets."""
+    """Simple encryption for local secrets.
+    
+    Ciphertexts are raw Fernet tokens (the token's base64 decoded to bytes),
+    stored as BLOBs.
+    """
     
     def __init__(self, config_dir: Path):
         """Initialize crypto with key file."""
         self.config_dir = config_dir
         self.key_file = config_dir / ".key"
-        self._ensure_key()
+        self._fernet = self._load_fernet()
     
     def _ensure_key(self):
         """Ensure encryption key exists."""
@@ -27,21 +34,53 @@ class Crypto:
             # Set restrictive permissions
             self.key_file.chmod(0o600)
     
+    def _load_fernet(self) -> Fernet:
+        """Get the cached Fernet for this key file, reading the key on first use."""
+        with _fernet_lock:
+            fernet = _fernet_cache.get(self.key_file)
+            if fernet is None:
+                self._ensure_key()
+                fernet = Fernet(self._get_key())
+                _fernet_cache[self.key_file] = fernet
+            return fernet
+    
     def _get_key(self) -> bytes:
         """Get encryption key."""
         return self.key_file.read_bytes()
     
-    def encrypt(self, data: str) -> str:
-        """Encrypt string data."""
-        key = self._get_key()
-        f = Fernet(key)
-        encrypted_data = f.encrypt(data.encode())
-        return base64.b64encode(encrypted_data).decode()
-    
-    def decrypt(self, encrypted_data: str) -> str:
-        """Decrypt string data."""
-        key = self._get_key()
-        f = Fernet(key)
-        encrypted_bytes = base64.b64decode(encrypted_data.encode())
-        decrypted_data = f.decrypt(encrypted_bytes)
-        return decrypted_data.decode()
+    def encrypt(self, data: str) -> bytes:
+        """Encrypt string data into a compact binary token."""
+        token = self._fernet.encrypt(data.encode())
+        return base64.urlsafe_b64decode(token)
+    
+    def encrypt_many(self, values: Sequence[str]) -> List[bytes]:
+        """Encrypt a batch of strings, in order."""
+        return [self.encrypt(value) for value in values]
+    
+    def decrypt(self, encrypted_data: Union[bytes, str]) -> str:
+        """Decrypt a binary token (or a legacy base64-wrapped text token)."""
+        if isinstance(encrypted_data, str):
+            token = base64.b64decode(encrypted_data.encode())
+        else:
+            token = base64.urlsafe_b64encode(encrypted_data)
+        return self._fernet.decrypt(token).decode()
+    
+    def decrypt_many(self, tokens: Sequence[Union[bytes, str]], workers: Optional[int] = None) -> List[Optional[str]]:
+        """Decrypt a batch of tokens, in order; undecryptable ones become None.
+        
+        Pass ``workers`` to spread a very large batch over a thread pool; for
+        typical vaults the plain loop is faster since small tokens are
+        dominated by interpreter overhead.
+        """
+        if not workers or workers < 2:
+            return [self._try_decrypt(token) for token in tokens]
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._try_decrypt, tokens, chunksize=64))
+    
+    def _try_decrypt(self, token: Union[bytes, str]) -> Optional[str]:
+        """Decrypt one token, returning None if it cannot be decrypted."""
+        try:
+            return self.decrypt(token)
+        except (InvalidToken, ValueError):
+            return None
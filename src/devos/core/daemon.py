@@ -0,0 +1,462 @@
+"""Warm background daemon for DevOS.
+
+The daemon keeps a process alive with the CLI modules imported, the config
+and database opened, AI providers registered and enhanced project contexts
+built. The ``devos`` entry point forwards argv, cwd and environment over a
+Unix socket together with its stdin/stdout/stderr file descriptors, and the
+daemon forks a child per request that runs the command directly on the
+client's terminal. When no daemon is listening the client runs in-process.
+
+This module only imports the standard library at the top so the client side
+stays cheap; server-side dependencies are imported when the daemon starts.
+"""
+
+import array
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Commands that must always run in the calling process
+IN_PROCESS_COMMANDS = {'daemon'}
+
+# Disable forwarding entirely, e.g. for debugging
+NO_DAEMON_ENV = 'DEVOS_NO_DAEMON'
+
+_MAX_HEADER_SIZE = 4 * 1024 * 1024
+
+# Set in forked request workers; they must return an exit code, not exec()
+_in_worker = False
+_STDIO_FDS = 3
+
+
+def get_daemon_dir() -> Path:
+    """Get the directory holding the daemon socket, pid and log files."""
+    return Path.home() / ".devos"
+
+
+def get_socket_path() -> Path:
+    """Get the daemon socket path."""
+    return get_daemon_dir() / "daemon.sock"
+
+
+def get_pid_path() -> Path:
+    """Get the daemon pid file path."""
+    return get_daemon_dir() / "daemon.pid"
+
+
+def get_log_path() -> Path:
+    """Get the daemon log file path."""
+    return get_daemon_dir() / "daemon.log"
+
+
+def in_daemon_worker() -> bool:
+    """Check whether this process is running a request forwarded to the daemon."""
+    return _in_worker
+
+
+def daemon_supported() -> bool:
+    """Check whether this platform supports the daemon."""
+    return hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork') and hasattr(socket.socket, 'sendmsg')
+
+
+def is_daemon_running(socket_path: Optional[Path] = None) -> bool:
+    """Check whether a daemon is accepting connections."""
+    socket_path = socket_path or get_socket_path()
+    if not daemon_supported() or not socket_path.exists():
+        return False
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def read_daemon_pid() -> Optional[int]:
+    """Read the pid of the running daemon, if any."""
+    try:
+        return int(get_pid_path().read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def forward_to_daemon(argv: List[str], socket_path: Optional[Path] = None) -> Optional[int]:
+    """Run a command through the daemon.
+    
+    Returns the command's exit code, or None when no daemon is available and
+    the caller should run the command in-process.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or not daemon_supported():
+        return None
+    
+    if argv and argv[0] in IN_PROCESS_COMMANDS:
+        return None
+    
+    socket_path = socket_path or get_socket_path()
+    if not socket_path.exists():
+        return None
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(str(socket_path))
+            header = {
+                'argv': argv,
+                'cwd': os.getcwd(),
+                'env': dict(os.environ),
+                'encoding': getattr(sys.stdout, 'encoding', None) or 'utf-8',
+            }
+            sock.sendmsg(
+                [json.dumps(header).encode() + b"\n"],
+                [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', range(_STDIO_FDS)))]
+            )
+        except OSError:
+            # Stale socket or unusable stdio: run in-process instead
+            return None
+        
+        return _wait_for_exit_code(sock)
+    finally:
+        sock.close()
+
+
+def _wait_for_exit_code(sock: socket.socket) -> int:
+    """Wait for the daemon child to report its exit code.
+    
+    Ctrl-C in the client is forwarded to the child running the command.
+    """
+    reader = sock.makefile('rb')
+    child_pid = None
+    
+    while True:
+        try:
+            line = reader.readline()
+        except KeyboardInterrupt:
+            if child_pid:
+                try:
+                    os.kill(child_pid, signal.SIGINT)
+                except OSError:
+                    pass
+                continue
+            return 130
+        
+        if not line:
+            sys.stderr.write("devos: lost connection to daemon\n")
+            return 1
+        
+        message = json.loads(line)
+        if 'pid' in message:
+            child_pid = message['pid']
+        elif 'exit_code' in message:
+            return message['exit_code']
+
+
+class DaemonServer:
+    """Server that keeps DevOS state warm and runs forwarded commands."""
+    
+    def __init__(self, socket_path: Optional[Path] = None, warm_paths: Iterable[Path] = ()):
+        self.socket_path = socket_path or get_socket_path()
+        self.pid_path = get_pid_path()
+        self.warm_paths = [Path(path).resolve() for path in warm_paths]
+        self.config = None
+        self.db = None
+        self._running = False
+        self._watched_mtimes: Dict[Path, float] = {}
+    
+    def serve_forever(self) -> None:
+        """Warm up and serve requests until SIGTERM/SIGINT."""
+        if not daemon_supported():
+            from devos.core.exceptions import DevOSError
+            raise DevOSError(
+                "The DevOS daemon is not supported on this platform.",
+                "Run commands directly without the daemon."
+            )
+        
+        server = self._bind()
+        try:
+            # Clients connecting during warm-up wait in the listen backlog
+            self.pid_path.write_text(str(os.getpid()))
+            self._warm_up()
+            
+            self._running = True
+            signal.signal(signal.SIGTERM, self._handle_stop)
+            signal.signal(signal.SIGINT, self._handle_stop)
+            
+            logger.info(f"DevOS daemon listening on {self.socket_path}")
+            server.settimeout(1.0)
+            
+            while self._running:
+                self._reap_children()
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                except InterruptedError:
+                    continue
+                except OSError:
+                    if not self._running:
+                        break
+                    raise
+                
+                self._handle_connection(server, conn)
+        finally:
+            server.close()
+            self._cleanup()
+    
+    def _bind(self) -> socket.socket:
+        """Bind the listening socket, replacing a stale one."""
+        from devos.core.exceptions import DevOSError
+        
+        if is_daemon_running(self.socket_path):
+            raise DevOSError(
+                "DevOS daemon is already running.",
+                "Use 'devos daemon stop' to stop it first."
+            )
+        
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        return server
+    
+    def _cleanup(self) -> None:
+        """Remove the socket and pid files owned by this daemon."""
+        for path in (self.socket_path, self.pid_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    
+    def _handle_stop(self, signum, frame) -> None:
+        """Signal handler stopping the accept loop."""
+        self._running = False
+    
+    def _warm_up(self) -> None:
+        """Import command modules and build shared state once."""
+        import click
+        from devos import cli
+        
+        # Import every lazily registered command module up front
+        ctx = click.Context(cli.main)
+        pending = [cli.main]
+        seen = set()
+        while pending:
+            group = pending.pop()
+            if id(group) in seen:
+                continue
+            seen.add(id(group))
+            
+            for name in list(getattr(group, 'lazy_subcommands', {})) + list(group.commands):
+                try:
+                    command = group.get_command(ctx, name)
+                except Exception as e:
+                    logger.warning(f"Failed to preload command '{name}': {e}")
+                    continue
+                if isinstance(command, click.Group):
+                    pending.append(command)
+        
+        self._load_state()
+        
+        for project_path in self.warm_paths:
+            self._warm_project(project_path)
+    
+    def _load_state(self) -> None:
+        """(Re)build config, database and AI service state."""
+        import asyncio
+        from devos.core.config import Config
+        from devos.core.database import Database
+        from devos.core.ai_config import initialize_ai_providers, get_ai_config_manager
+        from devos.core.ai import service as ai_service_module
+        
+        # Close the state being replaced on reload
+        if self.db is not None:
+            self.db.close()
+        if ai_service_module._ai_service is not None:
+            ai_service_module._ai_service.close()
+        
+        self.config = Config()
+        self.db = Database(self.config)
+        
+        initialize_ai_providers()
+        ai_service_module._ai_service = None
+        try:
+            asyncio.run(ai_service_module.get_ai_service())
+        except Exception as e:
+            logger.info(f"AI service not warmed: {e}")
+        
+        self._watched_mtimes = {
+            path: self._mtime(path)
+            for path in (self.config.config_file, get_ai_config_manager().config_file)
+        }
+    
+    def _warm_project(self, project_path: Path) -> None:
+        """Build and memoize the enhanced context for a project."""
+        import asyncio
+        from devos.core.ai.enhanced_context import EnhancedContextBuilder
+        
+        try:
+            asyncio.run(EnhancedContextBuilder().build_enhanced_context(project_path))
+            logger.info(f"Warmed enhanced context for {project_path}")
+        except Exception as e:
+            logger.warning(f"Failed to warm context for {project_path}: {e}")
+    
+    def _refresh_if_changed(self) -> None:
+        """Reload shared state when config files changed since warm-up."""
+        for path, mtime in self._watched_mtimes.items():
+            if self._mtime(path) != mtime:
+                logger.info(f"{path.name} changed, reloading daemon state")
+                self._load_state()
+                return
+    
+    @staticmethod
+    def _mtime(path: Path) -> Optional[float]:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+    
+    def _handle_connection(self, server: socket.socket, conn: socket.socket) -> None:
+        """Receive a request and fork a child to run it."""
+        fds: List[int] = []
+        try:
+            request, fds = self._receive_request(conn)
+            if request is None:
+                return
+            
+            self._refresh_if_changed()
+            
+            # Children open their own SQLite connections
+            if self.db is not None:
+                self.db.close()
+            
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                try:
+                    self._run_request(conn, request, fds)
+                finally:
+                    # Never fall back into the parent's accept loop
+                    os._exit(0)
+        except Exception as e:
+            logger.error(f"Failed to handle daemon request: {e}")
+        finally:
+            for fd in fds:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            conn.close()
+    
+    def _receive_request(self, conn: socket.socket) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+        """Read the request header and the client's stdio descriptors."""
+        fds: List[int] = []
+        data = b""
+        fd_size = array.array('i').itemsize * _STDIO_FDS
+        
+        while not data.endswith(b"\n"):
+            chunk, ancdata, _, _ = conn.recvmsg(65536, socket.CMSG_SPACE(fd_size))
+            for level, kind, payload in ancdata:
+                if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                    received = array.array('i')
+                    received.frombytes(payload[:len(payload) - (len(payload) % received.itemsize)])
+                    fds.extend(received)
+            if not chunk:
+                break
+            data += chunk
+            if len(data) > _MAX_HEADER_SIZE:
+                break
+        
+        if not data and not fds:
+            # Liveness probe from is_daemon_running()
+            return None, fds
+        
+        if len(fds) != _STDIO_FDS or not data.endswith(b"\n"):
+            logger.warning("Ignoring malformed daemon request")
+            return None, fds
+        
+        return json.loads(data), fds
+    
+    def _run_request(self, conn: socket.socket, request: Dict[str, Any], fds: List[int]) -> int:
+        """Run a forwarded command in the forked child."""
+        from devos.cli import main, LazyContext
+        
+        global _in_worker
+        _in_worker = True
+        
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        
+        # Attach the client's terminal and environment
+        for target_fd, source_fd in enumerate(fds):
+            os.dup2(source_fd, target_fd)
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        
+        encoding = request.get('encoding') or 'utf-8'
+        sys.stdin = open(0, 'r', encoding=encoding, closefd=False)
+        sys.stdout = open(1, 'w', encoding=encoding, buffering=1, closefd=False)
+        sys.stderr = open(2, 'w', encoding=encoding, buffering=1, closefd=False)
+        
+        conn.sendall(json.dumps({'pid': os.getpid()}).encode() + b"\n")
+        
+        exit_code = 0
+        try:
+            main.main(
+                args=request['argv'],
+                prog_name='devos',
+                obj=LazyContext(config=self.config, db=self.db),
+            )
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                sys.stderr.write(f"{e.code}\n")
+                exit_code = 1
+        except KeyboardInterrupt:
+            exit_code = 130
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+        
+        try:
+            conn.sendall(json.dumps({'exit_code': exit_code}).encode() + b"\n")
+        except OSError:
+            pass
+        
+        return exit_code
+    
+    @staticmethod
+    def _reap_children() -> None:
+        """Collect exited request children."""
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
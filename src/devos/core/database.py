@@ -1,12 +1,491 @@
 """Database layer for DevOS using SQLite."""
 
+import os
 import sqlite3
 import json
-from datetime import datetime
+import itertools
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, Tuple
 
 from devos.core.config import Config
+from devos.core.exceptions import DatabaseError
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    """Add columns that are missing from an existing table."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, definition in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _migration_001_initial_schema(conn: sqlite3.Connection) -> None:
+    """Create the base tables, upgrading databases from before versioning."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS projects (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            path TEXT NOT NULL UNIQUE,
+            language TEXT NOT NULL,
+            type TEXT DEFAULT 'web',
+            description TEXT,
+            tags TEXT, -- JSON array
+            status TEXT DEFAULT 'active',
+            metadata TEXT, -- JSON for tasks, issues, notes
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Unversioned databases may predate the project management columns
+    _add_missing_columns(conn, 'projects', {
+        'type': "TEXT DEFAULT 'web'",
+        'description': "TEXT",
+        'tags': "TEXT",
+        'status': "TEXT DEFAULT 'active'",
+        'metadata': "TEXT",
+    })
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP,
+            duration INTEGER,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects (id)
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS env_vars (
+            id TEXT PRIMARY KEY,
+            project_id TEXT,
+            key TEXT NOT NULL,
+            encrypted_value TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            UNIQUE(project_id, key)
+        )
+    """)
+
+
+def _migration_002_session_epochs_and_indexes(conn: sqlite3.Connection) -> None:
+    """Add integer epoch columns and indexes for session range queries."""
+    _add_missing_columns(conn, 'sessions', {
+        'start_epoch': "INTEGER",
+        'end_epoch': "INTEGER",
+    })
+    
+    # SQLite parses the stored ISO timestamps (naive values count as UTC)
+    conn.execute("""
+        UPDATE sessions
+        SET start_epoch = CAST(strftime('%s', start_time) AS INTEGER),
+            end_epoch = CAST(strftime('%s', end_time) AS INTEGER)
+    """)
+    
+    # Covering index for date-range scans and reports
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sessions_start_epoch
+        ON sessions (start_epoch, project_id, duration)
+    """)
+    
+    # Per-project listings and range scans
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sessions_project_start
+        ON sessions (project_id, start_epoch, duration)
+    """)
+    
+    # Only a handful of sessions are ever active
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sessions_active
+        ON sessions (project_id)
+        WHERE end_time IS NULL
+    """)
+
+
+# Recomputes daily_rollups from finished sessions in {sessions}. Days are
+# local dates of the session start, matching Database.end_session().
+_ROLLUP_REBUILD_SQL = """
+    INSERT INTO daily_rollups (day, project_id, seconds, sessions)
+    SELECT date(start_epoch, 'unixepoch', 'localtime'),
+           project_id,
+           COALESCE(SUM(duration), 0),
+           COUNT(*)
+    FROM {sessions}
+    WHERE end_time IS NOT NULL AND start_epoch IS NOT NULL
+    GROUP BY 1, 2
+"""
+
+
+def _migration_003_daily_rollups(conn: sqlite3.Connection) -> None:
+    """Add the per-project daily rollup table and populate it."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            day TEXT NOT NULL, -- local YYYY-MM-DD of session start
+            project_id TEXT NOT NULL,
+            seconds INTEGER NOT NULL DEFAULT 0,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, project_id)
+        ) WITHOUT ROWID
+    """)
+    
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_daily_rollups_project_day
+        ON daily_rollups (project_id, day)
+    """)
+    
+    conn.execute("DELETE FROM daily_rollups")
+    conn.execute(_ROLLUP_REBUILD_SQL.format(sessions='sessions'))
+
+
+def _migration_004_project_items(conn: sqlite3.Connection) -> None:
+    """Move project tasks, issues and notes out of the metadata JSON blob."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_tasks (
+            id INTEGER PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            priority TEXT DEFAULT 'medium',
+            status TEXT DEFAULT 'pending',
+            created_at TEXT,
+            completed_at TEXT,
+            FOREIGN KEY (project_id) REFERENCES projects (id)
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_issues (
+            id INTEGER PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            severity TEXT DEFAULT 'medium',
+            status TEXT DEFAULT 'open',
+            created_at TEXT,
+            resolved_at TEXT,
+            FOREIGN KEY (project_id) REFERENCES projects (id)
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_notes (
+            id INTEGER PRIMARY KEY,
+            project_id TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TEXT,
+            FOREIGN KEY (project_id) REFERENCES projects (id)
+        )
+    """)
+    
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_project_tasks_project ON project_tasks (project_id, title)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_project_issues_project ON project_issues (project_id, title)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_project_notes_project ON project_notes (project_id)")
+    
+    # Copy existing items out of the metadata blob, keeping their order
+    rows = conn.execute("SELECT id, metadata FROM projects WHERE metadata IS NOT NULL").fetchall()
+    for project_id, raw in rows:
+        try:
+            metadata = json.loads(raw) or {}
+        except (TypeError, ValueError):
+            continue
+        
+        conn.executemany(
+            "INSERT INTO project_tasks (project_id, title, priority, status, created_at, completed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (project_id, task.get('title', ''), task.get('priority', 'medium'), task.get('status', 'pending'),
+                 task.get('created_at'), task.get('completed_at'))
+                for task in metadata.get('tasks', [])
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO project_issues (project_id, title, severity, status, created_at, resolved_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (project_id, issue.get('title', ''), issue.get('severity', 'medium'), issue.get('status', 'open'),
+                 issue.get('created_at'), issue.get('resolved_at'))
+                for issue in metadata.get('issues', [])
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO project_notes (project_id, content, created_at) VALUES (?, ?, ?)",
+            [
+                (project_id, note.get('content', ''), note.get('created_at'))
+                for note in metadata.get('notes', [])
+            ]
+        )
+    
+    conn.execute("UPDATE projects SET metadata = NULL")
+
+
+# Full-text index over project tasks, issues, notes and session notes. Rows
+# for tasks/issues/notes use rowid = id * 4 + kind code so triggers can
+# update them directly; session rows take negative rowids.
+SEARCH_KINDS = {'task': 1, 'issue': 2, 'note': 3, 'session': 0}
+
+_SEARCH_SESSIONS_DELETE_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS search_sessions_delete AFTER DELETE ON sessions
+    WHEN COALESCE(old.notes, '') != '' BEGIN
+        DELETE FROM search_index WHERE kind = 'session' AND ref = old.id;
+    END
+"""
+
+_SEARCH_INDEX_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        body,
+        kind UNINDEXED,
+        ref UNINDEXED,
+        project_id UNINDEXED,
+        created_at UNINDEXED,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_tasks_insert AFTER INSERT ON project_tasks BEGIN
+        INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+        VALUES (new.id * 4 + 1, new.title, 'task', new.id, new.project_id, new.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_tasks_update AFTER UPDATE OF title ON project_tasks BEGIN
+        UPDATE search_index SET body = new.title WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_tasks_delete AFTER DELETE ON project_tasks BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_issues_insert AFTER INSERT ON project_issues BEGIN
+        INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+        VALUES (new.id * 4 + 2, new.title, 'issue', new.id, new.project_id, new.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_issues_update AFTER UPDATE OF title ON project_issues BEGIN
+        UPDATE search_index SET body = new.title WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_issues_delete AFTER DELETE ON project_issues BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_notes_insert AFTER INSERT ON project_notes BEGIN
+        INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+        VALUES (new.id * 4 + 3, new.content, 'note', new.id, new.project_id, new.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_notes_update AFTER UPDATE OF content ON project_notes BEGIN
+        UPDATE search_index SET body = new.content WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_notes_delete AFTER DELETE ON project_notes BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+    # Session notes are usually written once, by end_session()
+    """
+    CREATE TRIGGER IF NOT EXISTS search_sessions_insert AFTER INSERT ON sessions
+    WHEN COALESCE(new.notes, '') != '' BEGIN
+        INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+        VALUES (MIN(0, COALESCE((SELECT rowid FROM search_index ORDER BY rowid LIMIT 1), 0)) - 1,
+                new.notes, 'session', new.id, new.project_id, new.start_time);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_sessions_update AFTER UPDATE OF notes ON sessions
+    WHEN COALESCE(old.notes, '') != COALESCE(new.notes, '') BEGIN
+        DELETE FROM search_index WHERE kind = 'session' AND ref = old.id AND COALESCE(old.notes, '') != '';
+        INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+        SELECT MIN(0, COALESCE((SELECT rowid FROM search_index ORDER BY rowid LIMIT 1), 0)) - 1,
+               new.notes, 'session', new.id, new.project_id, new.start_time
+        WHERE COALESCE(new.notes, '') != '';
+    END
+    """,
+    _SEARCH_SESSIONS_DELETE_TRIGGER,
+]
+
+# Statements that refill search_index; {sessions} names the session source
+_SEARCH_INDEX_FILL = [
+    "DELETE FROM search_index",
+    """
+    INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+    SELECT id * 4 + 1, title, 'task', id, project_id, created_at FROM project_tasks
+    """,
+    """
+    INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+    SELECT id * 4 + 2, title, 'issue', id, project_id, created_at FROM project_issues
+    """,
+    """
+    INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+    SELECT id * 4 + 3, content, 'note', id, project_id, created_at FROM project_notes
+    """,
+    """
+    INSERT INTO search_index (rowid, body, kind, ref, project_id, created_at)
+    SELECT -ROW_NUMBER() OVER (ORDER BY start_epoch), notes, 'session', id, project_id, start_time
+    FROM {sessions} WHERE COALESCE(notes, '') != ''
+    """,
+]
+
+
+def _migration_005_search_index(conn: sqlite3.Connection) -> None:
+    """Add the FTS5 search index and the triggers that maintain it."""
+    for statement in _SEARCH_INDEX_SCHEMA:
+        conn.execute(statement)
+    for statement in _SEARCH_INDEX_FILL:
+        conn.execute(statement.format(sessions='sessions'))
+
+
+def _migration_006_binary_env_values(conn: sqlite3.Connection) -> None:
+    """Store env var ciphertexts as raw token bytes instead of double base64 text."""
+    import base64
+    
+    conn.execute("""
+        CREATE TABLE env_vars_new (
+            id TEXT PRIMARY KEY,
+            project_id TEXT,
+            key TEXT NOT NULL,
+            encrypted_value BLOB NOT NULL, -- raw Fernet token, see devos.core.crypto
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects (id),
+            UNIQUE(project_id, key)
+        )
+    """)
+    
+    rows = conn.execute(
+        "SELECT id, project_id, key, encrypted_value, created_at, updated_at FROM env_vars"
+    ).fetchall()
+    converted = []
+    for env_id, project_id, key, value, created_at, updated_at in rows:
+        if isinstance(value, str):
+            # base64(Fernet token) -> token -> token bytes
+            value = base64.urlsafe_b64decode(base64.b64decode(value))
+        converted.append((env_id, project_id, key, value, created_at, updated_at))
+    
+    conn.executemany(
+        "INSERT INTO env_vars_new (id, project_id, key, encrypted_value, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        converted
+    )
+    conn.execute("DROP TABLE env_vars")
+    conn.execute("ALTER TABLE env_vars_new RENAME TO env_vars")
+
+
+# Schema migrations in order. PRAGMA user_version stores how many have been
+# applied; append new steps here and never edit or reorder shipped ones.
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _migration_001_initial_schema,
+    _migration_002_session_epochs_and_indexes,
+    _migration_003_daily_rollups,
+    _migration_004_project_items,
+    _migration_005_search_index,
+    _migration_006_binary_env_values,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Applied to every new connection. WAL lets readers proceed while a command
+# writes, and NORMAL sync is durable enough for WAL mode.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -8000",  # 8 MB page cache
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Rows read by Database.get_rollup_totals(): finished sessions from
+# daily_rollups plus each active session's elapsed time so far, dated like
+# end_session() will date it.
+_ROLLUP_SOURCE_SQL = """
+    SELECT day, project_id, seconds, sessions FROM daily_rollups
+    UNION ALL
+    SELECT date(start_epoch, 'unixepoch', 'localtime'),
+           project_id,
+           MAX(CAST(strftime('%s', 'now') AS INTEGER) - start_epoch, 0),
+           1
+    FROM main.sessions
+    WHERE end_time IS NULL
+"""
+
+# SELECT columns and GROUP BY keys for Database.get_rollup_totals()
+ROLLUP_GROUPINGS: Dict[Optional[str], Tuple[List[str], List[str]]] = {
+    None: ([], []),
+    'day': (["r.day"], ['r.day']),
+    'weekday': (["CAST(strftime('%w', r.day) AS INTEGER) AS weekday"], ['weekday']),
+    'project': (["r.project_id", "COALESCE(p.name, 'Unknown') AS project_name"], ['r.project_id']),
+}
+
+# Prepared statements kept per connection by the sqlite3 module
+STATEMENT_CACHE_SIZE = 256
+
+# Rows fetched per round trip by Database.iter_query()
+QUERY_BATCH_SIZE = 500
+
+# Old sessions are moved into this database (ATTACHed as "archive") by
+# Database.archive_sessions(); daily_rollups keep their totals in the main DB.
+ARCHIVE_DB_NAME = "devos-archive.db"
+
+SESSION_COLUMNS = "id, project_id, start_time, end_time, duration, notes, created_at, start_epoch, end_epoch"
+
+# Hot and archived sessions as one relation, for reads that span both
+ALL_SESSIONS_SQL = f"""(
+    SELECT {SESSION_COLUMNS} FROM main.sessions
+    UNION ALL
+    SELECT {SESSION_COLUMNS} FROM archive.sessions
+)"""
+
+_ARCHIVE_SCHEMA = [
+    "PRAGMA archive.journal_mode = WAL",
+    "PRAGMA archive.synchronous = NORMAL",
+    """
+    CREATE TABLE IF NOT EXISTS archive.sessions (
+        id TEXT PRIMARY KEY,
+        project_id TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT,
+        duration INTEGER,
+        notes TEXT,
+        created_at TEXT,
+        start_epoch INTEGER,
+        end_epoch INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS archive.idx_archived_sessions_start_epoch ON sessions (start_epoch, project_id, duration)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_archived_sessions_project_start ON sessions (project_id, start_epoch, duration)",
+]
+
+# Connections inherited across fork(); kept referenced so they are never
+# closed (and their WAL checkpointed) from the child process.
+_inherited_connections: List[sqlite3.Connection] = []
+
+
+def to_epoch(value: datetime) -> int:
+    """Convert a datetime to integer epoch seconds (naive values are UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _to_sql_timestamp(value: datetime) -> str:
+    """Format a datetime like SQLite's CURRENT_TIMESTAMP (UTC, naive values are UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def rollup_day(epoch: int) -> str:
+    """Get the local day (YYYY-MM-DD) a session starting at ``epoch`` rolls up into."""
+    return datetime.fromtimestamp(epoch).strftime('%Y-%m-%d')
 
 
 class Database:
@@ -16,6 +495,11 @@ class Database:
         """Initialize database connection."""
         self.config = config or Config()
         self.db_path = self.config.data_dir / "devos.db"
+        self.archive_path = self.config.data_dir / ARCHIVE_DB_NAME
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._pid = os.getpid()
         self._ensure_database()
         self._init_schema()
     
@@ -28,108 +512,159 @@ class Database:
         self.close()
     
     def close(self):
-        """Close database resources."""
-        # SQLite connections are managed by context managers in individual methods
-        # This method is for explicit cleanup and future connection pooling
-        pass
+        """Close all connections opened by this process."""
+        with self._connections_lock:
+            if self._pid == os.getpid():
+                for conn in self._connections:
+                    conn.close()
+            self._connections = []
+            self._local = threading.local()
     
     def _ensure_database(self):
         """Ensure database directory exists."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
     
-    def _init_schema(self):
-        """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS projects (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    path TEXT NOT NULL UNIQUE,
-                    language TEXT NOT NULL,
-                    type TEXT DEFAULT 'web',
-                    description TEXT,
-                    tags TEXT, -- JSON array
-                    status TEXT DEFAULT 'active',
-                    metadata TEXT, -- JSON for tasks, issues, notes
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Add new columns to existing projects table if they don't exist
-            try:
-                conn.execute("ALTER TABLE projects ADD COLUMN type TEXT DEFAULT 'web'")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            
-            try:
-                conn.execute("ALTER TABLE projects ADD COLUMN description TEXT")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            
-            try:
-                conn.execute("ALTER TABLE projects ADD COLUMN tags TEXT")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            
-            try:
-                conn.execute("ALTER TABLE projects ADD COLUMN status TEXT DEFAULT 'active'")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's long-lived connection, opening it on first use.
+        
+        Each thread gets its own connection. After a fork (e.g. in the
+        daemon) connections inherited from the parent are abandoned without
+        closing them, since closing would checkpoint the parent's WAL.
+        """
+        if self._pid != os.getpid():
+            with self._connections_lock:
+                if self._pid != os.getpid():
+                    _inherited_connections.extend(self._connections)
+                    self._connections = []
+                    self._local = threading.local()
+                    self._pid = os.getpid()
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,  # autocommit; see transaction()
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
             
+            self._local.conn = conn
+            self._local.transaction_depth = 0
+            self._local.after_commit = []
+            self._local.archive = False
+            if self.archive_path.exists():
+                self._attach_archive(conn)
+            with self._connections_lock:
+                self._connections.append(conn)
+        
+        return conn
+    
+    def _attach_archive(self, conn: sqlite3.Connection) -> None:
+        """ATTACH the archive database to a connection, creating it if needed."""
+        conn.execute("ATTACH DATABASE ? AS archive", (str(self.archive_path),))
+        for statement in _ARCHIVE_SCHEMA:
+            conn.execute(statement)
+        self._local.archive = True
+    
+    def _sessions_source(self) -> str:
+        """SQL naming every session: the hot table, plus the archive once attached."""
+        self._get_connection()
+        return ALL_SESSIONS_SQL if self._local.archive else "sessions"
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run several statements in one write transaction.
+        
+        Nested uses join the outermost transaction, which commits once on
+        exit or rolls back if an exception escapes.
+        """
+        conn = self._get_connection()
+        if self._local.transaction_depth:
+            self._local.transaction_depth += 1
             try:
-                conn.execute("ALTER TABLE projects ADD COLUMN metadata TEXT")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id TEXT PRIMARY KEY,
-                    project_id TEXT NOT NULL,
-                    start_time TIMESTAMP NOT NULL,
-                    end_time TIMESTAMP,
-                    duration INTEGER,
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES projects (id)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS env_vars (
-                    id TEXT PRIMARY KEY,
-                    project_id TEXT,
-                    key TEXT NOT NULL,
-                    encrypted_value TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES projects (id),
-                    UNIQUE(project_id, key)
-                )
-            """)
-            
-            conn.commit()
+                yield conn
+            finally:
+                self._local.transaction_depth -= 1
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.transaction_depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            self._local.transaction_depth = 0
+            callbacks, self._local.after_commit = self._local.after_commit, []
+        
+        for callback in callbacks:
+            callback()
+    
+    def _after_commit(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once the current transaction commits, or now outside one.
+        
+        Callbacks are dropped if the transaction rolls back.
+        """
+        self._get_connection()
+        if self._local.transaction_depth:
+            self._local.after_commit.append(callback)
+        else:
+            callback()
+    
+    def _init_schema(self):
+        """Bring the database schema up to date.
+        
+        The fast path is a single ``PRAGMA user_version`` read; pending
+        migrations are applied once, inside one transaction.
+        """
+        conn = self._get_connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        
+        try:
+            with self.transaction():
+                # Another process may have migrated while we waited for the lock
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                for migration in MIGRATIONS[version:]:
+                    migration(conn)
+                
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except sqlite3.Error as e:
+            raise DatabaseError("schema migration", str(e))
     
     def execute_query(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
         """Execute a query and return results."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            return cursor.fetchall()
+        cursor = self._get_connection().execute(query, params)
+        return cursor.fetchall()
+    
+    def iter_query(self, query: str, params: tuple = (), batch_size: int = QUERY_BATCH_SIZE) -> Iterator[sqlite3.Row]:
+        """Execute a query and yield rows lazily, ``batch_size`` at a time."""
+        cursor = self._get_connection().execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """Execute an update query and return affected rows."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            conn.commit()
-            return cursor.rowcount
+        cursor = self._get_connection().execute(query, params)
+        return cursor.rowcount
     
     def execute_insert(self, query: str, params: tuple = ()) -> str:
         """Execute an insert query and return the last row ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            conn.commit()
-            return str(cursor.lastrowid)
+        cursor = self._get_connection().execute(query, params)
+        return str(cursor.lastrowid)
     
     # Project methods
     def create_project(self, project_id: str, name: str, path: str, language: str) -> str:
@@ -156,38 +691,58 @@ class Database:
         )
         return dict(rows[0]) if rows else None
     
-    def list_projects(self) -> List[Dict[str, Any]]:
-        """List all projects."""
-        rows = self.execute_query("SELECT * FROM projects ORDER BY created_at DESC")
+    def list_projects(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List all projects, most recently created first."""
+        query = "SELECT * FROM projects ORDER BY created_at DESC"
+        params = ()
+        
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        
+        rows = self.execute_query(query, params)
         return [dict(row) for row in rows]
     
     # Session methods
     def create_session(self, session_id: str, project_id: str, start_time: datetime) -> str:
         """Create a new session."""
         self.execute_insert(
-            "INSERT INTO sessions (id, project_id, start_time) VALUES (?, ?, ?)",
-            (session_id, project_id, start_time.isoformat())
+            "INSERT INTO sessions (id, project_id, start_time, start_epoch) VALUES (?, ?, ?, ?)",
+            (session_id, project_id, start_time.isoformat(), to_epoch(start_time))
         )
         return session_id
     
     def end_session(self, session_id: str, end_time: datetime, notes: str = "") -> bool:
         """End a session and calculate duration."""
-        start_rows = self.execute_query(
-            "SELECT start_time FROM sessions WHERE id = ? AND end_time IS NULL",
-            (session_id,)
-        )
-        
-        if not start_rows:
-            return False
-        
-        start_time = datetime.fromisoformat(start_rows[0]['start_time'])
-        duration = int((end_time - start_time).total_seconds())
-        
-        self.execute_update(
-            "UPDATE sessions SET end_time = ?, duration = ?, notes = ? WHERE id = ?",
-            (end_time.isoformat(), duration, notes, session_id)
-        )
-        return True
+        with self.transaction():
+            start_rows = self.execute_query(
+                "SELECT project_id, start_time FROM sessions WHERE id = ? AND end_time IS NULL",
+                (session_id,)
+            )
+            
+            if not start_rows:
+                return False
+            
+            start_time = datetime.fromisoformat(start_rows[0]['start_time'])
+            duration = int((end_time - start_time).total_seconds())
+            
+            self.execute_update(
+                "UPDATE sessions SET end_time = ?, end_epoch = ?, duration = ?, notes = ? WHERE id = ?",
+                (end_time.isoformat(), to_epoch(end_time), duration, notes, session_id)
+            )
+            
+            # Keep the daily rollup in step with the finished session
+            self.execute_update(
+                """
+                INSERT INTO daily_rollups (day, project_id, seconds, sessions)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT (day, project_id) DO UPDATE SET
+                    seconds = seconds + excluded.seconds,
+                    sessions = sessions + 1
+                """,
+                (rollup_day(to_epoch(start_time)), start_rows[0]['project_id'], duration)
+            )
+            return True
     
     def get_active_session(self, project_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get currently active session."""
@@ -203,36 +758,461 @@ class Database:
     
     def list_sessions(self, project_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """List sessions."""
-        query = """
+        return list(self.iter_sessions(project_id=project_id, limit=limit))
+    
+    def iter_sessions(self, project_id: Optional[str] = None, after: Optional[str] = None,
+                      before: Optional[datetime] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream sessions newest first without loading them all.
+        
+        ``after`` is the id of the last session of a previous page and
+        ``before`` keeps sessions started before that time (keyset
+        pagination on the start_epoch indexes). Archived sessions are
+        included; each database is read in index order and the two streams
+        are merged by SQLite.
+        """
+        self._get_connection()  # sets _local.archive on this thread
+        conditions = []
+        params: List[Any] = []
+        
+        if project_id:
+            conditions.append("s.project_id = ?")
+            params.append(project_id)
+        
+        if after:
+            anchor = self.execute_query(
+                f"SELECT start_epoch, id FROM {self._sessions_source()} WHERE id = ?", (after,)
+            )
+            if not anchor:
+                raise DatabaseError("session listing", f"session '{after}' not found")
+            conditions.append("(s.start_epoch, s.id) < (?, ?)")
+            params.extend([anchor[0]['start_epoch'], anchor[0]['id']])
+        
+        if before:
+            conditions.append("s.start_epoch < ?")
+            params.append(to_epoch(before))
+        
+        arm = f"""
+            SELECT s.*, (SELECT name FROM projects WHERE id = s.project_id) AS project_name
+            FROM {{table}} s
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        """
+        tables = ['main.sessions', 'archive.sessions'] if self._local.archive else ['sessions']
+        query = " UNION ALL ".join(arm.format(table=table) for table in tables)
+        params = params * len(tables)
+        
+        query += " ORDER BY start_epoch DESC, id DESC"
+        
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        return (dict(row) for row in self.iter_query(query, tuple(params)))
+    
+    def import_sessions(self, sessions: Iterable[Dict[str, Any]],
+                        batch_size: int = QUERY_BATCH_SIZE) -> Tuple[int, int]:
+        """Bulk insert sessions in one transaction, skipping ids already present.
+        
+        Each session needs ``id``, ``project_id`` and an ISO ``start_time``;
+        ``end_time``, ``duration`` and ``notes`` are optional. Rows are staged
+        with executemany() in batches, then merged into sessions and
+        daily_rollups with set-based statements. Returns (imported, skipped).
+        
+        Raises DatabaseError, importing nothing, if a session references an
+        unknown project or if the import would leave more than one session
+        active (without ``end_time``).
+        """
+        conn = self._get_connection()
+        rows = (self._session_import_row(session) for session in sessions)
+        
+        with self.transaction():
+            conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS session_import (
+                    id TEXT PRIMARY KEY,
+                    project_id TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    start_epoch INTEGER NOT NULL,
+                    end_time TEXT,
+                    end_epoch INTEGER,
+                    duration INTEGER,
+                    notes TEXT
+                )
+            """)
+            conn.execute("DELETE FROM session_import")
+            
+            try:
+                # Stage rows; repeated ids within the input keep the first
+                staged = 0
+                while True:
+                    batch = list(itertools.islice(rows, batch_size))
+                    if not batch:
+                        break
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO session_import VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        batch
+                    )
+                    staged += len(batch)
+                
+                conn.execute(f"DELETE FROM session_import WHERE id IN (SELECT id FROM {self._sessions_source()})")
+                imported = conn.execute("SELECT COUNT(*) FROM session_import").fetchone()[0]
+                self._check_session_import(conn)
+                
+                conn.execute("""
+                    INSERT INTO daily_rollups (day, project_id, seconds, sessions)
+                    SELECT date(start_epoch, 'unixepoch', 'localtime'), project_id,
+                           COALESCE(SUM(duration), 0), COUNT(*)
+                    FROM session_import
+                    WHERE end_time IS NOT NULL
+                    GROUP BY 1, 2
+                    ON CONFLICT (day, project_id) DO UPDATE SET
+                        seconds = seconds + excluded.seconds,
+                        sessions = sessions + excluded.sessions
+                """)
+                conn.execute("""
+                    INSERT INTO sessions (id, project_id, start_time, start_epoch, end_time, end_epoch, duration, notes)
+                    SELECT id, project_id, start_time, start_epoch, end_time, end_epoch, duration, notes
+                    FROM session_import
+                    ORDER BY start_epoch
+                """)
+            finally:
+                conn.execute("DROP TABLE IF EXISTS temp.session_import")
+        
+        return imported, staged - imported
+    
+    @staticmethod
+    def _check_session_import(conn: sqlite3.Connection) -> None:
+        """Reject staged sessions with unknown projects or a second active session."""
+        unknown = [row[0] for row in conn.execute("""
+            SELECT DISTINCT project_id FROM session_import
+            WHERE project_id NOT IN (SELECT id FROM projects)
+            ORDER BY project_id LIMIT 5
+        """)]
+        if unknown:
+            raise DatabaseError("session import", f"unknown project id(s): {', '.join(unknown)}")
+        
+        open_sessions = conn.execute(
+            "SELECT COUNT(*) FROM session_import WHERE end_time IS NULL"
+        ).fetchone()[0]
+        if open_sessions > 1:
+            raise DatabaseError(
+                "session import", f"{open_sessions} sessions have no end_time; at most one can be active"
+            )
+        if open_sessions and conn.execute(
+            "SELECT 1 FROM main.sessions WHERE end_time IS NULL LIMIT 1"
+        ).fetchone():
+            raise DatabaseError(
+                "session import", "a session is already active; stop it before importing an active session"
+            )
+    
+    @staticmethod
+    def _session_import_row(session: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Normalize one session for import into a session_import row."""
+        start_time = datetime.fromisoformat(session['start_time'])
+        end_time = datetime.fromisoformat(session['end_time']) if session.get('end_time') else None
+        
+        duration = session.get('duration')
+        if duration in (None, '') and end_time:
+            duration = int((end_time - start_time).total_seconds())
+        
+        return (
+            session['id'],
+            session['project_id'],
+            start_time.isoformat(),
+            to_epoch(start_time),
+            end_time.isoformat() if end_time else None,
+            to_epoch(end_time) if end_time else None,
+            int(duration) if duration not in (None, '') else None,
+            session.get('notes') or None,
+        )
+    
+    def list_sessions_between(self, start: datetime, end: Optional[datetime] = None,
+                              project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List sessions started in [start, end), newest first."""
+        query = f"""
             SELECT s.*, p.name as project_name 
-            FROM sessions s 
+            FROM {self._sessions_source()} s 
             LEFT JOIN projects p ON s.project_id = p.id
+            WHERE s.start_epoch >= ?
         """
-        params = []
+        params: List[Any] = [to_epoch(start)]
+        
+        if end is not None:
+            query += " AND s.start_epoch < ?"
+            params.append(to_epoch(end))
         
         if project_id:
-            query += " WHERE s.project_id = ?"
+            query += " AND s.project_id = ?"
             params.append(project_id)
         
-        query += " ORDER BY s.start_time DESC LIMIT ?"
-        params.append(limit)
+        query += " ORDER BY s.start_epoch DESC"
         
         rows = self.execute_query(query, tuple(params))
         return [dict(row) for row in rows]
     
+    def get_rollup_totals(self, start_day: date, end_day: date, group_by: Optional[str] = None,
+                          project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Aggregate sessions started on local days in [start_day, end_day).
+        
+        Reads the pre-aggregated daily_rollups table, plus the elapsed time
+        of sessions still running. ``group_by`` is one of None (a single
+        totals row), 'day', 'weekday' (0 = Sunday) or 'project'. Every row
+        carries ``sessions``, ``seconds`` and ``projects`` (distinct
+        project count).
+        """
+        if group_by not in ROLLUP_GROUPINGS:
+            raise ValueError(f"Unknown rollup grouping: {group_by}")
+        
+        group_columns, group_keys = ROLLUP_GROUPINGS[group_by]
+        select = ", ".join(group_columns + [
+            "COALESCE(SUM(r.sessions), 0) AS sessions",
+            "COALESCE(SUM(r.seconds), 0) AS seconds",
+            "COUNT(DISTINCT r.project_id) AS projects",
+        ])
+        query = f"""
+            SELECT {select}
+            FROM ({_ROLLUP_SOURCE_SQL}) r
+            LEFT JOIN projects p ON r.project_id = p.id
+            WHERE r.day >= ? AND r.day < ?
+        """
+        params: List[Any] = [start_day.isoformat(), end_day.isoformat()]
+        
+        if project_id:
+            query += " AND r.project_id = ?"
+            params.append(project_id)
+        
+        if group_keys:
+            query += f" GROUP BY {', '.join(group_keys)} ORDER BY {', '.join(group_keys)}"
+        
+        rows = self.execute_query(query, tuple(params))
+        return [dict(row) for row in rows if row['sessions']]
+    
+    def rebuild_daily_rollups(self) -> int:
+        """Recompute daily_rollups from sessions; returns the number of rows."""
+        with self.transaction():
+            self.execute_update("DELETE FROM daily_rollups")
+            self.execute_update(_ROLLUP_REBUILD_SQL.format(sessions=self._sessions_source()))
+            return self.execute_query("SELECT COUNT(*) FROM daily_rollups")[0][0]
+    
+    def archive_sessions(self, before: datetime) -> int:
+        """Move finished sessions started before ``before`` into the archive DB.
+        
+        Their daily_rollups and search entries stay in the main database, and
+        session reads go through both databases, so reports and listings
+        still cover archived periods. Returns the number of sessions moved.
+        Re-running is safe: rows already copied are not duplicated.
+        """
+        conn = self._get_connection()
+        if not self._local.archive:
+            self._attach_archive(conn)
+        
+        cutoff = to_epoch(before)
+        
+        with self.transaction():
+            conn.execute(f"""
+                INSERT OR IGNORE INTO archive.sessions ({SESSION_COLUMNS})
+                SELECT {SESSION_COLUMNS} FROM main.sessions
+                WHERE end_time IS NOT NULL AND start_epoch < ?
+            """, (cutoff,))
+            
+            # Archived sessions keep their search entries, so skip the delete trigger
+            conn.execute("DROP TRIGGER IF EXISTS search_sessions_delete")
+            moved = conn.execute(
+                "DELETE FROM main.sessions WHERE end_time IS NOT NULL AND start_epoch < ?",
+                (cutoff,)
+            ).rowcount
+            conn.execute(_SEARCH_SESSIONS_DELETE_TRIGGER)
+        
+        return moved
+    
+    def count_archivable_sessions(self, before: datetime) -> int:
+        """Count finished sessions that archive_sessions(before) would move."""
+        rows = self.execute_query(
+            "SELECT COUNT(*) FROM main.sessions WHERE end_time IS NOT NULL AND start_epoch < ?",
+            (to_epoch(before),)
+        )
+        return rows[0][0]
+    
+    def count_sessions(self) -> Dict[str, int]:
+        """Count sessions in the main and archive databases."""
+        conn = self._get_connection()
+        counts = {'main': conn.execute("SELECT COUNT(*) FROM main.sessions").fetchone()[0], 'archive': 0}
+        if self._local.archive:
+            counts['archive'] = conn.execute("SELECT COUNT(*) FROM archive.sessions").fetchone()[0]
+        return counts
+    
+    def compact(self) -> Tuple[int, int]:
+        """VACUUM and ANALYZE the databases; returns total file sizes before and after."""
+        conn = self._get_connection()
+        size_before = self.get_storage_size()
+        
+        conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+        conn.execute("VACUUM main")
+        if self._local.archive:
+            conn.execute("VACUUM archive")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)")
+        if self._local.archive:
+            conn.execute("PRAGMA archive.wal_checkpoint(TRUNCATE)")
+        
+        return size_before, self.get_storage_size()
+    
+    def get_storage_size(self) -> int:
+        """Get the on-disk size in bytes of the main and archive databases, WAL included."""
+        total = 0
+        for path in (self.db_path, self.archive_path):
+            for suffix in ('', '-wal'):
+                file = path.with_name(path.name + suffix)
+                if file.exists():
+                    total += file.stat().st_size
+        return total
+    
+    def search(self, query: str, project_id: Optional[str] = None, kinds: Optional[List[str]] = None,
+               limit: int = 20, highlight: Tuple[str, str] = ('[', ']')) -> List[Dict[str, Any]]:
+        """Full-text search over tasks, issues, notes and session notes.
+        
+        ``query`` uses FTS5 query syntax. Results are ordered by bm25 rank and
+        carry a highlighted ``snippet`` of the matching text.
+        """
+        sql = """
+            SELECT search_index.kind, search_index.ref, search_index.project_id,
+                   COALESCE(p.name, 'Unknown') AS project_name, search_index.created_at,
+                   snippet(search_index, 0, ?, ?, '…', 12) AS snippet,
+                   bm25(search_index) AS rank
+            FROM search_index
+            LEFT JOIN projects p ON p.id = search_index.project_id
+            WHERE search_index MATCH ?
+        """
+        params: List[Any] = [highlight[0], highlight[1], query]
+        
+        if project_id:
+            sql += " AND search_index.project_id = ?"
+            params.append(project_id)
+        
+        if kinds:
+            sql += f" AND search_index.kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        
+        try:
+            rows = self.execute_query(sql, tuple(params))
+        except sqlite3.OperationalError as e:
+            raise DatabaseError("search", str(e))
+        
+        return [dict(row) for row in rows]
+    
+    def rebuild_search_index(self) -> int:
+        """Recreate the search index from its source tables; returns the row count."""
+        conn = self._get_connection()
+        
+        with self.transaction():
+            for statement in _SEARCH_INDEX_SCHEMA:
+                conn.execute(statement)
+            for statement in _SEARCH_INDEX_FILL:
+                conn.execute(statement.format(sessions=self._sessions_source()))
+            return conn.execute("SELECT COUNT(*) FROM search_index").fetchone()[0]
+    
+    def get_project_activity(self) -> List[Dict[str, Any]]:
+        """Get every project with its session totals in a single query.
+        
+        Each row carries the project columns plus ``total_sessions``,
+        ``total_seconds`` and ``first_activity``/``last_activity`` as ISO
+        timestamps (None for projects without sessions).
+        """
+        rows = self.execute_query(f"""
+            SELECT p.*,
+                   COALESCE(a.total_sessions, 0) AS total_sessions,
+                   COALESCE(a.total_seconds, 0) AS total_seconds,
+                   a.first_epoch,
+                   a.last_epoch
+            FROM projects p
+            LEFT JOIN (
+                SELECT project_id,
+                       COUNT(*) AS total_sessions,
+                       SUM(duration) AS total_seconds,
+                       MIN(start_epoch) AS first_epoch,
+                       MAX(start_epoch) AS last_epoch
+                FROM {self._sessions_source()}
+                GROUP BY project_id
+            ) a ON a.project_id = p.id
+            ORDER BY p.created_at DESC
+        """)
+        
+        projects = []
+        for row in rows:
+            project = dict(row)
+            first_epoch = project.pop('first_epoch')
+            last_epoch = project.pop('last_epoch')
+            project['first_activity'] = datetime.fromtimestamp(first_epoch, timezone.utc).isoformat() if first_epoch is not None else None
+            project['last_activity'] = datetime.fromtimestamp(last_epoch, timezone.utc).isoformat() if last_epoch is not None else None
+            projects.append(project)
+        
+        return projects
+    
     # Environment variable methods
-    def set_env_var(self, env_id: str, project_id: Optional[str], key: str, encrypted_value: str) -> str:
+    def set_env_var(self, env_id: str, project_id: Optional[str], key: str, encrypted_value: bytes) -> str:
         """Set an environment variable."""
-        # Use INSERT OR REPLACE to handle uniqueness constraint
-        self.execute_insert(
-            """
-            INSERT OR REPLACE INTO env_vars (id, project_id, key, encrypted_value, updated_at) 
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """,
-            (env_id, project_id, key, encrypted_value)
-        )
+        with self.transaction():
+            # UNIQUE(project_id, key) does not cover global (NULL) rows
+            if project_id is None:
+                self.execute_update(
+                    "DELETE FROM env_vars WHERE project_id IS NULL AND key = ? AND id != ?",
+                    (key, env_id)
+                )
+            
+            # Use INSERT OR REPLACE to handle uniqueness constraint
+            self.execute_insert(
+                """
+                INSERT OR REPLACE INTO env_vars (id, project_id, key, encrypted_value, updated_at) 
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                (env_id, project_id, key, encrypted_value)
+            )
+            self._after_commit(lambda: self._invalidate_env_snapshots(project_id))
+        
         return env_id
     
+    def set_env_vars(self, project_id: Optional[str], encrypted_values: Dict[str, bytes]) -> None:
+        """Set many environment variables in one transaction."""
+        import uuid
+        
+        rows = [
+            (f"env_{uuid.uuid4().hex}", project_id, key, encrypted_value)
+            for key, encrypted_value in encrypted_values.items()
+        ]
+        if not rows:
+            return
+        
+        with self.transaction() as conn:
+            # UNIQUE(project_id, key) does not cover global (NULL) rows
+            if project_id is None:
+                conn.executemany(
+                    "DELETE FROM env_vars WHERE project_id IS NULL AND key = ?",
+                    [(key,) for key in encrypted_values]
+                )
+            
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO env_vars (id, project_id, key, encrypted_value, updated_at) 
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                rows
+            )
+            self._after_commit(lambda: self._invalidate_env_snapshots(project_id))
+    
+    def _invalidate_env_snapshots(self, project_id: Optional[str]) -> None:
+        """Drop cached `env run` snapshots after a vault change."""
+        from devos.core.env_cache import invalidate_env_snapshots
+        invalidate_env_snapshots(self.config.config_dir, project_id)
+    
+    def get_scoped_env_vars(self, project_id: Optional[str]) -> Dict[str, bytes]:
+        """Get encrypted variables stored exactly in this scope (no global fallback)."""
+        rows = self.execute_query(
+            "SELECT key, encrypted_value FROM env_vars WHERE project_id IS ?",
+            (project_id,)
+        )
+        return {row['key']: row['encrypted_value'] for row in rows}
+    
     def get_env_var(self, project_id: Optional[str], key: str) -> Optional[Dict[str, Any]]:
         """Get an environment variable."""
         query = "SELECT * FROM env_vars WHERE key = ?"
@@ -275,41 +1255,60 @@ class Database:
             query += " AND project_id IS NULL"
         
         affected = self.execute_update(query, tuple(params))
+        
+        # A project-scoped delete can also remove a global row, so drop every snapshot
+        from devos.core.env_cache import invalidate_env_snapshots
+        invalidate_env_snapshots(self.config.config_dir)
         return affected > 0
     
+    def resolve_env_vars(self, project_id: Optional[str] = None) -> Dict[str, bytes]:
+        """Get the effective encrypted variables: globals overridden by the project's."""
+        rows = self.execute_query(
+            """
+            SELECT key, encrypted_value FROM env_vars
+            WHERE project_id IS NULL OR project_id = ?
+            ORDER BY project_id IS NOT NULL
+            """,
+            (project_id,)
+        )
+        return {row['key']: row['encrypted_value'] for row in rows}
+    
     # Enhanced project management methods
     def add_project(self, project_data: Dict[str, Any]) -> str:
-        """Add a new project with full metadata."""
+        """Add a new project with its initial tasks, issues and notes."""
         import uuid
         
         project_id = str(uuid.uuid4())
-        metadata = {
-            'tasks': project_data.get('tasks', []),
-            'issues': project_data.get('issues', []),
-            'notes': project_data.get('notes', [])
-        }
         
-        self.execute_insert(
-            """
-            INSERT INTO projects (id, name, path, language, type, description, tags, status, metadata) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                project_id,
-                project_data['name'],
-                project_data.get('path', ''),
-                project_data.get('language', 'unknown'),
-                project_data.get('type', 'web'),
-                project_data.get('description', ''),
-                json.dumps(project_data.get('tags', [])),
-                project_data.get('status', 'active'),
-                json.dumps(metadata)
+        with self.transaction():
+            self.execute_insert(
+                """
+                INSERT INTO projects (id, name, path, language, type, description, tags, status) 
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    project_id,
+                    project_data['name'],
+                    project_data.get('path', ''),
+                    project_data.get('language', 'unknown'),
+                    project_data.get('type', 'web'),
+                    project_data.get('description', ''),
+                    json.dumps(project_data.get('tags', [])),
+                    project_data.get('status', 'active')
+                )
             )
-        )
+            
+            for task in project_data.get('tasks', []):
+                self._insert_project_task(project_id, task)
+            for issue in project_data.get('issues', []):
+                self._insert_project_issue(project_id, issue)
+            for note in project_data.get('notes', []):
+                self._insert_project_note(project_id, note)
+        
         return project_id
     
     def get_project(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get project by name."""
+        """Get project by name, including its tasks, issues and notes."""
         rows = self.execute_query(
             "SELECT * FROM projects WHERE name = ?",
             (name,)
@@ -319,145 +1318,180 @@ class Database:
             return None
         
         project = dict(rows[0])
+        project.pop('metadata', None)
+        project['tags'] = json.loads(project['tags']) if project.get('tags') else []
         
-        # Parse JSON fields
-        if project.get('tags'):
-            project['tags'] = json.loads(project['tags'])
-        else:
-            project['tags'] = []
-            
-        if project.get('metadata'):
-            metadata = json.loads(project['metadata'])
-            project['tasks'] = metadata.get('tasks', [])
-            project['issues'] = metadata.get('issues', [])
-            project['notes'] = metadata.get('notes', [])
-        else:
-            project['tasks'] = []
-            project['issues'] = []
-            project['notes'] = []
+        project['tasks'] = [dict(row) for row in self.execute_query(
+            "SELECT id, title, priority, status, created_at, completed_at FROM project_tasks WHERE project_id = ? ORDER BY id",
+            (project['id'],)
+        )]
+        project['issues'] = [dict(row) for row in self.execute_query(
+            "SELECT id, title, severity, status, created_at, resolved_at FROM project_issues WHERE project_id = ? ORDER BY id",
+            (project['id'],)
+        )]
+        project['notes'] = [dict(row) for row in self.execute_query(
+            "SELECT id, content, created_at FROM project_notes WHERE project_id = ? ORDER BY id",
+            (project['id'],)
+        )]
         
         return project
     
     def get_projects(self, type_filter: Optional[str] = None, status_filter: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get projects with optional filters."""
-        query = "SELECT * FROM projects"
-        params = []
+        """Get projects with optional filters and their task and issue counts."""
+        return list(self.iter_projects(type_filter=type_filter, status_filter=status_filter))
+    
+    def iter_projects(self, type_filter: Optional[str] = None, status_filter: Optional[str] = None,
+                      after: Optional[str] = None, before: Optional[datetime] = None,
+                      limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream projects newest first with their task and issue counts.
+        
+        ``after`` is the id of the last project of a previous page and
+        ``before`` keeps projects created before that time (keyset
+        pagination on created_at, id; names are not unique).
+        """
+        query = """
+            SELECT p.id, p.name, p.path, p.language, p.type, p.description, p.tags, p.status,
+                   p.created_at, p.updated_at,
+                   (SELECT COUNT(*) FROM project_tasks t WHERE t.project_id = p.id) AS task_count,
+                   (SELECT COUNT(*) FROM project_issues i WHERE i.project_id = p.id) AS issue_count
+            FROM projects p
+        """
+        params: List[Any] = []
         
         conditions = []
         if type_filter:
-            conditions.append("type = ?")
+            conditions.append("p.type = ?")
             params.append(type_filter)
         
         if status_filter:
-            conditions.append("status = ?")
+            conditions.append("p.status = ?")
             params.append(status_filter)
         
+        if after:
+            anchor = self.execute_query("SELECT created_at, id FROM projects WHERE id = ?", (after,))
+            if not anchor:
+                raise DatabaseError("project listing", f"project '{after}' not found")
+            conditions.append("(p.created_at, p.id) < (?, ?)")
+            params.extend([anchor[0]['created_at'], anchor[0]['id']])
+        
+        if before:
+            conditions.append("p.created_at < ?")
+            params.append(_to_sql_timestamp(before))
+        
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        query += " ORDER BY created_at DESC"
-        
-        rows = self.execute_query(query, tuple(params))
-        projects = []
+        query += " ORDER BY p.created_at DESC, p.id DESC"
         
-        for row in rows:
-            project = dict(row)
-            
-            # Parse JSON fields
-            if project.get('tags'):
-                project['tags'] = json.loads(project['tags'])
-            else:
-                project['tags'] = []
-                
-            if project.get('metadata'):
-                metadata = json.loads(project['metadata'])
-                project['tasks'] = metadata.get('tasks', [])
-                project['issues'] = metadata.get('issues', [])
-                project['notes'] = metadata.get('notes', [])
-            else:
-                project['tasks'] = []
-                project['issues'] = []
-                project['notes'] = []
-            
-            projects.append(project)
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
         
-        return projects
+        return (
+            self._decode_project_tags(dict(row))
+            for row in self.iter_query(query, tuple(params))
+        )
+    
+    @staticmethod
+    def _decode_project_tags(project: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a project's JSON tags column in place."""
+        project['tags'] = json.loads(project['tags']) if project.get('tags') else []
+        return project
     
     def add_project_task(self, project_name: str, task_data: Dict[str, Any]) -> bool:
         """Add a task to a project."""
-        project = self.get_project(project_name)
-        if not project:
+        project_id = self._get_project_id_by_name(project_name)
+        if not project_id:
             return False
         
-        project['tasks'].append(task_data)
-        return self._update_project_metadata(project_name, project)
+        self._insert_project_task(project_id, task_data)
+        return True
     
     def complete_project_task(self, project_name: str, task_title: str) -> bool:
-        """Mark a task as complete."""
-        project = self.get_project(project_name)
-        if not project:
-            return False
-        
-        for task in project['tasks']:
-            if task['title'] == task_title:
-                task['status'] = 'completed'
-                task['completed_at'] = datetime.now().isoformat()
-                return self._update_project_metadata(project_name, project)
-        
-        return False
+        """Mark the oldest unfinished task with this title as complete."""
+        affected = self.execute_update(
+            """
+            UPDATE project_tasks SET status = 'completed', completed_at = ?
+            WHERE id = (
+                SELECT t.id FROM project_tasks t
+                JOIN projects p ON t.project_id = p.id
+                WHERE p.name = ? AND t.title = ? AND t.status != 'completed'
+                ORDER BY t.id LIMIT 1
+            )
+            """,
+            (datetime.now().isoformat(), project_name, task_title)
+        )
+        return affected > 0
     
     def add_project_issue(self, project_name: str, issue_data: Dict[str, Any]) -> bool:
         """Add an issue to a project."""
-        project = self.get_project(project_name)
-        if not project:
+        project_id = self._get_project_id_by_name(project_name)
+        if not project_id:
             return False
         
-        project['issues'].append(issue_data)
-        return self._update_project_metadata(project_name, project)
+        self._insert_project_issue(project_id, issue_data)
+        return True
     
     def resolve_project_issue(self, project_name: str, issue_title: str) -> bool:
-        """Mark an issue as resolved."""
-        project = self.get_project(project_name)
-        if not project:
-            return False
-        
-        for issue in project['issues']:
-            if issue['title'] == issue_title:
-                issue['status'] = 'resolved'
-                issue['resolved_at'] = datetime.now().isoformat()
-                return self._update_project_metadata(project_name, project)
-        
-        return False
+        """Mark the oldest open issue with this title as resolved."""
+        affected = self.execute_update(
+            """
+            UPDATE project_issues SET status = 'resolved', resolved_at = ?
+            WHERE id = (
+                SELECT i.id FROM project_issues i
+                JOIN projects p ON i.project_id = p.id
+                WHERE p.name = ? AND i.title = ? AND i.status != 'resolved'
+                ORDER BY i.id LIMIT 1
+            )
+            """,
+            (datetime.now().isoformat(), project_name, issue_title)
+        )
+        return affected > 0
     
     def add_project_note(self, project_name: str, note_data: Dict[str, Any]) -> bool:
         """Add a note to a project."""
-        project = self.get_project(project_name)
-        if not project:
+        project_id = self._get_project_id_by_name(project_name)
+        if not project_id:
             return False
         
-        project['notes'].append(note_data)
-        return self._update_project_metadata(project_name, project)
+        self._insert_project_note(project_id, note_data)
+        return True
     
     def delete_project_note(self, project_name: str, note_content: str) -> bool:
-        """Delete a note from a project."""
-        project = self.get_project(project_name)
-        if not project:
-            return False
-        
-        project['notes'] = [note for note in project['notes'] if note['content'] != note_content]
-        return self._update_project_metadata(project_name, project)
-    
-    def _update_project_metadata(self, project_name: str, project: Dict[str, Any]) -> bool:
-        """Update project metadata."""
-        metadata = {
-            'tasks': project['tasks'],
-            'issues': project['issues'],
-            'notes': project['notes']
-        }
-        
+        """Delete notes with this content from a project."""
         affected = self.execute_update(
-            "UPDATE projects SET metadata = ?, updated_at = CURRENT_TIMESTAMP WHERE name = ?",
-            (json.dumps(metadata), project_name)
+            """
+            DELETE FROM project_notes
+            WHERE content = ? AND project_id = (SELECT id FROM projects WHERE name = ?)
+            """,
+            (note_content, project_name)
         )
-        
         return affected > 0
+    
+    def _get_project_id_by_name(self, project_name: str) -> Optional[str]:
+        """Get a project's id from its name."""
+        rows = self.execute_query("SELECT id FROM projects WHERE name = ?", (project_name,))
+        return rows[0]['id'] if rows else None
+    
+    def _insert_project_task(self, project_id: str, task: Dict[str, Any]) -> str:
+        """Insert a task row for a project."""
+        return self.execute_insert(
+            "INSERT INTO project_tasks (project_id, title, priority, status, created_at, completed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (project_id, task['title'], task.get('priority', 'medium'), task.get('status', 'pending'),
+             task.get('created_at', datetime.now().isoformat()), task.get('completed_at'))
+        )
+    
+    def _insert_project_issue(self, project_id: str, issue: Dict[str, Any]) -> str:
+        """Insert an issue row for a project."""
+        return self.execute_insert(
+            "INSERT INTO project_issues (project_id, title, severity, status, created_at, resolved_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (project_id, issue['title'], issue.get('severity', 'medium'), issue.get('status', 'open'),
+             issue.get('created_at', datetime.now().isoformat()), issue.get('resolved_at'))
+        )
+    
+    def _insert_project_note(self, project_id: str, note: Dict[str, Any]) -> str:
+        """Insert a note row for a project."""
+        return self.execute_insert(
+            "INSERT INTO project_notes (project_id, content, created_at) VALUES (?, ?, ?)",
+            (project_id, note['content'], note.get('created_at', datetime.now().isoformat()))
+        )
@@ -0,0 +1,74 @@
+"""Encrypted snapshots of resolved environment variables for `devos env run`."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from devos.core.crypto import Crypto
+
+GLOBAL_SNAPSHOT = "global"
+
+
+def get_snapshot_dir(config_dir: Path) -> Path:
+    """Get the directory holding env snapshots."""
+    return config_dir / "cache" / "env"
+
+
+def get_snapshot_path(config_dir: Path, project_id: Optional[str]) -> Path:
+    """Get the snapshot file for a project (or for globals only)."""
+    return get_snapshot_dir(config_dir) / f"{project_id or GLOBAL_SNAPSHOT}.snap"
+
+
+def load_env_snapshot(crypto: Crypto, project_id: Optional[str]) -> Optional[Dict[str, str]]:
+    """Load a cached environment, or None if missing or unreadable."""
+    path = get_snapshot_path(crypto.config_dir, project_id)
+    try:
+        token = path.read_bytes()
+    except OSError:
+        return None
+    
+    data = crypto.decrypt_many([token])[0]
+    if data is None:
+        return None
+    
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+def save_env_snapshot(crypto: Crypto, project_id: Optional[str], env: Dict[str, str]) -> None:
+    """Encrypt and store a resolved environment."""
+    path = get_snapshot_path(crypto.config_dir, project_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Write to a private temp file, then swap it in. A temp file left by a
+    # crashed write may have other permissions, so always create a new one
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        tmp_path.unlink()
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as tmp_file:
+        tmp_file.write(crypto.encrypt(json.dumps(env)))
+    tmp_path.replace(path)
+
+
+def invalidate_env_snapshots(config_dir: Path, project_id: Optional[str] = None) -> None:
+    """Drop cached snapshots after a vault change.
+    
+    Global variables feed every project's snapshot, so a global change
+    (``project_id`` None) clears them all.
+    """
+    snapshot_dir = get_snapshot_dir(config_dir)
+    if not snapshot_dir.exists():
+        return
+    
+    paths = snapshot_dir.glob("*.snap") if project_id is None else [get_snapshot_path(config_dir, project_id)]
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,80 @@
+"""Parser for .env (dotenv-style) files."""
+
+import re
+from typing import Dict
+
+from devos.core.exceptions import EnvFileError
+
+# KEY=VALUE, with an optional leading "export"
+_ASSIGNMENT_RE = re.compile(r'(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=\s*(.*)$')
+
+# Escapes understood inside double quotes
+_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '"': '"', '\\': '\\', '$': '$'}
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def parse_env_file(text: str, source: str = '.env') -> Dict[str, str]:
+    """Parse dotenv text into an ordered mapping; later keys win.
+    
+    Supports comments, ``export`` prefixes, unquoted values with trailing
+    `` # comments``, single-quoted literal values and double-quoted values
+    with escapes. Quoted values may span several lines.
+    """
+    lines = text.splitlines()
+    values: Dict[str, str] = {}
+    index = 0
+    
+    while index < len(lines):
+        line_no = index + 1
+        line = lines[index].strip()
+        index += 1
+        
+        if not line or line.startswith('#'):
+            continue
+        
+        match = _ASSIGNMENT_RE.match(line)
+        if not match:
+            raise EnvFileError(source, line_no, "expected KEY=VALUE")
+        
+        key, rest = match.groups()
+        
+        if rest[:1] in ('"', "'"):
+            quote = rest[0]
+            body = rest[1:]
+            
+            # Pull in following lines until the closing quote
+            end = _find_closing_quote(body, quote)
+            while end == -1:
+                if index >= len(lines):
+                    raise EnvFileError(source, line_no, f"unterminated {quote} quoted value for {key}")
+                body += '\n' + lines[index]
+                index += 1
+                end = _find_closing_quote(body, quote)
+            
+            trailing = body[end + 1:].strip()
+            if trailing and not trailing.startswith('#'):
+                raise EnvFileError(source, line_no, f"unexpected text after quoted value for {key}")
+            
+            value = body[:end]
+            if quote == '"':
+                value = _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+        else:
+            value = re.split(r'\s+#', rest, maxsplit=1)[0].strip()
+        
+        values[key] = value
+    
+    return values
+
+
+def _find_closing_quote(body: str, quote: str) -> int:
+    """Find the index of the unescaped closing quote, or -1."""
+    position = 0
+    while position < len(body):
+        char = body[position]
+        if char == '\\' and quote == '"':
+            position += 2
+            continue
+        if char == quote:
+            return position
+        position += 1
+    return -1
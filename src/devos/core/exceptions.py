@@ -49,6 +49,15 @@ class SessionError(DevOSError):
         super().__init__(message, suggestion)
 
 
+class EnvFileError(DevOSError):
+    """Raised when a .env file cannot be parsed."""
+    
+    def __init__(self, source: str, line: int, details: str):
+        message = f"{source}, line {line}: {details}"
+        suggestion = "Use KEY=VALUE lines; quote values containing newlines or '#'."
+        super().__init__(message, suggestion)
+
+
 def handle_error(error: Exception) -> None:
     """Handle and display errors with helpful suggestions."""
     
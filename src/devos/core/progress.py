@@ -2,7 +2,7 @@
 
 import click
 import time
-from typing import Iterator, Optional
+from typing import Any, AsyncIterator, Iterator, Optional
 
 
 class ProgressSpinner:
@@ -100,3 +100,21 @@ def show_success(message: str, details: Optional[str] = None):
     click.echo(f"✅ {message}")
     if details:
         click.echo(f"   {details}")
+
+
+async def echo_stream(stream: AsyncIterator[Any], prefix: str = "") -> Optional[Any]:
+    """Print a streamed AI response as it arrives.
+    
+    Returns the assembled response carried by the stream's last delta.
+    """
+    click.echo(prefix, nl=False)
+    response = None
+    
+    async for delta in stream:
+        if delta.content:
+            click.echo(delta.content, nl=False)
+        if delta.response is not None:
+            response = delta.response
+    
+    click.echo()
+    return response